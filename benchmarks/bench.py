@@ -0,0 +1,241 @@
+"""Framework overhead benchmarks of LangDict against the local "fake" provider.
+
+Usage::
+
+    python benchmarks/bench.py                               # run and print
+    python benchmarks/bench.py --save benchmarks/baseline.json
+    python benchmarks/bench.py --compare benchmarks/baseline.json
+
+`--compare` exits with status 1 if a result is worse than the baseline by
+more than `--threshold` (relative). Baselines are machine-specific:
+record one on the machine (or CI runner) that compares against it.
+
+Results:
+    invoke_us.<target>: median time of one call (zero latency), microseconds.
+    invoke_p95_us.<target>: p95 of the same.
+    ainvoke_us.<engine>: median time of one `acall`.
+    batch_rps.<engine>.n<size>: calls per second of a batch of `size`
+        inputs, with `--latency` seconds per request (higher is better).
+    stream_ttft_us.<engine>: call to first chunk of a stream (zero latency).
+    stream_chunk_us.<engine>: time per following chunk.
+    memory_kib.<engine>: peak memory allocated by one call (tracemalloc).
+"""
+
+import argparse
+import asyncio
+import copy
+import json
+import platform
+import statistics
+import sys
+import time
+import tracemalloc
+from typing import Any, Callable, Dict, List
+
+from langdict import LangDict, LangDictModule
+from langdict.builders import ChainBuilder
+
+
+SPEC = {
+    "messages": [
+        ("system", "You are a helpful AI bot. Your name is {name}."),
+        ("human", "{user_input}"),
+    ],
+    "llm": {
+        "model": "gpt-4o-mini",
+        "temperature": 0,
+        "provider": "fake",
+    },
+    "output": {
+        "type": "string"
+    },
+}
+
+ENGINES = ("runnable", "lean")
+BATCH_SIZES = (1, 4, 16, 64)
+
+# Results where higher is better; lower is better for the others.
+HIGHER_IS_BETTER = ("batch_rps.",)
+
+
+def _inputs(i: int) -> Dict[str, Any]:
+    return {"name": "LangDict", "user_input": f"What is your name? ({i})"}
+
+
+CONTENT = "Hello, LangDict! " * 8
+
+
+def _lang_dict(engine: str, latency: float = 0.0, chunk_size: int = 16) -> LangDict:
+    """LangDict of SPEC, answered by `FakeProvider`."""
+    ChainBuilder.clear()
+    spec = copy.deepcopy(SPEC)
+    spec["llm"]["provider_options"] = {
+        "content": CONTENT,
+        "latency": latency,
+        "chunk_size": chunk_size,
+    }
+    return LangDict.from_dict(spec, engine=engine)
+
+
+def _timings(fn: Callable[[int], Any], iterations: int, warmup: int = 20) -> List[float]:
+    for i in range(warmup):
+        fn(i)
+    timings = []
+    for i in range(iterations):
+        start = time.perf_counter()
+        fn(i)
+        timings.append(time.perf_counter() - start)
+    return timings
+
+
+def _p95(values: List[float]) -> float:
+    return sorted(values)[int(len(values) * 0.95) - 1]
+
+
+def bench_invoke(results: Dict[str, float], iterations: int) -> None:
+    targets = {engine: _lang_dict(engine) for engine in ENGINES}
+    for engine, lang_dict in targets.items():
+        timings = _timings(lambda i: lang_dict(_inputs(i)), iterations)
+        results[f"invoke_us.{engine}"] = statistics.median(timings) * 1e6
+        results[f"invoke_p95_us.{engine}"] = _p95(timings) * 1e6
+
+    module = LangDictModule(_lang_dict("runnable"))
+    timings = _timings(lambda i: module(_inputs(i)), iterations)
+    results["invoke_us.module"] = statistics.median(timings) * 1e6
+    results["invoke_p95_us.module"] = _p95(timings) * 1e6
+
+
+def bench_ainvoke(results: Dict[str, float], iterations: int) -> None:
+    for engine in ENGINES:
+        lang_dict = _lang_dict(engine)
+
+        async def _run() -> List[float]:
+            timings = []
+            for i in range(iterations):
+                start = time.perf_counter()
+                await lang_dict.acall(_inputs(i))
+                timings.append(time.perf_counter() - start)
+            return timings
+
+        timings = asyncio.run(_run())
+        results[f"ainvoke_us.{engine}"] = statistics.median(timings) * 1e6
+
+
+def bench_batch(results: Dict[str, float], latency: float, rounds: int) -> None:
+    for engine in ENGINES:
+        lang_dict = _lang_dict(engine, latency=latency)
+        for size in BATCH_SIZES:
+            batch = [_inputs(i) for i in range(size)]
+            timings = _timings(lambda i: lang_dict(batch, batch=True), rounds, warmup=1)
+            results[f"batch_rps.{engine}.n{size}"] = size / statistics.median(timings)
+
+
+def bench_stream(results: Dict[str, float], iterations: int) -> None:
+    for engine in ENGINES:
+        lang_dict = _lang_dict(engine, chunk_size=4)
+        ttfts, per_chunk = [], []
+        for i in range(iterations):
+            start = time.perf_counter()
+            stream = iter(lang_dict(_inputs(i), stream=True))
+            next(stream)
+            first = time.perf_counter()
+            chunks = sum(1 for _ in stream)
+            end = time.perf_counter()
+            ttfts.append(first - start)
+            per_chunk.append((end - first) / max(chunks, 1))
+        results[f"stream_ttft_us.{engine}"] = statistics.median(ttfts) * 1e6
+        results[f"stream_chunk_us.{engine}"] = statistics.median(per_chunk) * 1e6
+
+
+def bench_memory(results: Dict[str, float], iterations: int) -> None:
+    for engine in ENGINES:
+        lang_dict = _lang_dict(engine)
+        for i in range(20):
+            lang_dict(_inputs(i))
+
+        peaks = []
+        tracemalloc.start()
+        try:
+            for i in range(iterations):
+                tracemalloc.reset_peak()
+                current, _ = tracemalloc.get_traced_memory()
+                lang_dict(_inputs(i))
+                _, peak = tracemalloc.get_traced_memory()
+                peaks.append(peak - current)
+        finally:
+            tracemalloc.stop()
+        results[f"memory_kib.{engine}"] = statistics.median(peaks) / 1024
+
+
+def run(iterations: int = 500, latency: float = 0.01, rounds: int = 5) -> Dict[str, Any]:
+    results: Dict[str, float] = {}
+    bench_invoke(results, iterations)
+    bench_ainvoke(results, iterations)
+    bench_batch(results, latency, rounds)
+    bench_stream(results, iterations // 2)
+    bench_memory(results, iterations // 10)
+    return {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "latency": latency,
+        "results": {key: round(value, 3) for key, value in results.items()},
+    }
+
+
+def compare(
+    current: Dict[str, float],
+    baseline: Dict[str, float],
+    threshold: float,
+) -> List[str]:
+    """Names of the results that regressed by more than `threshold`."""
+    regressions = []
+    for key, value in sorted(current.items()):
+        base = baseline.get(key)
+        if not base:
+            continue
+        if key.startswith(HIGHER_IS_BETTER):
+            change = (base - value) / base
+        else:
+            change = (value - base) / base
+        regressed = change > threshold
+        if regressed:
+            regressions.append(key)
+        flag = "REGRESSION" if regressed else ""
+        print(f"{key:32} {base:12.2f} {value:12.2f} {change:+8.1%} {flag}")  # noqa: T201
+    return regressions
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--iterations", type=int, default=500)
+    parser.add_argument("--latency", type=float, default=0.01,
+                        help="seconds per request in the batch benchmark")
+    parser.add_argument("--rounds", type=int, default=5)
+    parser.add_argument("--save", help="write the results to this baseline file")
+    parser.add_argument("--compare", help="baseline file to compare against")
+    parser.add_argument("--threshold", type=float, default=0.25,
+                        help="relative change that counts as a regression")
+    args = parser.parse_args()
+
+    report = run(iterations=args.iterations, latency=args.latency, rounds=args.rounds)
+
+    if args.save:
+        with open(args.save, "w") as f:
+            json.dump(report, f, indent=2)
+            f.write("\n")
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        print(f"{'result':32} {'baseline':>12} {'current':>12} {'change':>8}")  # noqa: T201
+        regressions = compare(report["results"], baseline["results"], args.threshold)
+        if regressions:
+            print(f"\n{len(regressions)} regression(s): {', '.join(regressions)}")  # noqa: T201
+            return 1
+    elif not args.save:
+        print(json.dumps(report, indent=2))  # noqa: T201
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,13 +1,25 @@
+"""LangDict: Build complex LLM Applications with Python Dictionary.
 
-from langdict.langdict import LangDict
-from langdict.modules.module import Module
-from langdict.modules.langdict_module import LangDictModule
-from langdict.modules.parameter import Parameter
+Attributes are imported lazily, so `import langdict` does not load
+langchain_core or litellm until they are needed.
+"""
 
+from typing import TYPE_CHECKING
 
-__all__ = [
-    LangDict,
-    Module,
-    LangDictModule,
-    Parameter,
-]
+from langdict._lazy import attach
+
+if TYPE_CHECKING:
+    from langdict.langdict import LangDict, LangDictResult, ResultStream
+    from langdict.modules.module import Module
+    from langdict.modules.langdict_module import LangDictModule
+    from langdict.modules.parameter import Parameter
+
+
+__getattr__, __dir__, __all__ = attach(__name__, {
+    "LangDict": "langdict.langdict",
+    "LangDictResult": "langdict.langdict",
+    "ResultStream": "langdict.langdict",
+    "Module": "langdict.modules.module",
+    "LangDictModule": "langdict.modules.langdict_module",
+    "Parameter": "langdict.modules.parameter",
+})
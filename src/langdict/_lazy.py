@@ -0,0 +1,40 @@
+"""Lazy attribute loading for packages (PEP 562)."""
+
+import importlib
+from typing import Any, Callable, Dict, List, Tuple
+
+
+def attach(
+    package_name: str,
+    attributes: Dict[str, str],
+) -> Tuple[Callable[[str], Any], Callable[[], List[str]], List[str]]:
+    """Import package attributes from their submodules on first access.
+
+    Example::
+
+        __getattr__, __dir__, __all__ = attach(__name__, {
+            "LangDict": "langdict.langdict",
+        })
+
+    Args:
+        package_name: `__name__` of the package.
+        attributes: attribute name -> module that defines it.
+
+    Returns:
+        (`__getattr__`, `__dir__`, `__all__`) for the package namespace.
+    """
+    package = importlib.import_module(package_name)
+
+    def __getattr__(name: str) -> Any:
+        module_name = attributes.get(name)
+        if module_name is None:
+            raise AttributeError(f"module '{package_name}' has no attribute '{name}'")
+
+        value = getattr(importlib.import_module(module_name), name)
+        setattr(package, name, value)
+        return value
+
+    def __dir__() -> List[str]:
+        return sorted(set(vars(package)) | set(attributes))
+
+    return __getattr__, __dir__, list(attributes)
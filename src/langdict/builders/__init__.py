@@ -1,15 +1,28 @@
 
-from langdict.builders.chat_prompt import ChatPromptMessagesBuilder
-from langdict.builders.text_prompt import PromptTemplateBuilder
-from langdict.builders.lite_llm import LiteLLMBuilder
-from langdict.builders.output_parser import OutputParserBuilder
-from langdict.builders.trace import TraceCallbackBuilder
-
-
-__all__ = [
-    ChatPromptMessagesBuilder,
-    LiteLLMBuilder,
-    OutputParserBuilder,
-    PromptTemplateBuilder,
-    TraceCallbackBuilder,
-]
+from typing import TYPE_CHECKING
+
+from langdict._lazy import attach
+
+if TYPE_CHECKING:
+    from langdict.builders.cache import CacheBuilder
+    from langdict.builders.chain import ChainBuilder, CompiledChain
+    from langdict.builders.chat_prompt import ChatPromptMessagesBuilder
+    from langdict.builders.compiled_prompt import CompiledPrompt, CompiledPromptBuilder
+    from langdict.builders.text_prompt import PromptTemplateBuilder
+    from langdict.builders.lite_llm import LiteLLMBuilder
+    from langdict.builders.output_parser import OutputParserBuilder
+    from langdict.builders.trace import TraceCallbackBuilder
+
+
+__getattr__, __dir__, __all__ = attach(__name__, {
+    "CacheBuilder": "langdict.builders.cache",
+    "ChainBuilder": "langdict.builders.chain",
+    "CompiledChain": "langdict.builders.chain",
+    "ChatPromptMessagesBuilder": "langdict.builders.chat_prompt",
+    "CompiledPrompt": "langdict.builders.compiled_prompt",
+    "CompiledPromptBuilder": "langdict.builders.compiled_prompt",
+    "LiteLLMBuilder": "langdict.builders.lite_llm",
+    "OutputParserBuilder": "langdict.builders.output_parser",
+    "PromptTemplateBuilder": "langdict.builders.text_prompt",
+    "TraceCallbackBuilder": "langdict.builders.trace",
+})
@@ -0,0 +1,71 @@
+import json
+import threading
+from typing import Dict, Optional
+
+from langdict.caches import (
+    BaseCache,
+    InMemoryCache,
+    SQLiteCache,
+    TieredCache,
+)
+from langdict.specs import CacheSpecification
+
+from .base import Builder
+
+
+_DEFAULT_SQLITE_PATH = ".langdict_cache.db"
+
+
+class CacheBuilder(Builder):
+    """Build response caches from a CacheSpecification.
+
+    Specifications with identical cache blocks share one cache instance,
+    so every LangDict in the process benefits from the same entries.
+    """
+
+    _caches: Dict[str, BaseCache] = {}
+    _lock = threading.Lock()
+
+    def __init__(self):
+        pass
+
+    @classmethod
+    def build(cls, spec: Optional[CacheSpecification]) -> Optional[BaseCache]:
+        if spec is None:
+            return None
+
+        key = json.dumps(spec.as_dict(), sort_keys=True)
+        with cls._lock:
+            cache = cls._caches.get(key)
+            if cache is None:
+                cache = cls._create(spec)
+                cls._caches[key] = cache
+        return cache
+
+    @classmethod
+    def _create(cls, spec: CacheSpecification) -> BaseCache:
+        if spec.type == "memory":
+            return InMemoryCache(
+                max_entries=spec.max_entries,
+                max_bytes=spec.max_bytes,
+                ttl=spec.ttl,
+            )
+        elif spec.type == "sqlite":
+            return SQLiteCache(
+                path=spec.path or _DEFAULT_SQLITE_PATH,
+                ttl=spec.ttl,
+            )
+        elif spec.type == "tiered":
+            return TieredCache([
+                InMemoryCache(
+                    max_entries=spec.max_entries,
+                    max_bytes=spec.max_bytes,
+                    ttl=spec.ttl,
+                ),
+                SQLiteCache(
+                    path=spec.path or _DEFAULT_SQLITE_PATH,
+                    ttl=spec.ttl,
+                ),
+            ])
+        else:
+            raise ValueError(f"Invalid cache type: {spec.type}")
@@ -0,0 +1,120 @@
+import hashlib
+import json
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, NamedTuple
+
+from langchain_core.output_parsers import BaseOutputParser
+from langchain_core.runnables import Runnable
+
+from langdict.chat_models import ChatLiteLLM
+from langdict.specs import LangSpecification
+
+from .base import Builder
+from .compiled_prompt import CompiledPrompt, CompiledPromptBuilder
+from .lite_llm import LiteLLMBuilder
+from .output_parser import OutputParserBuilder
+from .text_prompt import PromptTemplateBuilder
+
+
+class CompiledChain(NamedTuple):
+    """Compiled `[Prompt] -> [LLM] -> [Output Parser]` chain of a specification.
+
+    Compiled chains are shared between every LangDict built from an
+    identical specification and must not be modified.
+    """
+
+    key: str
+    prompt: Runnable
+    compiled_prompt: CompiledPrompt
+    llm: ChatLiteLLM
+    output_parser: BaseOutputParser
+    chain: Runnable
+    build_time: float
+
+
+def spec_key(spec: LangSpecification) -> str:
+    """Content address (sha256) of a normalized specification."""
+    payload = json.dumps(
+        spec.as_dict(),
+        sort_keys=True,
+        ensure_ascii=False,
+        default=str,
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class ChainBuilder(Builder):
+    """Build chains through a content-addressed registry.
+
+    The first LangDict of a specification builds its prompt template, LLM
+    and output parser; later ones with an identical specification reuse
+    the same compiled chain.
+    """
+
+    max_size: int = 1024
+
+    _chains: "OrderedDict[str, CompiledChain]" = OrderedDict()
+    _lock = threading.Lock()
+    _hits = 0
+    _builds = 0
+    _build_time = 0.0
+
+    def __init__(self):
+        pass
+
+    @classmethod
+    def build(cls, spec: LangSpecification) -> CompiledChain:
+        key = spec_key(spec)
+        with cls._lock:
+            compiled = cls._chains.get(key)
+            if compiled is not None:
+                cls._chains.move_to_end(key)
+                cls._hits += 1
+                return compiled
+
+            compiled = cls._compile(key, spec)
+            cls._chains[key] = compiled
+            cls._builds += 1
+            cls._build_time += compiled.build_time
+            while len(cls._chains) > cls.max_size:
+                cls._chains.popitem(last=False)
+            return compiled
+
+    @classmethod
+    def _compile(cls, key: str, spec: LangSpecification) -> CompiledChain:
+        start = time.perf_counter()
+        prompt = PromptTemplateBuilder.build(spec.prompt)
+        llm = LiteLLMBuilder.build(spec.llm, cache=spec.cache)
+        output_parser = OutputParserBuilder.build(spec.output)
+        chain = prompt | llm | output_parser
+        return CompiledChain(
+            key=key,
+            prompt=prompt,
+            compiled_prompt=CompiledPromptBuilder.build(spec.prompt),
+            llm=llm,
+            output_parser=output_parser,
+            chain=chain,
+            build_time=time.perf_counter() - start,
+        )
+
+    @classmethod
+    def stats(cls) -> Dict[str, Any]:
+        """Registry size, hit and build counters, and total build time."""
+        with cls._lock:
+            return {
+                "entries": len(cls._chains),
+                "hits": cls._hits,
+                "builds": cls._builds,
+                "build_time": cls._build_time,
+            }
+
+    @classmethod
+    def clear(cls) -> None:
+        with cls._lock:
+            cls._chains.clear()
+            cls._hits = 0
+            cls._builds = 0
+            cls._build_time = 0.0
+        LiteLLMBuilder.clear()
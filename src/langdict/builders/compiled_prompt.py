@@ -0,0 +1,179 @@
+from string import Formatter
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+from langdict.specs import ChatPromptSpecification, TextPromptSpecification
+
+from .base import Builder
+
+
+_ROLES = {
+    "human": "user",
+    "user": "user",
+    "ai": "assistant",
+    "assistant": "assistant",
+    "system": "system",
+}
+
+_STATIC = 0
+_TEMPLATE = 1
+_PLACEHOLDER = 2
+
+
+class _Template:
+    """f-string template pre-split into static and variable segments."""
+
+    __slots__ = ("template", "parts", "slots", "variables", "simple")
+
+    def __init__(self, template: str):
+        self.template = template
+        self.parts: List[Optional[str]] = []
+        self.slots: List[Tuple[int, str]] = []
+        self.variables = set()
+        # Fields with conversions, format specs, attribute or index access
+        # are rendered with str.format.
+        self.simple = True
+
+        for literal, field_name, format_spec, conversion in Formatter().parse(template):
+            if literal:
+                self.parts.append(literal)
+            if field_name is None:
+                continue
+            if (
+                format_spec or
+                conversion or
+                not field_name.isidentifier()
+            ):
+                self.simple = False
+            self.variables.add(field_name.split(".")[0].split("[")[0])
+            self.slots.append((len(self.parts), field_name))
+            self.parts.append(None)
+
+    def render(self, inputs: Dict[str, Any]) -> str:
+        if not self.slots:
+            return "".join(self.parts)
+        if not self.simple:
+            return self.template.format(**inputs)
+
+        parts = self.parts.copy()
+        for i, name in self.slots:
+            value = inputs[name]
+            parts[i] = value if type(value) is str else format(value)
+        return "".join(parts)
+
+
+class CompiledPrompt:
+    """Prompt renderer that produces LiteLLM message dicts directly.
+
+    Templates are split into static and variable segments once; messages
+    without variables are converted to message dicts at compile time, so
+    rendering only fills in the variables. The output is the same as
+    rendering the LangChain prompt template and converting its messages.
+
+    Example::
+
+        prompt = CompiledPromptBuilder.build(spec.prompt)
+        prompt.render({"name": "LangDict", "user_input": "Hi"})
+        # [{"role": "system", "content": "..."}, {"role": "user", "content": "Hi"}]
+    """
+
+    def __init__(
+        self,
+        spec: Union[TextPromptSpecification, ChatPromptSpecification],
+    ):
+        self.spec = spec
+        # (kind, role, value): value is a message dict, _Template or variable name
+        self._messages: List[Tuple[int, Optional[str], Any]] = []
+        self.input_variables = set()
+        self.optional_variables = set()
+
+        if isinstance(spec, TextPromptSpecification):
+            self._add_template("user", spec.text)
+        elif isinstance(spec, ChatPromptSpecification):
+            for role, content in spec.messages:
+                if role == "placeholder":
+                    name = content[1:-1]
+                    self.optional_variables.add(name)
+                    self._messages.append((_PLACEHOLDER, None, name))
+                else:
+                    self._add_template(_ROLES[role], content)
+        else:
+            raise ValueError(f"Invalid specification type: {type(spec)}")
+
+    def _add_template(self, role: str, content: str) -> None:
+        template = _Template(content)
+        if template.slots:
+            self.input_variables |= template.variables
+            self._messages.append((_TEMPLATE, role, template))
+        else:
+            self._messages.append((_STATIC, role, {"content": template.render({}), "role": role}))
+
+    def render(self, inputs: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """Render inputs into LiteLLM message dicts."""
+        missing = self.input_variables.difference(inputs)
+        if missing:
+            raise KeyError(
+                f"Input to {type(self).__name__} is missing variables {sorted(missing)}. "
+                f"Expected: {sorted(self.input_variables)}"
+            )
+
+        message_dicts = []
+        for kind, role, value in self._messages:
+            if kind == _STATIC:
+                message_dicts.append(value.copy())
+            elif kind == _TEMPLATE:
+                message_dicts.append({"content": value.render(inputs), "role": role})
+            else:
+                message_dicts.extend(_convert_placeholder(inputs.get(value)))
+        return message_dicts
+
+    def render_batch(self, inputs: List[Dict[str, Any]]) -> List[List[Dict[str, Any]]]:
+        return [self.render(i) for i in inputs]
+
+
+def _convert_placeholder(messages: Any) -> List[Dict[str, Any]]:
+    if not messages:
+        return []
+
+    message_dicts = []
+    for message in messages:
+        if (
+            type(message) is dict and
+            message.keys() == {"role", "content"} and
+            message["role"] in _ROLES and
+            type(message["content"]) is str
+        ):
+            message_dicts.append({"content": message["content"], "role": _ROLES[message["role"]]})
+        elif (
+            type(message) is tuple and
+            len(message) == 2 and
+            message[0] in _ROLES and
+            type(message[1]) is str
+        ):
+            message_dicts.append({"content": message[1], "role": _ROLES[message[0]]})
+        elif type(message) is str:
+            message_dicts.append({"content": message, "role": "user"})
+        else:
+            message_dicts.extend(_convert_with_langchain([message]))
+    return message_dicts
+
+
+def _convert_with_langchain(messages: List[Any]) -> List[Dict[str, Any]]:
+    from langchain_core.messages import convert_to_messages
+
+    from langdict.chat_models.litellm import _convert_message_to_dict
+
+    return [_convert_message_to_dict(m) for m in convert_to_messages(messages)]
+
+
+class CompiledPromptBuilder(Builder):
+    """Compiled Prompt Builder interface"""
+
+    def __init__(self):
+        pass
+
+    @classmethod
+    def build(
+        cls,
+        spec: Union[TextPromptSpecification, ChatPromptSpecification],
+    ) -> CompiledPrompt:
+        return CompiledPrompt(spec)
@@ -1,25 +1,159 @@
+import json
+import threading
+from collections import OrderedDict
+from typing import Any, Optional
 
-from langdict.chat_models import ChatLiteLLM
-from langdict.specs import LLMSpecification
+from langdict.chat_models import (
+    ChatLiteLLM,
+    Hedger,
+    RetryPolicy,
+    Router,
+    deployment_key,
+    get_circuit_breaker,
+    get_client_pool,
+    get_rate_limiter,
+)
+from langdict.providers import create_provider
+from langdict.specs import CacheSpecification, LLMSpecification
 
 from .base import Builder
+from .cache import CacheBuilder
 
 
 class LiteLLMBuilder(Builder):
+    """Build ChatLiteLLM instances from an LLMSpecification.
+
+    Specifications with identical llm (and cache) blocks share one
+    (frozen) instance, e.g. the six critics of a SelfRAG tree; the
+    `max_size` most recently used ones are kept. Instances of the
+    'litellm' provider send OpenAI-protocol requests through the
+    process-wide client pool (see `langdict.chat_models.ClientPool`).
+    """
+
+    max_size: int = 1024
+
+    _llms: "OrderedDict[str, ChatLiteLLM]" = OrderedDict()
+    _lock = threading.Lock()
 
     def __init__(self):
         pass
 
     @classmethod
-    def build(cls, spec: LLMSpecification):
+    def build(
+        cls,
+        spec: LLMSpecification,
+        cache: Optional[CacheSpecification] = None,
+    ) -> ChatLiteLLM:
+        key = json.dumps(
+            [spec.as_dict(), cache.as_dict() if cache is not None else None],
+            sort_keys=True,
+            ensure_ascii=False,
+            default=str,
+        )
+        with cls._lock:
+            llm = cls._llms.get(key)
+            if llm is not None:
+                cls._llms.move_to_end(key)
+                return llm
+
+            llm = cls._create(spec, cache)
+            cls._llms[key] = llm
+            while len(cls._llms) > cls.max_size:
+                cls._llms.popitem(last=False)
+            return llm
+
+    @classmethod
+    def clear(cls) -> None:
+        with cls._lock:
+            cls._llms.clear()
+
+    @classmethod
+    def _create(
+        cls,
+        spec: LLMSpecification,
+        cache: Optional[CacheSpecification] = None,
+    ) -> ChatLiteLLM:
+        kwargs = {}
+        if spec.streaming:
+            # `streaming=False` would disable `chain.stream`/`chain.astream`.
+            kwargs["streaming"] = True
+        if cache is not None:
+            kwargs["response_cache"] = CacheBuilder.build(cache)
+            kwargs["cache_nondeterministic"] = cache.allow_nondeterministic
+        client = create_provider(spec.provider, spec.provider_options)
+        if client is not None:
+            kwargs["client"] = client
+            # Responses of other backends must not be served to LiteLLM specs.
+            kwargs["cache_namespace"] = json.dumps(
+                [spec.provider, spec.provider_options],
+                sort_keys=True,
+                ensure_ascii=False,
+                default=_option_key,
+            )
+        else:
+            kwargs["client_pool"] = get_client_pool()
+        # Deployments of a model (api_base) have their own budget and health.
+        deployment = f"{spec.model}@{spec.api_base}" if spec.api_base else spec.model
+        if spec.deployments:
+            kwargs["router"] = cls._router(spec)
+        elif spec.rate_limit:
+            kwargs["request_limiter"] = get_rate_limiter(
+                deployment,
+                rpm=spec.rate_limit.get("rpm"),
+                tpm=spec.rate_limit.get("tpm"),
+            )
+        if spec.retry:
+            kwargs["retry_policy"] = RetryPolicy(**spec.retry)
+        if spec.circuit_breaker is not None:
+            options = dict(spec.circuit_breaker)
+            kwargs["fallback"] = options.pop("fallback", None)
+            kwargs["circuit_breaker"] = get_circuit_breaker(deployment, **options)
+        if spec.hedge is not None:
+            kwargs["hedger"] = Hedger(**spec.hedge)
+
         return ChatLiteLLM(
             model=spec.model,
             model_name=spec.model_name,
             openai_api_key=spec.api_key,
+            api_key=spec.api_key,
+            api_base=spec.api_base,
+            organization=spec.organization,
+            request_timeout=spec.timeout,
             temperature=spec.temperature,
             top_p=spec.top_p,
             top_k=spec.top_k,
-            streaming=spec.streaming,
             n=spec.n,
             max_tokens=spec.max_tokens,
+            coalesce=spec.coalesce,
+            **kwargs,
         )
+
+    @classmethod
+    def _router(cls, spec: LLMSpecification) -> Router:
+        """Router of the spec's deployments (each with its own rate limit)."""
+        deployments = [{"model": spec.model, **d} for d in spec.deployments]
+        limiters = []
+        for d in deployments:
+            # The llm-level rate_limit is the default budget of each deployment.
+            rate_limit = d.get("rate_limit") or spec.rate_limit
+            limiter = None
+            if rate_limit:
+                limiter = get_rate_limiter(
+                    deployment_key(d),
+                    rpm=rate_limit.get("rpm"),
+                    tpm=rate_limit.get("tpm"),
+                )
+            limiters.append(limiter)
+        return Router(deployments, limiters=limiters, **(spec.routing or {}))
+
+
+def _option_key(value: Any) -> str:
+    """Key of a provider option, e.g. the function of a callable provider.
+
+    Functions are keyed by identity: closures of one factory (or lambdas
+    of one module) share their name but not their responses.
+    """
+    if callable(value):
+        name = f"{getattr(value, '__module__', '')}.{getattr(value, '__qualname__', type(value).__qualname__)}"
+        return f"{name}@{id(value):x}"
+    return str(value)
@@ -1,18 +1,44 @@
-from typing import List
+import threading
+from typing import Any, Dict, List, Tuple
 
-from langdict.traces import (
-    TraceBackend,
-    TraceStdOutCallbackHandler,
-)
+from langdict.traces import TraceBackend
 
 from .base import Builder
 
 
 class TraceCallbackBuilder(Builder):
 
+    _handlers: Dict[Tuple[str, str], Any] = {}
+    _lock = threading.Lock()
+
     def __init__(self):
         pass
 
+    @classmethod
+    def get(cls, backend: str, module_name: str = None):
+        """Shared trace handler of a backend and module.
+
+        Handlers are built once and reused by every call; per-request
+        context (session_id, user_id, tags) is passed as run metadata
+        (see `langdict.traces.trace_context`).
+        """
+        key = (backend, module_name)
+        handler = cls._handlers.get(key)
+        if handler is not None:
+            return handler
+
+        with cls._lock:
+            handler = cls._handlers.get(key)
+            if handler is None:
+                handler = cls().build(backend, module_name=module_name)
+                cls._handlers[key] = handler
+            return handler
+
+    @classmethod
+    def clear(cls) -> None:
+        with cls._lock:
+            cls._handlers.clear()
+
     def build(
         self,
         backend: str,
@@ -23,7 +49,13 @@ class TraceCallbackBuilder(Builder):
     ):
 
         if backend == TraceBackend.CONSOLE:
+            from langdict.traces.callbacks.stdout import TraceStdOutCallbackHandler
+
             return TraceStdOutCallbackHandler(module_name=module_name)
+        elif backend == TraceBackend.BUFFERED:
+            from langdict.traces.callbacks.buffered import BufferedTraceCallbackHandler
+
+            return BufferedTraceCallbackHandler(module_name=module_name)
         elif backend == TraceBackend.LANGFUSE:
             try:
                 from langfuse.callback import CallbackHandler
@@ -42,7 +74,9 @@ class TraceCallbackBuilder(Builder):
             except ImportError:
                 raise ModuleNotFoundError("LangChainTracer is not installed.")
 
-            tags.append(module_name)
+            tags = list(tags or [])
+            if module_name:
+                tags.append(module_name)
 
             return LangChainTracer(
                 example_id=session_id,
@@ -0,0 +1,14 @@
+
+from langdict.caches.base import BaseCache, make_cache_key
+from langdict.caches.memory import InMemoryCache
+from langdict.caches.sqlite import SQLiteCache
+from langdict.caches.tiered import TieredCache
+
+
+__all__ = [
+    BaseCache,
+    InMemoryCache,
+    SQLiteCache,
+    TieredCache,
+    make_cache_key,
+]
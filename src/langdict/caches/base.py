@@ -0,0 +1,97 @@
+import hashlib
+import json
+import threading
+from typing import Any, Dict, List, Mapping, Optional
+
+
+# Connection / transport settings do not change the completion itself.
+_NON_CACHE_KEY_PARAMS = {
+    "stream",
+    "force_timeout",
+    "timeout",
+    "api_base",
+    "api_key",
+    "organization",
+}
+
+
+def make_cache_key(
+    messages: List[Dict[str, Any]],
+    params: Mapping[str, Any],
+) -> str:
+    """Build a cache key from rendered message dicts and request parameters.
+
+    Args:
+        messages: LiteLLM message dicts (role, content, ...).
+        params: request parameters (model, temperature, max_tokens, n, stop, ...).
+
+    Returns:
+        str: sha256 hex digest of the normalized request.
+    """
+    key_params = {
+        k: v for k, v in params.items()
+        if k not in _NON_CACHE_KEY_PARAMS and v is not None
+    }
+    payload = json.dumps(
+        {"messages": messages, "params": key_params},
+        sort_keys=True,
+        ensure_ascii=False,
+        default=str,
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class BaseCache:
+    """Response cache interface.
+
+    Values are JSON-serializable LiteLLM response dicts.
+    """
+
+    def __init__(self, ttl: Optional[float] = None):
+        self.ttl = ttl
+
+        self._stats_lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def lookup(self, key: str) -> Optional[Dict[str, Any]]:
+        """Get a value and update the hit/miss counters."""
+        value = self.get(key)
+        with self._stats_lock:
+            if value is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+        return value
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        raise NotImplementedError(
+            f"Cache [{type(self).__name__}] is missing the required \"get\" function"
+        )
+
+    def set(self, key: str, value: Dict[str, Any], ttl: Optional[float] = None) -> None:
+        raise NotImplementedError(
+            f"Cache [{type(self).__name__}] is missing the required \"set\" function"
+        )
+
+    def clear(self) -> None:
+        raise NotImplementedError(
+            f"Cache [{type(self).__name__}] is missing the required \"clear\" function"
+        )
+
+    def stats(self) -> Dict[str, Any]:
+        """Hit/miss counters of the cache."""
+        with self._stats_lock:
+            hits, misses = self.hits, self.misses
+        total = hits + misses
+        return {
+            "hits": hits,
+            "misses": misses,
+            "hit_rate": hits / total if total else 0.0,
+        }
+
+    def _expires_at(self, now: float, ttl: Optional[float]) -> Optional[float]:
+        ttl = self.ttl if ttl is None else ttl
+        if ttl is None:
+            return None
+        return now + ttl
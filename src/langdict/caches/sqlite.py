@@ -0,0 +1,98 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, Optional
+
+from .base import BaseCache
+
+
+class SQLiteCache(BaseCache):
+    """Persistent on-disk cache backed by SQLite.
+
+    The database runs in WAL mode, so one file can be shared by several
+    worker processes.
+
+    Args:
+        path: path of the SQLite database file.
+        ttl: default time-to-live in seconds. if None, entries never expire.
+        timeout: seconds to wait for a lock held by another process.
+    """
+
+    def __init__(
+        self,
+        path: str = ".langdict_cache.db",
+        ttl: Optional[float] = None,
+        timeout: float = 5.0,
+    ):
+        super().__init__(ttl=ttl)
+        self.path = path
+        self.timeout = timeout
+
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+
+        self._local = threading.local()
+        with self._connection() as conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS langdict_cache ("
+                "key TEXT PRIMARY KEY, "
+                "value TEXT NOT NULL, "
+                "created_at REAL NOT NULL, "
+                "expires_at REAL)"
+            )
+
+    def _connection(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=self.timeout)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        conn = self._connection()
+        row = conn.execute(
+            "SELECT value, expires_at FROM langdict_cache WHERE key = ?",
+            (key,),
+        ).fetchone()
+        if row is None:
+            return None
+
+        value, expires_at = row
+        if expires_at is not None and expires_at <= time.time():
+            with conn:
+                conn.execute("DELETE FROM langdict_cache WHERE key = ?", (key,))
+            return None
+        return json.loads(value)
+
+    def set(self, key: str, value: Dict[str, Any], ttl: Optional[float] = None) -> None:
+        now = time.time()
+        with self._connection() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO langdict_cache (key, value, created_at, expires_at) "
+                "VALUES (?, ?, ?, ?)",
+                (
+                    key,
+                    json.dumps(value, ensure_ascii=False, default=str),
+                    now,
+                    self._expires_at(now, ttl),
+                ),
+            )
+
+    def clear(self) -> None:
+        with self._connection() as conn:
+            conn.execute("DELETE FROM langdict_cache")
+
+    def stats(self) -> Dict[str, Any]:
+        stats = super().stats()
+        (entries,) = self._connection().execute(
+            "SELECT COUNT(*) FROM langdict_cache"
+        ).fetchone()
+        stats.update({
+            "entries": entries,
+            "path": self.path,
+        })
+        return stats
@@ -0,0 +1,45 @@
+from typing import Any, Dict, List, Optional
+
+from .base import BaseCache
+
+
+class TieredCache(BaseCache):
+    """Multi-tier cache (e.g. in-memory LRU in front of SQLite).
+
+    Lookups go through the tiers in order; a hit in a slower tier is
+    promoted to the faster tiers in front of it.
+
+    Args:
+        tiers: caches ordered from fastest to slowest.
+    """
+
+    def __init__(self, tiers: List[BaseCache]):
+        super().__init__()
+        if not tiers:
+            raise ValueError("TieredCache requires at least one tier.")
+        self.tiers = tiers
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        for i, tier in enumerate(self.tiers):
+            value = tier.lookup(key)
+            if value is not None:
+                for faster in self.tiers[:i]:
+                    faster.set(key, value)
+                return value
+        return None
+
+    def set(self, key: str, value: Dict[str, Any], ttl: Optional[float] = None) -> None:
+        for tier in self.tiers:
+            tier.set(key, value, ttl=ttl)
+
+    def clear(self) -> None:
+        for tier in self.tiers:
+            tier.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        stats = super().stats()
+        stats["tiers"] = [
+            {"type": type(tier).__name__, **tier.stats()}
+            for tier in self.tiers
+        ]
+        return stats
@@ -1,7 +1,56 @@
 
-from .litellm import ChatLiteLLM
+from typing import TYPE_CHECKING
 
+from langdict._lazy import attach
 
-__all__ = [
-    ChatLiteLLM,
-]
+if TYPE_CHECKING:
+    from langdict.chat_models.cassette import Cassette, CassetteMissError, use_cassette
+    from langdict.chat_models.client_pool import (
+        ClientPool,
+        configure_client_pool,
+        get_client_pool,
+    )
+    from langdict.chat_models.coalesce import SingleFlight, single_flight
+    from langdict.chat_models.hedge import Hedger
+    from langdict.chat_models.litellm import ChatLiteLLM
+    from langdict.chat_models.rate_limiter import (
+        RateLimiter,
+        estimate_tokens,
+        get_rate_limiter,
+        rate_limiter_stats,
+    )
+    from langdict.chat_models.retry import (
+        CircuitBreaker,
+        CircuitOpenError,
+        RetryPolicy,
+        circuit_breaker_stats,
+        clear_circuit_breakers,
+        get_circuit_breaker,
+    )
+    from langdict.chat_models.router import Router, deployment_key
+
+
+__getattr__, __dir__, __all__ = attach(__name__, {
+    "Cassette": "langdict.chat_models.cassette",
+    "CassetteMissError": "langdict.chat_models.cassette",
+    "ChatLiteLLM": "langdict.chat_models.litellm",
+    "CircuitBreaker": "langdict.chat_models.retry",
+    "CircuitOpenError": "langdict.chat_models.retry",
+    "ClientPool": "langdict.chat_models.client_pool",
+    "Hedger": "langdict.chat_models.hedge",
+    "RateLimiter": "langdict.chat_models.rate_limiter",
+    "RetryPolicy": "langdict.chat_models.retry",
+    "Router": "langdict.chat_models.router",
+    "SingleFlight": "langdict.chat_models.coalesce",
+    "circuit_breaker_stats": "langdict.chat_models.retry",
+    "clear_circuit_breakers": "langdict.chat_models.retry",
+    "configure_client_pool": "langdict.chat_models.client_pool",
+    "deployment_key": "langdict.chat_models.router",
+    "estimate_tokens": "langdict.chat_models.rate_limiter",
+    "get_circuit_breaker": "langdict.chat_models.retry",
+    "get_client_pool": "langdict.chat_models.client_pool",
+    "get_rate_limiter": "langdict.chat_models.rate_limiter",
+    "rate_limiter_stats": "langdict.chat_models.rate_limiter",
+    "single_flight": "langdict.chat_models.coalesce",
+    "use_cassette": "langdict.chat_models.cassette",
+})
@@ -0,0 +1,271 @@
+"""Record/replay of LiteLLM completions for deterministic offline runs."""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import contextvars
+import gzip
+import json
+import os
+import threading
+import time
+from typing import (
+    Any,
+    AsyncIterator,
+    Dict,
+    Iterator,
+    List,
+    Optional,
+)
+
+from langdict.caches import make_cache_key
+
+from .streams import aclose_stream, close_stream
+
+
+class CassetteMissError(KeyError):
+    """The request was not found in a replayed cassette."""
+
+
+_current_cassette: contextvars.ContextVar[Optional["Cassette"]] = contextvars.ContextVar(
+    "langdict_cassette", default=None
+)
+
+
+def current_cassette() -> Optional["Cassette"]:
+    """Cassette activated by `use_cassette` in the current context."""
+    return _current_cassette.get()
+
+
+@contextlib.contextmanager
+def use_cassette(
+    path: str,
+    mode: str = "replay",
+    reproduce_latency: bool = False,
+    latency_scale: float = 1.0,
+) -> Iterator["Cassette"]:
+    """Record or replay every ChatLiteLLM call made inside the block.
+
+    Example::
+
+        with use_cassette("self_rag.jsonl.gz", mode="record"):
+            self_rag(inputs)
+
+        # offline, with the original latencies
+        with use_cassette("self_rag.jsonl.gz", reproduce_latency=True):
+            self_rag(inputs)
+
+    Args:
+        path: cassette file. a ".gz" suffix enables gzip compression.
+        mode: "record", "replay" or "auto" (replay if recorded, else record).
+        reproduce_latency: sleep for the recorded latencies on replay.
+        latency_scale: multiplier for the reproduced latencies.
+    """
+    cassette = Cassette(
+        path,
+        mode=mode,
+        reproduce_latency=reproduce_latency,
+        latency_scale=latency_scale,
+    )
+    token = _current_cassette.set(cassette)
+    try:
+        yield cassette
+    finally:
+        _current_cassette.reset(token)
+
+
+class Cassette:
+    """Request/response recordings of LiteLLM completions.
+
+    Each interaction is stored as one compact JSON line, keyed on the
+    messages and request parameters. Streamed responses keep every chunk
+    together with its delay from the previous chunk, so replays can
+    reproduce time-to-first-token and inter-chunk timings.
+
+    Identical requests recorded more than once are replayed in order.
+
+    Args:
+        path: cassette file. a ".gz" suffix enables gzip compression.
+        mode: "record", "replay" or "auto" (replay if recorded, else record).
+        reproduce_latency: sleep for the recorded latencies on replay.
+        latency_scale: multiplier for the reproduced latencies.
+    """
+
+    MODES = {"record", "replay", "auto"}
+
+    def __init__(
+        self,
+        path: str,
+        mode: str = "replay",
+        reproduce_latency: bool = False,
+        latency_scale: float = 1.0,
+    ):
+        if mode not in self.MODES:
+            raise ValueError(f"Invalid cassette mode: {mode}")
+
+        self.path = path
+        self.mode = mode
+        self.reproduce_latency = reproduce_latency
+        self.latency_scale = latency_scale
+
+        self._lock = threading.Lock()
+        self._interactions: Dict[str, List[Dict[str, Any]]] = {}
+        self._play_counts: Dict[str, int] = {}
+
+        if mode == "record":
+            with self._open("w"):
+                pass
+        elif os.path.exists(path):
+            self._load()
+        elif mode == "replay":
+            raise FileNotFoundError(f"Cassette not found: {path}")
+
+    def __len__(self) -> int:
+        return sum(len(v) for v in self._interactions.values())
+
+    def completion(self, client: Any, **kwargs: Any) -> Any:
+        """Replay or record `client.completion(**kwargs)`."""
+        key = _interaction_key(kwargs)
+        interaction = self._find(key)
+        if interaction is not None:
+            if interaction["stream"]:
+                return self._replay_chunks(interaction)
+            if self.reproduce_latency:
+                time.sleep(interaction["latency"] * self.latency_scale)
+            return interaction["response"]
+
+        start = time.perf_counter()
+        response = client.completion(**kwargs)
+        if kwargs.get("stream"):
+            return self._record_chunks(key, kwargs, response, start)
+
+        self._save(key, kwargs, {
+            "stream": False,
+            "latency": time.perf_counter() - start,
+            "response": _to_dict(response),
+        })
+        return response
+
+    async def acompletion(self, client: Any, **kwargs: Any) -> Any:
+        """Replay or record `await client.acompletion(**kwargs)`."""
+        key = _interaction_key(kwargs)
+        interaction = self._find(key)
+        if interaction is not None:
+            if interaction["stream"]:
+                return self._areplay_chunks(interaction)
+            if self.reproduce_latency:
+                await asyncio.sleep(interaction["latency"] * self.latency_scale)
+            return interaction["response"]
+
+        start = time.perf_counter()
+        response = await client.acompletion(**kwargs)
+        if kwargs.get("stream"):
+            return self._arecord_chunks(key, kwargs, response, start)
+
+        self._save(key, kwargs, {
+            "stream": False,
+            "latency": time.perf_counter() - start,
+            "response": _to_dict(response),
+        })
+        return response
+
+    def _find(self, key: str) -> Optional[Dict[str, Any]]:
+        if self.mode == "record":
+            return None
+
+        with self._lock:
+            interactions = self._interactions.get(key)
+            if not interactions:
+                if self.mode == "replay":
+                    raise CassetteMissError(
+                        f"Request not recorded in cassette {self.path} (key={key})"
+                    )
+                return None
+
+            count = self._play_counts.get(key, 0)
+            self._play_counts[key] = count + 1
+            return interactions[count % len(interactions)]
+
+    def _replay_chunks(self, interaction: Dict[str, Any]) -> Iterator[Dict[str, Any]]:
+        for delay, chunk in interaction["chunks"]:
+            if self.reproduce_latency:
+                time.sleep(delay * self.latency_scale)
+            yield chunk
+
+    async def _areplay_chunks(self, interaction: Dict[str, Any]) -> AsyncIterator[Dict[str, Any]]:
+        for delay, chunk in interaction["chunks"]:
+            if self.reproduce_latency:
+                await asyncio.sleep(delay * self.latency_scale)
+            yield chunk
+
+    def _record_chunks(
+        self, key: str, kwargs: Dict[str, Any], stream: Any, start: float
+    ) -> Iterator[Any]:
+        chunks = []
+        last = start
+        try:
+            for chunk in stream:
+                now = time.perf_counter()
+                chunks.append((now - last, _to_dict(chunk)))
+                last = now
+                yield chunk
+        except GeneratorExit:
+            # Closed early by the consumer: record the chunks it read.
+            close_stream(stream)
+            self._save(key, kwargs, {"stream": True, "chunks": chunks})
+            raise
+        self._save(key, kwargs, {"stream": True, "chunks": chunks})
+
+    async def _arecord_chunks(
+        self, key: str, kwargs: Dict[str, Any], stream: Any, start: float
+    ) -> AsyncIterator[Any]:
+        chunks = []
+        last = start
+        try:
+            async for chunk in stream:
+                now = time.perf_counter()
+                chunks.append((now - last, _to_dict(chunk)))
+                last = now
+                yield chunk
+        except GeneratorExit:
+            await aclose_stream(stream)
+            self._save(key, kwargs, {"stream": True, "chunks": chunks})
+            raise
+        self._save(key, kwargs, {"stream": True, "chunks": chunks})
+
+    def _save(self, key: str, kwargs: Dict[str, Any], interaction: Dict[str, Any]) -> None:
+        interaction = {"key": key, "model": kwargs.get("model"), **interaction}
+        line = json.dumps(interaction, ensure_ascii=False, separators=(",", ":"), default=str)
+        with self._lock:
+            self._interactions.setdefault(key, []).append(interaction)
+            with self._open("a") as f:
+                f.write(line + "\n")
+
+    def _load(self) -> None:
+        with self._open("r") as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                interaction = json.loads(line)
+                self._interactions.setdefault(interaction["key"], []).append(interaction)
+
+    def _open(self, mode: str):
+        if self.path.endswith(".gz"):
+            return gzip.open(self.path, mode + "t", encoding="utf-8")
+        return open(self.path, mode, encoding="utf-8")
+
+
+def _interaction_key(kwargs: Dict[str, Any]) -> str:
+    params = {k: v for k, v in kwargs.items() if k != "messages"}
+    key = make_cache_key(kwargs.get("messages", []), params)
+    if kwargs.get("stream"):
+        key += ":stream"
+    return key
+
+
+def _to_dict(obj: Any) -> Dict[str, Any]:
+    if isinstance(obj, dict):
+        return obj
+    return obj.model_dump()
@@ -0,0 +1,371 @@
+"""Process-wide OpenAI-protocol clients with shared keep-alive connections."""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import os
+import threading
+import weakref
+from typing import Any, AsyncIterator, Dict, Iterable, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+_OPENAI_BASE_URL = "https://api.openai.com/v1"
+
+_Key = Tuple[str, Optional[str], Optional[str]]
+
+
+class _LoopClients:
+    """Async clients of one event loop, closed when the loop shuts down.
+
+    `asyncio.run` (and `asyncio.Runner`) close the async generators of a
+    loop before closing it; a generator started on the loop closes the
+    clients then, so each `asyncio.run` does not leave a pool behind.
+    Must be created on the running loop.
+    """
+
+    def __init__(self) -> None:
+        self.clients: Dict[_Key, Any] = {}
+        self.shut_down = False
+        self._closer = self._close_at_shutdown()
+        try:
+            # Run the generator to its `yield`: the loop now tracks it.
+            self._closer.asend(None).send(None)
+        except StopIteration:
+            pass
+
+    async def _close_at_shutdown(self) -> AsyncIterator[None]:
+        try:
+            yield
+        finally:
+            self.shut_down = True
+            await _aclose_clients(self.take())
+
+    def take(self) -> List[Any]:
+        """Forget the clients and return them."""
+        clients = list(self.clients.values())
+        self.clients.clear()
+        return clients
+
+    def detach(self) -> List[Any]:
+        """Stop waiting for the loop to shut down; return the clients to close."""
+        clients = self.take()
+        try:
+            # Nothing left to await: the generator finishes right away.
+            self._closer.aclose().send(None)
+        except StopIteration:
+            pass
+        return clients
+
+
+async def _aclose_clients(clients: List[Any]) -> None:
+    for client in clients:
+        try:
+            await client.close()
+        except Exception as e:
+            logger.debug("Could not close client: %s", e)
+
+
+def _running_loop() -> Optional[asyncio.AbstractEventLoop]:
+    try:
+        return asyncio.get_running_loop()
+    except RuntimeError:
+        return None
+
+
+def _h2_available() -> bool:
+    try:
+        import h2  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+class ClientPool:
+    """OpenAI clients shared by every ChatLiteLLM of the process.
+
+    LiteLLM builds a new client (and connection pool) per parameter set
+    and evicts them after an hour. With a pool, every request to the
+    same deployment reuses one `httpx` client, so TCP/TLS handshakes are
+    paid once and HTTP/2 multiplexes concurrent requests over a single
+    connection. Clients are keyed by (api_base, api_key, organization);
+    async clients also by event loop, since httpx connections cannot be
+    shared across loops; they are closed when their loop shuts down
+    (`asyncio.run` does this) or with `close()`.
+
+    Only models served over the OpenAI protocol (OpenAI and
+    OpenAI-compatible servers) use the pool; other providers keep
+    LiteLLM's own clients.
+
+    Example::
+
+        from langdict.chat_models import configure_client_pool
+
+        pool = configure_client_pool(max_connections=50)
+        pool.warmup(self_rag)  # pre-connect at startup
+
+    Args:
+        max_connections: open connections per client.
+        max_keepalive_connections: idle connections kept per client.
+        keepalive_expiry: seconds before an idle connection is closed.
+        http2: negotiate HTTP/2. if None, enabled when `h2` is installed.
+    """
+
+    def __init__(
+        self,
+        max_connections: int = 100,
+        max_keepalive_connections: int = 20,
+        keepalive_expiry: float = 30.0,
+        http2: Optional[bool] = None,
+    ):
+        self._clients: Dict[_Key, Any] = {}
+        self._http_clients: Dict[_Key, Any] = {}
+        self._async_clients: "weakref.WeakKeyDictionary[Any, _LoopClients]" = (
+            weakref.WeakKeyDictionary()
+        )
+        self._protocols: Dict[Tuple[Any, ...], bool] = {}
+        self._lock = threading.Lock()
+        self.created = 0
+        self.configure(
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive_connections,
+            keepalive_expiry=keepalive_expiry,
+            http2=http2,
+        )
+
+    def configure(
+        self,
+        max_connections: int = 100,
+        max_keepalive_connections: int = 20,
+        keepalive_expiry: float = 30.0,
+        http2: Optional[bool] = None,
+    ) -> "ClientPool":
+        """Change the limits. Existing clients are closed (call at startup)."""
+        if max_connections <= 0:
+            raise ValueError("max_connections must be positive.")
+        if max_keepalive_connections < 0:
+            raise ValueError("max_keepalive_connections must not be negative.")
+        if http2 is None:
+            http2 = _h2_available()
+
+        self.close()
+        self.max_connections = max_connections
+        self.max_keepalive_connections = max_keepalive_connections
+        self.keepalive_expiry = keepalive_expiry
+        self.http2 = http2
+        return self
+
+    def _limits(self) -> Any:
+        import httpx
+
+        return httpx.Limits(
+            max_connections=self.max_connections,
+            max_keepalive_connections=self.max_keepalive_connections,
+            keepalive_expiry=self.keepalive_expiry,
+        )
+
+    def _uses_openai(self, params: Dict[str, Any]) -> bool:
+        """Whether the request is sent over the OpenAI protocol."""
+        model = params.get("model")
+        if not model:
+            return False
+        key = (model, params.get("custom_llm_provider"), params.get("api_base"))
+        uses_openai = self._protocols.get(key)
+        if uses_openai is None:
+            import litellm
+
+            try:
+                _, provider, _, _ = litellm.get_llm_provider(
+                    model=model,
+                    custom_llm_provider=params.get("custom_llm_provider"),
+                    api_base=params.get("api_base"),
+                )
+            except Exception:
+                provider = None
+            uses_openai = provider == "openai"
+            self._protocols[key] = uses_openai
+        return uses_openai
+
+    def _key(self, params: Dict[str, Any]) -> Optional[_Key]:
+        if not self._uses_openai(params):
+            return None
+        api_key = params.get("api_key") or os.environ.get("OPENAI_API_KEY")
+        if not api_key:
+            # Let LiteLLM raise its usual authentication error.
+            return None
+        api_base = (
+            params.get("api_base")
+            or os.environ.get("OPENAI_BASE_URL")
+            or os.environ.get("OPENAI_API_BASE")
+            or _OPENAI_BASE_URL
+        )
+        return (api_base, api_key, params.get("organization"))
+
+    def get(self, params: Dict[str, Any]) -> Optional[Any]:
+        """`openai.OpenAI` client for the request parameters, or None.
+
+        Args:
+            params: LiteLLM request parameters (model, api_base, api_key,
+                organization, custom_llm_provider).
+        """
+        key = self._key(params)
+        if key is None:
+            return None
+        client = self._clients.get(key)
+        if client is None:
+            with self._lock:
+                client = self._clients.get(key)
+                if client is None:
+                    import httpx
+
+                    http_client = httpx.Client(http2=self.http2, limits=self._limits())
+                    client = self._create(key, http_client)
+                    self._clients[key] = client
+                    self._http_clients[key] = http_client
+        return client
+
+    def aget(self, params: Dict[str, Any]) -> Optional[Any]:
+        """`openai.AsyncOpenAI` client of the running event loop, or None."""
+        key = self._key(params)
+        if key is None:
+            return None
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            loop_clients = self._async_clients.get(loop)
+            if loop_clients is None or loop_clients.shut_down:
+                self._drop_closed_loops()
+                loop_clients = _LoopClients()
+                self._async_clients[loop] = loop_clients
+            client = loop_clients.clients.get(key)
+            if client is None:
+                import httpx
+
+                http_client = httpx.AsyncClient(http2=self.http2, limits=self._limits())
+                client = self._create(key, http_client)
+                loop_clients.clients[key] = client
+        return client
+
+    def _drop_closed_loops(self) -> None:
+        """Forget the clients of loops closed without shutting down."""
+        for loop in [loop for loop in self._async_clients if loop.is_closed()]:
+            self._async_clients.pop(loop).detach()
+
+    def _create(self, key: _Key, http_client: Any) -> Any:
+        import httpx
+        import openai
+
+        api_base, api_key, organization = key
+        client_cls = openai.AsyncOpenAI if isinstance(http_client, httpx.AsyncClient) else openai.OpenAI
+        self.created += 1
+        # ChatLiteLLM retries failed requests itself.
+        return client_cls(
+            api_key=api_key,
+            base_url=api_base,
+            organization=organization,
+            http_client=http_client,
+            max_retries=0,
+        )
+
+    def warmup(self, *targets: Any, timeout: float = 5.0) -> int:
+        """Open a connection to the deployment of each target ahead of time.
+
+        Targets are ChatLiteLLM instances, LangDicts or Modules (whose
+        LangDicts are found recursively). Failures are logged and ignored.
+
+        Returns:
+            number of deployments connected.
+        """
+        connected = 0
+        seen = set()
+        for llm in _find_llms(targets):
+            params = llm._client_params
+            key = self._key(params)
+            if key is None or key in seen:
+                continue
+            seen.add(key)
+            client = self.get(params)
+            try:
+                self._http_clients[key].head(str(client.base_url), timeout=timeout)
+            except Exception as e:
+                logger.warning("Could not pre-connect to %s: %s", key[0], e)
+                continue
+            connected += 1
+        return connected
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            async_clients = sum(
+                len(loop_clients.clients) for loop_clients in self._async_clients.values()
+            )
+            return {
+                "clients": len(self._clients),
+                "async_clients": async_clients,
+                "created": self.created,
+                "max_connections": self.max_connections,
+                "max_keepalive_connections": self.max_keepalive_connections,
+                "http2": self.http2,
+            }
+
+    def close(self) -> None:
+        """Close and forget every client.
+
+        Async clients are closed on their event loop, if it is running:
+        right away from another thread, or in a task from the loop itself.
+        """
+        with self._lock:
+            clients = list(self._clients.values())
+            self._clients.clear()
+            self._http_clients.clear()
+            loops = list(self._async_clients.items())
+            self._async_clients.clear()
+        for client in clients:
+            client.close()
+
+        for loop, loop_clients in loops:
+            async_clients = loop_clients.detach()
+            if not async_clients or not loop.is_running():
+                continue
+            if loop is _running_loop():
+                loop.create_task(_aclose_clients(async_clients))
+            else:
+                asyncio.run_coroutine_threadsafe(_aclose_clients(async_clients), loop)
+
+
+def _find_llms(targets: Iterable[Any]) -> List[Any]:
+    from langdict.chat_models.litellm import ChatLiteLLM
+
+    llms: List[Any] = []
+    stack = list(targets)
+    while stack:
+        target = stack.pop()
+        if isinstance(target, ChatLiteLLM):
+            llms.append(target)
+        elif getattr(target, "compiled", None) is not None:
+            # LangDict
+            llms.append(target.compiled.llm)
+        elif hasattr(target, "lang_dict"):
+            stack.append(target.lang_dict)
+        if hasattr(target, "children"):
+            stack.extend(target.children())
+    return llms
+
+
+_pool: Optional[ClientPool] = None
+_pool_lock = threading.Lock()
+
+
+def get_client_pool() -> ClientPool:
+    """Client pool used by ChatLiteLLMs built from specifications."""
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                _pool = ClientPool()
+    return _pool
+
+
+def configure_client_pool(**kwargs: Any) -> ClientPool:
+    """Change the limits of the process-wide client pool (see `ClientPool`)."""
+    return get_client_pool().configure(**kwargs)
@@ -0,0 +1,126 @@
+"""Single-flight coalescing of identical in-flight requests."""
+
+from __future__ import annotations
+
+import asyncio
+import threading
+from typing import Any, Awaitable, Callable, Dict, Hashable, Tuple
+
+
+_LEADER_CANCELLED = object()
+
+
+class _Call:
+
+    def __init__(self):
+        self.event = threading.Event()
+        self.result: Any = None
+        self.error: BaseException = None
+
+
+class SingleFlight:
+    """Share one execution between concurrent callers of the same key.
+
+    The first caller of a key (the leader) runs the function; callers that
+    arrive while it is in flight wait for it and receive the same result
+    (or exception). Nothing is kept once the call has finished. If the
+    caller of an async leader is cancelled, a follower takes over and runs
+    its own function.
+
+    Example::
+
+        single_flight = SingleFlight()
+        response = single_flight.do(cache_key, lambda: litellm.completion(**kwargs))
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls: Dict[Hashable, _Call] = {}
+        self._async_calls: Dict[Tuple[int, Hashable], asyncio.Future] = {}
+
+        self.calls = 0
+        self.coalesced = 0
+
+    def do(self, key: Hashable, fn: Callable[[], Any]) -> Any:
+        with self._lock:
+            self.calls += 1
+            call = self._calls.get(key)
+            if call is not None:
+                self.coalesced += 1
+                leader = False
+            else:
+                call = _Call()
+                self._calls[key] = call
+                leader = True
+
+        if not leader:
+            call.event.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = fn()
+            return call.result
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.event.set()
+
+    async def ado(self, key: Hashable, fn: Callable[[], Awaitable[Any]]) -> Any:
+        loop = asyncio.get_running_loop()
+        loop_key = (id(loop), key)
+
+        with self._lock:
+            self.calls += 1
+
+        while True:
+            with self._lock:
+                future = self._async_calls.get(loop_key)
+                if future is not None:
+                    self.coalesced += 1
+                    leader = False
+                else:
+                    future = loop.create_future()
+                    self._async_calls[loop_key] = future
+                    leader = True
+
+            if not leader:
+                result = await asyncio.shield(future)
+                if result is _LEADER_CANCELLED:
+                    with self._lock:
+                        self.coalesced -= 1
+                    continue
+                return result
+
+            try:
+                result = await fn()
+                future.set_result(result)
+                return result
+            except asyncio.CancelledError:
+                # The cancellation is the leader's own: a follower takes over.
+                future.set_result(_LEADER_CANCELLED)
+                raise
+            except BaseException as e:
+                future.set_exception(e)
+                # Retrieve the exception so an unawaited future does not warn.
+                future.exception()
+                raise
+            finally:
+                with self._lock:
+                    del self._async_calls[loop_key]
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "calls": self.calls,
+                "coalesced": self.coalesced,
+                "in_flight": len(self._calls) + len(self._async_calls),
+            }
+
+
+single_flight = SingleFlight()
+"""Process-wide single-flight group used by ChatLiteLLM."""
@@ -0,0 +1,361 @@
+"""Hedged LLM requests: race a duplicate request against a slow one."""
+
+from __future__ import annotations
+
+import asyncio
+import concurrent.futures
+import contextvars
+import threading
+import time
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, Iterator, Optional, Tuple
+
+from langdict.metrics import Histogram, metrics
+
+from .router import _DEPLOYMENT_PARAMS
+from .streams import aclose_stream, close_stream
+
+
+_NO_CHUNK = object()
+
+
+class Hedger:
+    """Send a duplicate request when the first one is slow; keep the fastest.
+
+    If a request has not returned (or, for streams, produced its first
+    chunk) after the `percentile`-th latency percentile of the previous
+    requests, the same request is sent again, to the same deployment or
+    to `model` / `api_base` (with its own `api_key` and `organization`:
+    the credentials of the first deployment are not sent to another one). The first response wins. The async loser is
+    cancelled; a sync loser cannot be interrupted, so it runs to the end
+    in the background and its stream is closed.
+
+    Delays and latencies are measured from the moment the request is sent,
+    so time queued in the rate limiter does not trigger hedges. At most
+    `max_in_flight` hedges are in flight at a time; slow requests beyond
+    that are not hedged.
+
+    Hedging at p95 sends ~5% more requests and bounds the tail latency
+    at roughly p95 plus the latency of the hedge.
+
+    Example::
+
+        "llm": {
+            "model": "gpt-4o-mini",
+            "hedge": {"percentile": 95, "api_base": "https://eu.example.com/v1", "api_key": "..."},
+        }
+
+    Args:
+        percentile: latency percentile after which the hedge is sent.
+        delay: fixed hedge delay in seconds (instead of the percentile).
+        initial_delay: hedge delay until `min_samples` latencies are known.
+        min_samples: latencies observed before the percentile is used.
+        min_delay: lower bound of the hedge delay.
+        max_in_flight: hedges in flight at the same time.
+        model: model of the hedge request. if None, the same model.
+        api_base: deployment of the hedge request. if None, the same one.
+        api_key: API key of the `api_base` deployment.
+        organization: organization of the `api_base` deployment.
+    """
+
+    def __init__(
+        self,
+        percentile: float = 95.0,
+        delay: Optional[float] = None,
+        initial_delay: float = 1.0,
+        min_samples: int = 20,
+        min_delay: float = 0.0,
+        max_in_flight: int = 8,
+        model: Optional[str] = None,
+        api_base: Optional[str] = None,
+        api_key: Optional[str] = None,
+        organization: Optional[str] = None,
+    ):
+        if not 0 < percentile < 100:
+            raise ValueError("percentile must be between 0 and 100.")
+        if delay is not None and delay < 0:
+            raise ValueError("delay must not be negative.")
+        if initial_delay < 0 or min_delay < 0:
+            raise ValueError("initial_delay and min_delay must not be negative.")
+        if max_in_flight < 1:
+            raise ValueError("max_in_flight must be positive.")
+
+        self.percentile = percentile
+        self.fixed_delay = delay
+        self.initial_delay = initial_delay
+        self.min_samples = min_samples
+        self.min_delay = min_delay
+        self.max_in_flight = max_in_flight
+        self.model = model
+        self.api_base = api_base
+        self.deployment = {
+            key: value
+            for key, value in zip(_DEPLOYMENT_PARAMS, (api_base, api_key, organization))
+            if value is not None
+        }
+
+        self.latency = Histogram()
+        self.requests = 0
+        self.hedged = 0
+        self.hedge_wins = 0
+        self.skipped = 0
+        self.in_flight = 0
+        self._lock = threading.Lock()
+
+    def delay(self) -> float:
+        """Seconds to wait for the first request before hedging."""
+        if self.fixed_delay is not None:
+            return self.fixed_delay
+        if self.latency.count < self.min_samples:
+            return max(self.initial_delay, self.min_delay)
+        return max(self.latency.quantile(self.percentile / 100.0), self.min_delay)
+
+    def _hedge_params(self, kwargs: Dict[str, Any]) -> Dict[str, Any]:
+        params = dict(kwargs)
+        if self.model is not None:
+            params["model"] = self.model
+        if self.deployment:
+            for key in _DEPLOYMENT_PARAMS:
+                params.pop(key, None)
+            params.update(self.deployment)
+        return params
+
+    def _start_hedge(self) -> bool:
+        """Count a hedge as in flight, unless `max_in_flight` are."""
+        with self._lock:
+            if self.in_flight >= self.max_in_flight:
+                self.skipped += 1
+                skipped = True
+            else:
+                self.in_flight += 1
+                skipped = False
+        if skipped:
+            metrics.inc("hedges_skipped")
+        return not skipped
+
+    def _end_hedge(self, _: Any) -> None:
+        with self._lock:
+            self.in_flight -= 1
+
+    def _record(self, hedged: bool, hedge_won: bool) -> None:
+        with self._lock:
+            self.requests += 1
+            if hedged:
+                self.hedged += 1
+            if hedge_won:
+                self.hedge_wins += 1
+        if hedged:
+            metrics.inc("hedged")
+        if hedge_won:
+            metrics.inc("hedge_wins")
+
+    def _first(
+        self,
+        fn: Callable[..., Any],
+        kwargs: Dict[str, Any],
+        on_send: Optional[Callable[[], None]] = None,
+    ) -> Tuple[Any, Any]:
+        """Response of `fn`; for streams, (stream, first chunk).
+
+        `fn` calls `on_send` once the request is sent (after the rate
+        limiter); the latency is measured from there.
+        """
+        start = time.perf_counter()
+
+        def _on_send() -> None:
+            nonlocal start
+            start = time.perf_counter()
+            if on_send is not None:
+                on_send()
+
+        response = fn(on_send=_on_send, **kwargs)
+        first = _NO_CHUNK
+        if kwargs.get("stream"):
+            response = iter(response)
+            try:
+                first = next(response, _NO_CHUNK)
+            except BaseException:
+                close_stream(response)
+                raise
+        self.latency.observe(time.perf_counter() - start)
+        return response, first
+
+    async def _afirst(
+        self,
+        fn: Callable[..., Awaitable[Any]],
+        kwargs: Dict[str, Any],
+        on_send: Optional[Callable[[], None]] = None,
+    ) -> Tuple[Any, Any]:
+        start = time.perf_counter()
+
+        def _on_send() -> None:
+            nonlocal start
+            start = time.perf_counter()
+            if on_send is not None:
+                on_send()
+
+        response = await fn(on_send=_on_send, **kwargs)
+        first = _NO_CHUNK
+        if kwargs.get("stream"):
+            try:
+                first = await response.__anext__()
+            except StopAsyncIteration:
+                pass
+            except BaseException:
+                await aclose_stream(response)
+                raise
+        self.latency.observe(time.perf_counter() - start)
+        return response, first
+
+    def call(self, fn: Callable[..., Any], kwargs: Dict[str, Any]) -> Any:
+        """`fn(**kwargs)`, hedged.
+
+        The request and its hedge run on threads of their own (with the
+        caller's context), so the caller can return the hedge's response
+        while the first request is still blocked. `fn` must accept an
+        `on_send` callback (see `_first`).
+        """
+        sent = threading.Event()
+        primary = _spawn(self._first, fn, kwargs, sent.set)
+        # Requests that fail before they are sent end the wait too.
+        primary.add_done_callback(lambda _: sent.set())
+        sent.wait()
+
+        pending = {primary}
+        done, _ = concurrent.futures.wait(pending, timeout=self.delay())
+        hedge = None
+        if not done and self._start_hedge():
+            hedge = _spawn(self._first, fn, self._hedge_params(kwargs))
+            hedge.add_done_callback(self._end_hedge)
+            pending.add(hedge)
+
+        error: Optional[BaseException] = None
+        while pending:
+            done, pending = concurrent.futures.wait(
+                pending, return_when=concurrent.futures.FIRST_COMPLETED
+            )
+            for future in done:
+                if future.exception() is not None:
+                    if error is None or future is primary:
+                        error = future.exception()
+                    continue
+                for loser in pending:
+                    loser.add_done_callback(_discard)
+                for other in done:
+                    if other is not future:
+                        _discard(other)
+                self._record(hedge is not None, future is hedge)
+                return _result(*future.result())
+        self._record(hedge is not None, False)
+        raise error
+
+    async def acall(self, fn: Callable[..., Awaitable[Any]], kwargs: Dict[str, Any]) -> Any:
+        """Async version of `call`; the losing request is cancelled."""
+        sent = asyncio.Event()
+        primary = asyncio.ensure_future(self._afirst(fn, kwargs, sent.set))
+        primary.add_done_callback(lambda _: sent.set())
+        pending = {primary}
+        hedge = None
+        error: Optional[BaseException] = None
+        try:
+            await sent.wait()
+            start = time.perf_counter()
+            done, _ = await asyncio.wait(pending, timeout=self.delay())
+            if not done and self._start_hedge():
+                hedge = asyncio.ensure_future(self._afirst(fn, self._hedge_params(kwargs)))
+                hedge.add_done_callback(self._end_hedge)
+                pending.add(hedge)
+
+            while pending:
+                done, pending = await asyncio.wait(
+                    pending, return_when=asyncio.FIRST_COMPLETED
+                )
+                for task in done:
+                    if task.exception() is not None:
+                        if error is None or task is primary:
+                            error = task.exception()
+                        continue
+                    for other in done:
+                        if other is not task and other.exception() is None:
+                            await _adiscard(other)
+                    if primary in pending:
+                        # Keep the slow tail in the percentile (a lower bound).
+                        self.latency.observe(time.perf_counter() - start)
+                    self._record(hedge is not None, task is hedge)
+                    return _aresult(*task.result())
+        finally:
+            for task in pending:
+                task.cancel()
+        self._record(hedge is not None, False)
+        raise error
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "requests": self.requests,
+                "hedged": self.hedged,
+                "hedge_wins": self.hedge_wins,
+                "skipped": self.skipped,
+                "in_flight": self.in_flight,
+                "delay": self.delay(),
+            }
+
+
+def _result(response: Any, first: Any) -> Any:
+    if first is _NO_CHUNK:
+        return response
+    return _prepend(first, response)
+
+
+def _aresult(response: Any, first: Any) -> Any:
+    if first is _NO_CHUNK:
+        return response
+    return _aprepend(first, response)
+
+
+def _prepend(first: Any, stream: Iterator[Any]) -> Iterator[Any]:
+    try:
+        yield first
+        yield from stream
+    finally:
+        close_stream(stream)
+
+
+async def _aprepend(first: Any, stream: AsyncIterator[Any]) -> AsyncIterator[Any]:
+    try:
+        yield first
+        async for chunk in stream:
+            yield chunk
+    finally:
+        await aclose_stream(stream)
+
+
+def _spawn(fn: Callable[..., Any], *args: Any) -> concurrent.futures.Future:
+    """Run `fn(*args)` on a new thread, with the caller's context."""
+    future: concurrent.futures.Future = concurrent.futures.Future()
+    context = contextvars.copy_context()
+
+    def _run() -> None:
+        if not future.set_running_or_notify_cancel():
+            return
+        try:
+            future.set_result(context.run(fn, *args))
+        except BaseException as e:
+            future.set_exception(e)
+
+    threading.Thread(target=_run, name="langdict-hedge", daemon=True).start()
+    return future
+
+
+def _discard(future: concurrent.futures.Future) -> None:
+    """Release the response of a request that lost the race."""
+    if future.cancelled() or future.exception() is not None:
+        return
+    response, first = future.result()
+    if first is not _NO_CHUNK:
+        close_stream(response)
+
+
+async def _adiscard(task: "asyncio.Future[Any]") -> None:
+    response, first = task.result()
+    if first is not _NO_CHUNK:
+        await aclose_stream(response)
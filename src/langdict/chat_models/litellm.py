@@ -4,8 +4,13 @@ origin_code: https://github.com/langchain-ai/langchain/blob/master/libs/communit
 
 from __future__ import annotations
 
+import importlib.util
+import inspect
+import asyncio
+import functools
 import json
 import logging
+import time
 from typing import (
     Any,
     AsyncIterator,
@@ -21,7 +26,7 @@ from typing import (
     Union,
 )
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, PrivateAttr
 from langchain_core.callbacks import (
     AsyncCallbackManagerForLLMRun,
     CallbackManagerForLLMRun,
@@ -32,7 +37,6 @@ from langchain_core.language_models.chat_models import (
     agenerate_from_stream,
     generate_from_stream,
 )
-from langchain_core.language_models.llms import create_base_retry_decorator
 from langchain_core.messages import (
     AIMessage,
     AIMessageChunk,
@@ -60,33 +64,28 @@ from langchain_core.tools import BaseTool
 from langchain_core.utils import get_from_dict_or_env, pre_init
 from langchain_core.utils.function_calling import convert_to_openai_tool
 
+from langdict.caches import BaseCache, make_cache_key
+from langdict.metrics import CallStats, current_call_stats, current_module, metrics
+from langdict.traces.spans import Span, start_span
+
+from .cassette import Cassette, current_cassette
+from .client_pool import ClientPool
+from .coalesce import single_flight
+from .hedge import Hedger
+from .rate_limiter import RateLimiter, estimate_tokens
+from .retry import CircuitBreaker, CircuitOpenError, RetryPolicy
+from .router import _DEPLOYMENT_PARAMS, Router, deployment_key
+from .streams import aclose_stream, close_stream
+
 logger = logging.getLogger(__name__)
 
+# Endpoint and credentials of a deployment, replaced on failover.
+
 
 class ChatLiteLLMException(Exception):
     """Error with the `LiteLLM I/O` library"""
 
 
-def _create_retry_decorator(
-    llm: ChatLiteLLM,
-    run_manager: Optional[
-        Union[AsyncCallbackManagerForLLMRun, CallbackManagerForLLMRun]
-    ] = None,
-) -> Callable[[Any], Any]:
-    """Returns a tenacity retry decorator, preconfigured to handle PaLM exceptions"""
-    import litellm
-
-    errors = [
-        litellm.Timeout,
-        litellm.APIError,
-        litellm.APIConnectionError,
-        litellm.RateLimitError,
-    ]
-    return create_base_retry_decorator(
-        error_types=errors, max_retries=llm.max_retries, run_manager=run_manager
-    )
-
-
 def _convert_dict_to_message(_dict: Mapping[str, Any]) -> BaseMessage:
     role = _dict["role"]
     if role == "user":
@@ -117,15 +116,205 @@ async def acompletion_with_retry(
     run_manager: Optional[AsyncCallbackManagerForLLMRun] = None,
     **kwargs: Any,
 ) -> Any:
-    """Use tenacity to retry the async completion call."""
-    retry_decorator = _create_retry_decorator(llm, run_manager=run_manager)
+    """Async version of `ChatLiteLLM.completion_with_retry`."""
+    policy = llm._retry_policy()
+    attempts = 0
+    failed_over = False
+    try:
+        while True:
+            breaker = None if failed_over else llm.circuit_breaker
+            if breaker is not None:
+                try:
+                    breaker.before_request()
+                except CircuitOpenError as e:
+                    metrics.inc("circuit_open")
+                    kwargs = llm._failover(kwargs, e)
+                    failed_over = True
+                    continue
+            attempts += 1
+            try:
+                response = await llm._asend(
+                    _attempt_params(policy, kwargs),
+                    policy.attempt_timeout,
+                    routed=not failed_over,
+                )
+            except BaseException as e:
+                if breaker is not None:
+                    breaker.record(e)
+                await asyncio.sleep(llm._retry_delay(policy, attempts, e))
+            else:
+                if breaker is not None:
+                    breaker.record(None)
+                return response
+    except BaseException:
+        metrics.inc("errors")
+        raise
+    finally:
+        _record_attempts(attempts)
+
+
+@functools.lru_cache(maxsize=None)
+def _default_retry_policy(max_attempts: int) -> RetryPolicy:
+    return RetryPolicy(max_attempts=max(max_attempts, 1))
+
+
+def _attempt_params(policy: RetryPolicy, kwargs: Dict[str, Any]) -> Dict[str, Any]:
+    """Request parameters of one attempt (bounded by the attempt timeout)."""
+    if policy.attempt_timeout is None:
+        return kwargs
+    timeout = kwargs.get("timeout")
+    if isinstance(timeout, (int, float)) and timeout <= policy.attempt_timeout:
+        return kwargs
+    return {**kwargs, "timeout": policy.attempt_timeout}
+
+
+def _next_delay(policy: RetryPolicy, attempts: int, error: BaseException) -> float:
+    """Seconds to wait before the next attempt, or re-raise `error`."""
+    if not isinstance(error, Exception):
+        raise error
+    delay = policy.next_delay(attempts, error)
+    if delay is None:
+        raise error
+    seconds, hinted = delay
+    if hinted:
+        metrics.inc("retry_after")
+    metrics.observe("backoff", seconds)
+    logger.debug(f"Retrying in {seconds:.2f}s after attempt {attempts} failed: {error!r}")
+    return seconds
+
+
+def _record_attempts(attempts: int) -> None:
+    metrics.inc("requests")
+    if attempts > 1:
+        metrics.inc("retries", attempts - 1)
+
+    stats = current_call_stats()
+    if stats is not None:
+        stats.attempts += attempts
+
+
+def _record_response(response: Any, cache_hit: bool = False) -> None:
+    stats = current_call_stats()
+    if stats is not None:
+        stats.record_response(response, cache_hit=cache_hit)
+
+
+def _start_llm_span(kwargs: Dict[str, Any]) -> Optional[Span]:
+    return start_span(
+        "litellm.completion",
+        kind="client",
+        attributes={
+            "gen_ai.system": "litellm",
+            "gen_ai.request.model": kwargs.get("model"),
+            "langdict.module": current_module(),
+            "langdict.stream": bool(kwargs.get("stream")),
+        },
+    )
+
+
+def _end_llm_span(span: Span, response: Any = None, stats: Optional[CallStats] = None) -> None:
+    if stats is None:
+        stats = CallStats()
+        stats.record_response(response)
+    span.set_attribute("gen_ai.response.model", stats.model)
+    span.set_attribute("gen_ai.usage.input_tokens", stats.prompt_tokens)
+    span.set_attribute("gen_ai.usage.output_tokens", stats.completion_tokens)
+    if stats.finish_reason:
+        span.set_attribute("gen_ai.response.finish_reasons", [stats.finish_reason])
+    span.end()
+
+
+def _timed_stream(
+    stream: Any,
+    start: float,
+    module: str,
+    span: Optional[Span] = None,
+) -> Iterator[Any]:
+    """Record time to first chunk and network time of a completion stream."""
+    stats = current_call_stats()
+    span_stats = CallStats() if span is not None else None
+    first = True
+    try:
+        for chunk in stream:
+            if first:
+                metrics.observe("ttft", time.perf_counter() - start, module=module)
+                first = False
+            if stats is not None:
+                stats.record_chunk(chunk)
+            if span_stats is not None:
+                span_stats.record_chunk(chunk)
+            yield chunk
+    finally:
+        metrics.observe("network", time.perf_counter() - start, module=module)
+        close_stream(stream)
+        if span is not None:
+            _end_llm_span(span, stats=span_stats)
+
+
+async def _atimed_stream(
+    stream: Any,
+    start: float,
+    module: str,
+    span: Optional[Span] = None,
+) -> AsyncIterator[Any]:
+    stats = current_call_stats()
+    span_stats = CallStats() if span is not None else None
+    first = True
+    try:
+        async for chunk in stream:
+            if first:
+                metrics.observe("ttft", time.perf_counter() - start, module=module)
+                first = False
+            if stats is not None:
+                stats.record_chunk(chunk)
+            if span_stats is not None:
+                span_stats.record_chunk(chunk)
+            yield chunk
+    finally:
+        metrics.observe("network", time.perf_counter() - start, module=module)
+        await aclose_stream(stream)
+        if span is not None:
+            _end_llm_span(span, stats=span_stats)
+
+
+def _response_to_dict(response: Any) -> Dict[str, Any]:
+    if isinstance(response, dict):
+        return response
+    return response.model_dump()
+
+
+def _text_response(text: str, model: Optional[str]) -> Dict[str, Any]:
+    """Response dict of a streamed (possibly partial) completion."""
+    return {
+        "object": "chat.completion",
+        "model": model,
+        "choices": [{
+            "index": 0,
+            "message": {"role": "assistant", "content": text},
+            "finish_reason": "stop",
+        }],
+    }
+
+
+def _total_tokens(response: Any) -> Optional[int]:
+    usage = response.get("usage") if isinstance(response, dict) else getattr(response, "usage", None)
+    if not usage:
+        return None
+    if isinstance(usage, dict):
+        return usage.get("total_tokens")
+    return getattr(usage, "total_tokens", None)
+
 
-    @retry_decorator
-    async def _completion_with_retry(**kwargs: Any) -> Any:
-        # Use OpenAI's async api https://github.com/openai/openai-python#async-api
-        return await llm.client.acreate(**kwargs)
+def _first_content(response: Mapping[str, Any]) -> str:
+    return response["choices"][0]["message"].get("content", "") or ""
 
-    return await _completion_with_retry(**kwargs)
+
+def _delta_content(chunk: Any) -> Optional[str]:
+    if not isinstance(chunk, dict):
+        chunk = chunk.model_dump()
+    if len(chunk["choices"]) == 0:
+        return None
+    return chunk["choices"][0]["delta"].get("content") or ""
 
 
 def _convert_delta_to_message_chunk(
@@ -215,9 +404,14 @@ def _convert_message_to_dict(message: BaseMessage) -> dict:
 
 
 class ChatLiteLLM(BaseChatModel):
-    """Chat model that uses the LiteLLM API."""
+    """Chat model that uses the LiteLLM API.
+
+    Instances are shared by every LangDict of an llm spec (see
+    `LiteLLMBuilder`), so their fields cannot be set once built; use
+    `LangDict.override_llm` to change one LangDict's copy.
+    """
 
-    client: Any  #: :meta private:
+    client: Any = None  #: :meta private: (litellm, imported on first use)
     model: str = "gpt-3.5-turbo"
     model_name: Optional[str] = None
     """Model name to use."""
@@ -227,7 +421,11 @@ class ChatLiteLLM(BaseChatModel):
     replicate_api_key: Optional[str] = None
     cohere_api_key: Optional[str] = None
     openrouter_api_key: Optional[str] = None
-    streaming: bool = False
+    streaming: Optional[bool] = None
+    """Whether to stream by default. Left unset (None) so that per-call
+       `stream()`/`astream()` are not disabled by langchain-core."""
+    api_key: Optional[str] = None
+    """API key of this deployment, sent with every request."""
     api_base: Optional[str] = None
     organization: Optional[str] = None
     custom_llm_provider: Optional[str] = None
@@ -248,6 +446,49 @@ class ChatLiteLLM(BaseChatModel):
     max_tokens: Optional[int] = None
 
     max_retries: int = 6
+    """Attempts per request, if `retry_policy` is not set."""
+    retry_policy: Optional[RetryPolicy] = None
+    """Backoff, jitter, attempt timeout and Retry-After handling of retries."""
+    circuit_breaker: Optional[CircuitBreaker] = None
+    """Fail fast while the deployment is unhealthy (shared per deployment)."""
+    fallback: Optional[Dict[str, Any]] = None
+    """Deployment (model, api_base, api_key, organization) that takes the
+    requests while the circuit breaker is open."""
+    hedger: Optional[Hedger] = None
+    """Race a duplicate request against requests slower than a latency percentile."""
+    router: Optional[Router] = None
+    """Spread requests over several deployments of the model."""
+
+    response_cache: Optional[BaseCache] = None
+    """Cache of completion responses, keyed on messages and request params."""
+    cache_nondeterministic: bool = False
+    """Cache responses even if temperature is not 0."""
+    cache_namespace: Optional[str] = None
+    """Backend of `client` in cache keys (e.g. provider and its options)."""
+    cassette: Optional[Cassette] = None
+    """Record/replay completions. Falls back to the cassette of `use_cassette`."""
+    request_limiter: Optional[RateLimiter] = None
+    """Client-side RPM/TPM limiter, shared by every instance of the deployment."""
+    client_pool: Optional[ClientPool] = None
+    """Shared OpenAI clients (keep-alive connections) of OpenAI-protocol models."""
+    coalesce: bool = False
+    """Share one upstream call between identical requests in flight."""
+
+    _frozen: bool = PrivateAttr(default=False)
+
+    def __init__(self, **kwargs: Any):
+        # langchain-core validators set fields while the model is built, so
+        # it is frozen afterwards instead of with `ConfigDict(frozen=True)`.
+        super().__init__(**kwargs)
+        self._frozen = True
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        if self._frozen and name in type(self).model_fields:
+            raise AttributeError(
+                f"ChatLiteLLM is shared by every LangDict of its specification; "
+                f"use LangDict.override_llm({name}=...) instead of setting \"{name}\"."
+            )
+        super().__setattr__(name, value)
 
     @property
     def _default_params(self) -> Dict[str, Any]:
@@ -259,7 +500,7 @@ class ChatLiteLLM(BaseChatModel):
             "model": set_model_value,
             "force_timeout": self.request_timeout,
             "max_tokens": self.max_tokens,
-            "stream": self.streaming,
+            "stream": bool(self.streaming),
             "n": self.n,
             "temperature": self.temperature,
             "custom_llm_provider": self.custom_llm_provider,
@@ -268,37 +509,509 @@ class ChatLiteLLM(BaseChatModel):
 
     @property
     def _client_params(self) -> Dict[str, Any]:
-        """Get the parameters used for the openai client."""
+        """Get the parameters used for the openai client.
+
+        Connection settings are passed with every request rather than set
+        on the (process-wide) `litellm` module, so instances pointing at
+        different deployments can run on threads side by side.
+        """
         set_model_value = self.model
         if self.model_name is not None:
             set_model_value = self.model_name
-        self.client.api_base = self.api_base
-        self.client.organization = self.organization
         creds: Dict[str, Any] = {
             "model": set_model_value,
             "force_timeout": self.request_timeout,
             "api_base": self.api_base,
         }
+        if self.api_key:
+            creds["api_key"] = self.api_key
+        if self.organization:
+            creds["organization"] = self.organization
+        if self.request_timeout is not None:
+            creds["timeout"] = self.request_timeout
         return {**self._default_params, **creds}
 
     def completion_with_retry(
         self, run_manager: Optional[CallbackManagerForLLMRun] = None, **kwargs: Any
     ) -> Any:
-        """Use tenacity to retry the completion call."""
-        retry_decorator = _create_retry_decorator(self, run_manager=run_manager)
+        """Call the client, retrying transient errors per the retry policy.
 
-        @retry_decorator
-        def _completion_with_retry(**kwargs: Any) -> Any:
-            return self.client.completion(**kwargs)
+        Requests to a deployment whose circuit breaker is open fail fast,
+        or go to the `fallback` deployment if set.
+        """
+        policy = self._retry_policy()
+        attempts = 0
+        failed_over = False
+        try:
+            while True:
+                breaker = None if failed_over else self.circuit_breaker
+                if breaker is not None:
+                    try:
+                        breaker.before_request()
+                    except CircuitOpenError as e:
+                        metrics.inc("circuit_open")
+                        kwargs = self._failover(kwargs, e)
+                        failed_over = True
+                        continue
+                attempts += 1
+                try:
+                    response = self._send(
+                        _attempt_params(policy, kwargs), routed=not failed_over
+                    )
+                except BaseException as e:
+                    if breaker is not None:
+                        breaker.record(e)
+                    time.sleep(self._retry_delay(policy, attempts, e))
+                else:
+                    if breaker is not None:
+                        breaker.record(None)
+                    return response
+        except BaseException:
+            metrics.inc("errors")
+            raise
+        finally:
+            _record_attempts(attempts)
 
-        return _completion_with_retry(**kwargs)
+    def _send(self, kwargs: Dict[str, Any], routed: bool = True) -> Any:
+        """One attempt, routed to a deployment and hedged if configured.
 
-    @pre_init
-    def validate_environment(cls, values: Dict) -> Dict:
-        """Validate api key, python package exists, temperature, top_p, and top_k."""
+        Requests sent to the `fallback` deployment are not `routed`.
+        """
+        route = None
+        call = self._call_client
+        if self.router is not None and routed:
+            route = self.router.acquire()
+            kwargs = {**kwargs, **route.params}
+            call = functools.partial(self._call_client, request_limiter=route.limiter)
         try:
+            if self.hedger is not None and self._active_cassette() is None:
+                response = self.hedger.call(call, kwargs)
+            else:
+                response = call(**kwargs)
+        except BaseException as e:
+            if route is not None:
+                self.router.release(route, e)
+            raise
+        if route is not None:
+            if kwargs.get("stream"):
+                return self.router.release_stream(route, response)
+            self.router.release(route)
+        return response
+
+    async def _asend(
+        self,
+        kwargs: Dict[str, Any],
+        attempt_timeout: Optional[float] = None,
+        routed: bool = True,
+    ) -> Any:
+        """Async version of `_send`."""
+        route = None
+        call = functools.partial(self._acall_client, attempt_timeout=attempt_timeout)
+        if self.router is not None and routed:
+            route = self.router.acquire()
+            kwargs = {**kwargs, **route.params}
+            call = functools.partial(call, request_limiter=route.limiter)
+        try:
+            if self.hedger is not None and self._active_cassette() is None:
+                response = await self.hedger.acall(call, kwargs)
+            else:
+                response = await call(**kwargs)
+        except BaseException as e:
+            if route is not None:
+                self.router.release(route, e)
+            raise
+        if route is not None:
+            if kwargs.get("stream"):
+                return self.router.arelease_stream(route, response)
+            self.router.release(route)
+        return response
+
+    def _retry_delay(self, policy: RetryPolicy, attempts: int, error: BaseException) -> float:
+        """Seconds to wait before retrying, or re-raise `error`."""
+        delay = _next_delay(policy, attempts, error)
+        if self.router is not None and self.router.available():
+            # The failing deployment is ejected; another one takes the retry now.
+            return 0.0
+        return delay
+
+    def _retry_policy(self) -> RetryPolicy:
+        if self.retry_policy is not None:
+            return self.retry_policy
+        return _default_retry_policy(self.max_retries)
+
+    def _failover(self, kwargs: Dict[str, Any], error: CircuitOpenError) -> Dict[str, Any]:
+        """Parameters of the request sent to `fallback`, or raise `error`.
+
+        The endpoint and credentials of the unhealthy deployment are not
+        sent to the fallback.
+        """
+        if self.fallback is None:
+            raise error
+        metrics.inc("failovers")
+        params = {
+            key: value for key, value in kwargs.items()
+            if key not in _DEPLOYMENT_PARAMS
+        }
+        return {**params, **self.fallback}
+
+    def _get_client(self) -> Any:
+        if self.client is None:
             import litellm
-        except ImportError:
+
+            return litellm
+        return self.client
+
+    def _call_client(
+        self,
+        request_limiter: Optional[RateLimiter] = None,
+        on_send: Optional[Callable[[], None]] = None,
+        **kwargs: Any,
+    ) -> Any:
+        """Single completion request (one attempt).
+
+        Args:
+            request_limiter: limiter of the routed deployment, instead of
+                `self.request_limiter`.
+            on_send: called once the rate limiter lets the request go.
+        """
+        request_limiter = request_limiter or self.request_limiter
+        estimated = 0
+        if request_limiter is not None:
+            estimated = estimate_tokens(
+                kwargs.get("messages", []), kwargs.get("max_tokens"), kwargs.get("n", 1)
+            )
+            with metrics.time("queued"):
+                request_limiter.acquire(estimated)
+        if on_send is not None:
+            on_send()
+
+        span = _start_llm_span(kwargs)
+        start = time.perf_counter()
+        cassette = self._active_cassette()
+        try:
+            if cassette is not None:
+                response = cassette.completion(self._get_client(), **kwargs)
+            else:
+                client = self._get_client()
+                if self.client_pool is not None and inspect.ismodule(client):
+                    pooled = self.client_pool.get(kwargs)
+                    if pooled is not None:
+                        kwargs = {**kwargs, "client": pooled}
+                response = client.completion(**kwargs)
+        except BaseException as e:
+            if span is not None:
+                span.end(error=e)
+            raise
+
+        if kwargs.get("stream"):
+            return _timed_stream(response, start, current_module(), span)
+
+        metrics.observe("network", time.perf_counter() - start)
+        if span is not None:
+            _end_llm_span(span, response)
+        if request_limiter is not None:
+            request_limiter.reconcile(estimated, _total_tokens(response))
+        return response
+
+    async def _acall_client(
+        self,
+        attempt_timeout: Optional[float] = None,
+        request_limiter: Optional[RateLimiter] = None,
+        on_send: Optional[Callable[[], None]] = None,
+        **kwargs: Any,
+    ) -> Any:
+        """Single async completion request (one attempt).
+
+        Args:
+            attempt_timeout: seconds the request may take before it is
+                cancelled (time queued in the rate limiter excluded).
+            request_limiter: limiter of the routed deployment, instead of
+                `self.request_limiter`.
+            on_send: called once the rate limiter lets the request go.
+        """
+        request_limiter = request_limiter or self.request_limiter
+        estimated = 0
+        if request_limiter is not None:
+            estimated = estimate_tokens(
+                kwargs.get("messages", []), kwargs.get("max_tokens"), kwargs.get("n", 1)
+            )
+            with metrics.time("queued"):
+                await request_limiter.aacquire(estimated)
+        if on_send is not None:
+            on_send()
+
+        span = _start_llm_span(kwargs)
+        start = time.perf_counter()
+        cassette = self._active_cassette()
+        try:
+            if cassette is not None:
+                call = cassette.acompletion(self._get_client(), **kwargs)
+            else:
+                client = self._get_client()
+                if self.client_pool is not None and inspect.ismodule(client):
+                    pooled = self.client_pool.aget(kwargs)
+                    if pooled is not None:
+                        kwargs = {**kwargs, "client": pooled}
+                call = client.acompletion(**kwargs)
+            if attempt_timeout is not None:
+                response = await asyncio.wait_for(call, attempt_timeout)
+            else:
+                response = await call
+        except BaseException as e:
+            if span is not None:
+                span.end(error=e)
+            raise
+
+        if kwargs.get("stream"):
+            return _atimed_stream(response, start, current_module(), span)
+
+        metrics.observe("network", time.perf_counter() - start)
+        if span is not None:
+            _end_llm_span(span, response)
+        if request_limiter is not None:
+            request_limiter.reconcile(estimated, _total_tokens(response))
+        return response
+
+    def _active_cassette(self) -> Optional[Cassette]:
+        if self.cassette is not None:
+            return self.cassette
+        return current_cassette()
+
+    def _cache_key(
+        self, message_dicts: List[Dict[str, Any]], params: Dict[str, Any]
+    ) -> Optional[str]:
+        if self.response_cache is None:
+            return None
+        if (
+            not self.cache_nondeterministic and
+            params.get("temperature") != 0
+        ):
+            return None
+        return self._request_key(message_dicts, params)
+
+    def _request_key(
+        self, message_dicts: List[Dict[str, Any]], params: Dict[str, Any]
+    ) -> str:
+        """Key of identical requests to the same backend."""
+        return make_cache_key(message_dicts, {**params, "provider": self.cache_namespace})
+
+    def _flight_key(
+        self, message_dicts: List[Dict[str, Any]], params: Dict[str, Any]
+    ) -> str:
+        """Single-flight key: identical requests to the same endpoint, with the same key.
+
+        Unlike cache entries, in-flight calls are not shared across
+        deployments (their quotas and health are separate).
+        """
+        return self._request_key(message_dicts, {**params, "deployment": deployment_key(params)})
+
+    def _complete(
+        self,
+        message_dicts: List[Dict[str, Any]],
+        run_manager: Optional[CallbackManagerForLLMRun] = None,
+        **params: Any,
+    ) -> Any:
+        """Completion call for message dicts.
+
+        Served from the response cache if possible; identical requests in
+        flight at the same time share one upstream call if `coalesce` is set.
+        """
+        cache_key = self._cache_key(message_dicts, params)
+        if cache_key is not None:
+            cached = self.response_cache.lookup(cache_key)
+            if cached is not None:
+                metrics.inc("cache_hits")
+                _record_response(cached, cache_hit=True)
+                return cached
+
+        def _completion() -> Any:
+            response = self.completion_with_retry(
+                messages=message_dicts, run_manager=run_manager, **params
+            )
+            if cache_key is not None:
+                self.response_cache.set(cache_key, _response_to_dict(response))
+            return response
+
+        if self.coalesce:
+            response = single_flight.do(
+                self._flight_key(message_dicts, params), _completion
+            )
+        else:
+            response = _completion()
+        _record_response(response)
+        return response
+
+    async def _acomplete(
+        self,
+        message_dicts: List[Dict[str, Any]],
+        run_manager: Optional[AsyncCallbackManagerForLLMRun] = None,
+        **params: Any,
+    ) -> Any:
+        """Async version of `_complete`."""
+        cache_key = self._cache_key(message_dicts, params)
+        if cache_key is not None:
+            cached = self.response_cache.lookup(cache_key)
+            if cached is not None:
+                metrics.inc("cache_hits")
+                _record_response(cached, cache_hit=True)
+                return cached
+
+        async def _completion() -> Any:
+            response = await acompletion_with_retry(
+                self, messages=message_dicts, run_manager=run_manager, **params
+            )
+            if cache_key is not None:
+                self.response_cache.set(cache_key, _response_to_dict(response))
+            return response
+
+        if self.coalesce:
+            response = await single_flight.ado(
+                self._flight_key(message_dicts, params), _completion
+            )
+        else:
+            response = await _completion()
+        _record_response(response)
+        return response
+
+    def generate_text(self, message_dicts: List[Dict[str, Any]], **kwargs: Any) -> str:
+        """Content of the first choice for message dicts.
+
+        Same request as `invoke`, without LangChain messages, callbacks
+        and `ChatResult` construction.
+        """
+        if self.streaming:
+            return "".join(self.stream_text(message_dicts, **kwargs))
+
+        params = {**self._client_params, **kwargs}
+        response = self._complete(message_dicts, **params)
+        return _first_content(response)
+
+    async def agenerate_text(self, message_dicts: List[Dict[str, Any]], **kwargs: Any) -> str:
+        """Async version of `generate_text`."""
+        if self.streaming:
+            return "".join([c async for c in self.astream_text(message_dicts, **kwargs)])
+
+        params = {**self._client_params, **kwargs}
+        response = await self._acomplete(message_dicts, **params)
+        return _first_content(response)
+
+    def stream_text(self, message_dicts: List[Dict[str, Any]], **kwargs: Any) -> Iterator[str]:
+        """Content deltas of the first choice for message dicts."""
+        params = {**self._client_params, **kwargs, "stream": True}
+        stream = self.completion_with_retry(messages=message_dicts, **params)
+        try:
+            for chunk in stream:
+                content = _delta_content(chunk)
+                if content is not None:
+                    yield content
+        finally:
+            close_stream(stream)
+
+    async def astream_text(
+        self, message_dicts: List[Dict[str, Any]], **kwargs: Any
+    ) -> AsyncIterator[str]:
+        """Async version of `stream_text`."""
+        params = {**self._client_params, **kwargs, "stream": True}
+        stream = await acompletion_with_retry(self, messages=message_dicts, **params)
+        try:
+            async for chunk in stream:
+                content = _delta_content(chunk)
+                if content is not None:
+                    yield content
+        finally:
+            await aclose_stream(stream)
+
+    def generate_prefix(
+        self,
+        message_dicts: List[Dict[str, Any]],
+        until: Callable[[str], bool],
+        prefix_key: str,
+        **kwargs: Any,
+    ) -> str:
+        """Content of the first choice, streamed until `until(delta)` is true.
+
+        The rest of the completion is not waited for. Prefixes are served
+        from the response cache and coalesced like `generate_text`, under a
+        key that includes `prefix_key` (the stop condition), so a prefix is
+        never served as a full response.
+        """
+        params = {**self._client_params, **kwargs}
+        key_params = {**params, "prefix": prefix_key}
+        cache_key = self._cache_key(message_dicts, key_params)
+        if cache_key is not None:
+            cached = self.response_cache.lookup(cache_key)
+            if cached is not None:
+                metrics.inc("cache_hits")
+                _record_response(cached, cache_hit=True)
+                return _first_content(cached)
+
+        def _prefix() -> str:
+            deltas = []
+            stream = self.stream_text(message_dicts, **kwargs)
+            try:
+                for delta in stream:
+                    deltas.append(delta)
+                    if until(delta):
+                        break
+            finally:
+                stream.close()
+            text = "".join(deltas)
+            if cache_key is not None:
+                self.response_cache.set(cache_key, _text_response(text, params["model"]))
+            return text
+
+        if self.coalesce:
+            return single_flight.do(
+                self._flight_key(message_dicts, key_params), _prefix
+            )
+        return _prefix()
+
+    async def agenerate_prefix(
+        self,
+        message_dicts: List[Dict[str, Any]],
+        until: Callable[[str], bool],
+        prefix_key: str,
+        **kwargs: Any,
+    ) -> str:
+        """Async version of `generate_prefix`."""
+        params = {**self._client_params, **kwargs}
+        key_params = {**params, "prefix": prefix_key}
+        cache_key = self._cache_key(message_dicts, key_params)
+        if cache_key is not None:
+            cached = self.response_cache.lookup(cache_key)
+            if cached is not None:
+                metrics.inc("cache_hits")
+                _record_response(cached, cache_hit=True)
+                return _first_content(cached)
+
+        async def _prefix() -> str:
+            deltas = []
+            stream = self.astream_text(message_dicts, **kwargs)
+            try:
+                async for delta in stream:
+                    deltas.append(delta)
+                    if until(delta):
+                        break
+            finally:
+                await stream.aclose()
+            text = "".join(deltas)
+            if cache_key is not None:
+                self.response_cache.set(cache_key, _text_response(text, params["model"]))
+            return text
+
+        if self.coalesce:
+            return await single_flight.ado(
+                self._flight_key(message_dicts, key_params), _prefix
+            )
+        return await _prefix()
+
+    @pre_init
+    def validate_environment(cls, values: Dict) -> Dict:
+        """Validate api key, python package exists, temperature, top_p, and top_k.
+
+        litellm itself is only imported on the first request.
+        """
+        if importlib.util.find_spec("litellm") is None:
             raise ChatLiteLLMException(
                 "Could not import litellm python package. "
                 "Please install it with `pip install litellm`"
@@ -328,7 +1041,7 @@ class ChatLiteLLM(BaseChatModel):
         values["together_ai_api_key"] = get_from_dict_or_env(
             values, "together_ai_api_key", "TOGETHERAI_API_KEY", default=""
         )
-        values["client"] = litellm
+        values["client"] = values.get("client")
 
         if values["temperature"] is not None and not 0 <= values["temperature"] <= 1:
             raise ValueError("temperature must be in the range [0.0, 1.0]")
@@ -358,9 +1071,7 @@ class ChatLiteLLM(BaseChatModel):
 
         message_dicts, params = self._create_message_dicts(messages, stop)
         params = {**params, **kwargs}
-        response = self.completion_with_retry(
-            messages=message_dicts, run_manager=run_manager, **params
-        )
+        response = self._complete(message_dicts, run_manager=run_manager, **params)
         return self._create_chat_result(response)
 
     def _create_chat_result(self, response: Mapping[str, Any]) -> ChatResult:
@@ -401,20 +1112,24 @@ class ChatLiteLLM(BaseChatModel):
         params = {**params, **kwargs, "stream": True}
 
         default_chunk_class = AIMessageChunk
-        for chunk in self.completion_with_retry(
+        stream = self.completion_with_retry(
             messages=message_dicts, run_manager=run_manager, **params
-        ):
-            if not isinstance(chunk, dict):
-                chunk = chunk.model_dump()
-            if len(chunk["choices"]) == 0:
-                continue
-            delta = chunk["choices"][0]["delta"]
-            chunk = _convert_delta_to_message_chunk(delta, default_chunk_class)
-            default_chunk_class = chunk.__class__
-            cg_chunk = ChatGenerationChunk(message=chunk)
-            if run_manager:
-                run_manager.on_llm_new_token(chunk.content, chunk=cg_chunk)
-            yield cg_chunk
+        )
+        try:
+            for chunk in stream:
+                if not isinstance(chunk, dict):
+                    chunk = chunk.model_dump()
+                if len(chunk["choices"]) == 0:
+                    continue
+                delta = chunk["choices"][0]["delta"]
+                chunk = _convert_delta_to_message_chunk(delta, default_chunk_class)
+                default_chunk_class = chunk.__class__
+                cg_chunk = ChatGenerationChunk(message=chunk)
+                if run_manager:
+                    run_manager.on_llm_new_token(chunk.content, chunk=cg_chunk)
+                yield cg_chunk
+        finally:
+            close_stream(stream)
 
     async def _astream(
         self,
@@ -427,20 +1142,24 @@ class ChatLiteLLM(BaseChatModel):
         params = {**params, **kwargs, "stream": True}
 
         default_chunk_class = AIMessageChunk
-        async for chunk in await acompletion_with_retry(
+        stream = await acompletion_with_retry(
             self, messages=message_dicts, run_manager=run_manager, **params
-        ):
-            if not isinstance(chunk, dict):
-                chunk = chunk.model_dump()
-            if len(chunk["choices"]) == 0:
-                continue
-            delta = chunk["choices"][0]["delta"]
-            chunk = _convert_delta_to_message_chunk(delta, default_chunk_class)
-            default_chunk_class = chunk.__class__
-            cg_chunk = ChatGenerationChunk(message=chunk)
-            if run_manager:
-                await run_manager.on_llm_new_token(chunk.content, chunk=cg_chunk)
-            yield cg_chunk
+        )
+        try:
+            async for chunk in stream:
+                if not isinstance(chunk, dict):
+                    chunk = chunk.model_dump()
+                if len(chunk["choices"]) == 0:
+                    continue
+                delta = chunk["choices"][0]["delta"]
+                chunk = _convert_delta_to_message_chunk(delta, default_chunk_class)
+                default_chunk_class = chunk.__class__
+                cg_chunk = ChatGenerationChunk(message=chunk)
+                if run_manager:
+                    await run_manager.on_llm_new_token(chunk.content, chunk=cg_chunk)
+                yield cg_chunk
+        finally:
+            await aclose_stream(stream)
 
     async def _agenerate(
         self,
@@ -459,8 +1178,8 @@ class ChatLiteLLM(BaseChatModel):
 
         message_dicts, params = self._create_message_dicts(messages, stop)
         params = {**params, **kwargs}
-        response = await acompletion_with_retry(
-            self, messages=message_dicts, run_manager=run_manager, **params
+        response = await self._acomplete(
+            message_dicts, run_manager=run_manager, **params
         )
         return self._create_chat_result(response)
 
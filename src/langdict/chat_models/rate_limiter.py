@@ -0,0 +1,186 @@
+"""Client-side RPM/TPM rate limiting for LLM deployments."""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import threading
+import time
+from typing import Any, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class TokenBucket:
+    """Token bucket refilled continuously up to `capacity` per minute.
+
+    Reservations are taken immediately and may drive the bucket negative;
+    the caller then waits until the debt is refilled. This keeps callers
+    in FIFO order without holding a lock while sleeping.
+    """
+
+    def __init__(self, per_minute: float):
+        self.capacity = float(per_minute)
+        self.rate = self.capacity / 60.0
+        self.tokens = self.capacity
+        self.updated_at = time.monotonic()
+
+    def _refill(self, now: float) -> None:
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated_at) * self.rate)
+        self.updated_at = now
+
+    def reserve(self, amount: float, now: float) -> float:
+        """Take `amount` tokens and return the seconds to wait before using them."""
+        self._refill(now)
+        self.tokens -= amount
+        if self.tokens >= 0:
+            return 0.0
+        return -self.tokens / self.rate
+
+    def adjust(self, amount: float, now: float) -> None:
+        """Give back (positive) or take (negative) tokens after the fact."""
+        self._refill(now)
+        self.tokens = min(self.capacity, self.tokens + amount)
+
+
+class RateLimiter:
+    """Requests-per-minute and tokens-per-minute budget of one deployment.
+
+    Example::
+
+        limiter = RateLimiter(rpm=500, tpm=200_000)
+        estimated = estimate_tokens(messages, max_tokens=256)
+        limiter.acquire(estimated)
+        response = litellm.completion(...)
+        limiter.reconcile(estimated, response["usage"]["total_tokens"])
+
+    Args:
+        rpm: requests per minute. if None, requests are not limited.
+        tpm: tokens per minute. if None, tokens are not limited.
+    """
+
+    def __init__(self, rpm: Optional[float] = None, tpm: Optional[float] = None):
+        if rpm is not None and rpm <= 0:
+            raise ValueError("rpm must be positive")
+        if tpm is not None and tpm <= 0:
+            raise ValueError("tpm must be positive")
+
+        self.rpm = rpm
+        self.tpm = tpm
+        self._requests = TokenBucket(rpm) if rpm else None
+        self._tokens = TokenBucket(tpm) if tpm else None
+        self._lock = threading.Lock()
+
+        self.acquired = 0
+        self.throttled = 0
+        self.wait_time = 0.0
+
+    def _reserve(self, tokens: int) -> float:
+        with self._lock:
+            now = time.monotonic()
+            wait = 0.0
+            if self._requests is not None:
+                wait = max(wait, self._requests.reserve(1, now))
+            if self._tokens is not None:
+                wait = max(wait, self._tokens.reserve(tokens, now))
+
+            self.acquired += 1
+            if wait > 0:
+                self.throttled += 1
+                self.wait_time += wait
+            return wait
+
+    def acquire(self, tokens: int = 0) -> float:
+        """Block until a request of `tokens` estimated tokens may be sent.
+
+        Returns:
+            float: seconds spent waiting.
+        """
+        wait = self._reserve(tokens)
+        if wait > 0:
+            time.sleep(wait)
+        return wait
+
+    async def aacquire(self, tokens: int = 0) -> float:
+        """Async version of `acquire`."""
+        wait = self._reserve(tokens)
+        if wait > 0:
+            await asyncio.sleep(wait)
+        return wait
+
+    def reconcile(self, estimated: int, actual: Optional[int]) -> None:
+        """Correct the token budget with the actual usage of a request."""
+        if self._tokens is None or actual is None:
+            return
+        with self._lock:
+            self._tokens.adjust(estimated - actual, time.monotonic())
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "rpm": self.rpm,
+                "tpm": self.tpm,
+                "acquired": self.acquired,
+                "throttled": self.throttled,
+                "wait_time": self.wait_time,
+            }
+
+
+_limiters: Dict[str, RateLimiter] = {}
+_limiters_lock = threading.Lock()
+
+
+def get_rate_limiter(
+    key: str,
+    rpm: Optional[float] = None,
+    tpm: Optional[float] = None,
+) -> RateLimiter:
+    """Process-wide rate limiter of a model/deployment.
+
+    Every ChatLiteLLM of the same deployment shares one limiter, so the
+    budget holds across all LangDict instances of the process.
+
+    Args:
+        key: model or deployment identifier.
+        rpm: requests per minute.
+        tpm: tokens per minute.
+    """
+    with _limiters_lock:
+        limiter = _limiters.get(key)
+        if limiter is None:
+            limiter = RateLimiter(rpm=rpm, tpm=tpm)
+            _limiters[key] = limiter
+        elif (limiter.rpm, limiter.tpm) != (rpm, tpm):
+            logger.warning(
+                f"Rate limiter [{key}] already exists with rpm={limiter.rpm}, "
+                f"tpm={limiter.tpm}; ignoring rpm={rpm}, tpm={tpm}."
+            )
+        return limiter
+
+
+def rate_limiter_stats() -> Dict[str, Dict[str, Any]]:
+    """Stats of every process-wide rate limiter."""
+    with _limiters_lock:
+        limiters = dict(_limiters)
+    return {key: limiter.stats() for key, limiter in limiters.items()}
+
+
+def estimate_tokens(
+    messages: List[Dict[str, Any]],
+    max_tokens: Optional[int] = None,
+    n: int = 1,
+) -> int:
+    """Cheap estimate of the tokens a request counts against a TPM budget.
+
+    Uses ~4 characters per token for the prompt, plus the completion
+    budget (`max_tokens * n`), which providers reserve up front.
+    """
+    chars = 0
+    for message in messages:
+        content = message.get("content")
+        if isinstance(content, str):
+            chars += len(content)
+        elif content:
+            chars += len(str(content))
+    prompt_tokens = chars // 4 + 4 * len(messages)
+    return prompt_tokens + (max_tokens or 0) * (n or 1)
@@ -0,0 +1,348 @@
+"""Retry policy and per-deployment circuit breakers of LLM requests."""
+
+from __future__ import annotations
+
+import asyncio
+import email.utils
+import logging
+import random
+import threading
+import time
+from typing import Any, Dict, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+_RETRYABLE_STATUS = (408, 409, 429)
+
+_retryable_errors: Optional[Tuple[type, ...]] = None
+
+
+def _retryable_error_types() -> Tuple[type, ...]:
+    global _retryable_errors
+    if _retryable_errors is None:
+        import litellm
+
+        errors = [asyncio.TimeoutError, TimeoutError]
+        for name in (
+            "Timeout",
+            "APIError",
+            "APIConnectionError",
+            "RateLimitError",
+            "InternalServerError",
+            "ServiceUnavailableError",
+            "BadGatewayError",
+        ):
+            error = getattr(litellm, name, None)
+            if error is not None:
+                errors.append(error)
+        _retryable_errors = tuple(errors)
+    return _retryable_errors
+
+
+def is_rate_limit(error: BaseException) -> bool:
+    return getattr(error, "status_code", None) == 429 or type(error).__name__ == "RateLimitError"
+
+
+def is_retryable(error: BaseException) -> bool:
+    """Transient error: timeout, connection error, rate limit or 5xx."""
+    if isinstance(error, CircuitOpenError):
+        return False
+    if isinstance(error, _retryable_error_types()):
+        return True
+    status_code = getattr(error, "status_code", None)
+    if isinstance(status_code, int):
+        return status_code in _RETRYABLE_STATUS or status_code >= 500
+    return False
+
+
+def is_unhealthy(error: BaseException) -> bool:
+    """Error that counts against the health of a deployment.
+
+    Rate limits do not: the deployment is up, and `Retry-After` says when
+    to come back.
+    """
+    return is_retryable(error) and not is_rate_limit(error)
+
+
+def retry_after(error: BaseException) -> Optional[float]:
+    """Seconds to wait from the `Retry-After(-ms)` header of a failed response."""
+    headers = getattr(error, "litellm_response_headers", None)
+    if not headers:
+        headers = getattr(getattr(error, "response", None), "headers", None)
+    if not headers:
+        headers = getattr(error, "headers", None)
+    if not headers:
+        return None
+
+    def _header(name: str) -> Optional[str]:
+        value = headers.get(name)
+        if value is None:
+            value = headers.get(name.title())
+        return value
+
+    value = _header("retry-after-ms")
+    if value is not None:
+        try:
+            return max(float(value) / 1000.0, 0.0)
+        except ValueError:
+            pass
+
+    value = _header("retry-after")
+    if value is None:
+        return None
+    try:
+        return max(float(value), 0.0)
+    except ValueError:
+        pass
+    try:
+        date = email.utils.parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    return max(date.timestamp() - time.time(), 0.0)
+
+
+class RetryPolicy:
+    """How failed LLM requests are retried.
+
+    Delays grow exponentially with "full jitter" (uniform between 0 and
+    the exponential delay), so clients that failed together do not retry
+    together. A `Retry-After` hint of the provider replaces the computed
+    delay.
+
+    Example::
+
+        "llm": {
+            "model": "gpt-4o-mini",
+            "retry": {"max_attempts": 4, "attempt_timeout": 20, "max_delay": 8},
+        }
+
+    Args:
+        max_attempts: attempts per request, including the first one.
+        initial_delay: delay before the first retry, in seconds.
+        max_delay: upper bound of the computed delays.
+        multiplier: growth factor of the delay per attempt.
+        jitter: randomize the delays (full jitter).
+        attempt_timeout: seconds an attempt may take before it is cancelled
+            and retried. if None, only the request timeout applies.
+        respect_retry_after: wait as long as the provider's `Retry-After`.
+        max_retry_after: upper bound of the `Retry-After` waits; longer
+            hints fail the request instead.
+    """
+
+    def __init__(
+        self,
+        max_attempts: int = 6,
+        initial_delay: float = 1.0,
+        max_delay: float = 20.0,
+        multiplier: float = 2.0,
+        jitter: bool = True,
+        attempt_timeout: Optional[float] = None,
+        respect_retry_after: bool = True,
+        max_retry_after: float = 60.0,
+    ):
+        if max_attempts < 1:
+            raise ValueError("max_attempts must be at least 1.")
+        if initial_delay < 0 or max_delay < 0 or max_retry_after < 0:
+            raise ValueError("initial_delay, max_delay and max_retry_after must not be negative.")
+        if multiplier < 1:
+            raise ValueError("multiplier must be at least 1.")
+        if attempt_timeout is not None and attempt_timeout <= 0:
+            raise ValueError("attempt_timeout must be positive.")
+
+        self.max_attempts = max_attempts
+        self.initial_delay = initial_delay
+        self.max_delay = max_delay
+        self.multiplier = multiplier
+        self.jitter = jitter
+        self.attempt_timeout = attempt_timeout
+        self.respect_retry_after = respect_retry_after
+        self.max_retry_after = max_retry_after
+
+    def backoff(self, attempt: int) -> float:
+        """Computed delay after the `attempt`-th failed attempt (1-based)."""
+        delay = min(self.max_delay, self.initial_delay * self.multiplier ** (attempt - 1))
+        if self.jitter:
+            delay = random.uniform(0, delay)
+        return delay
+
+    def next_delay(self, attempt: int, error: BaseException) -> Optional[Tuple[float, bool]]:
+        """(seconds to wait, from Retry-After) before the next attempt.
+
+        None if the request should not be retried.
+        """
+        if attempt >= self.max_attempts or not is_retryable(error):
+            return None
+        if self.respect_retry_after:
+            hint = retry_after(error)
+            if hint is not None:
+                if hint > self.max_retry_after:
+                    return None
+                return hint, True
+        return self.backoff(attempt), False
+
+
+class CircuitOpenError(RuntimeError):
+    """Requests to a deployment are rejected while its circuit breaker is open."""
+
+    def __init__(self, key: str, retry_in: float):
+        super().__init__(
+            f"Circuit breaker [{key}] is open; retry in {retry_in:.1f}s."
+        )
+        self.key = key
+        self.retry_in = retry_in
+
+
+class CircuitBreaker:
+    """Fail fast while a deployment is unhealthy.
+
+    After `failure_threshold` consecutive failures (timeouts, connection
+    errors, 5xx) the breaker opens and requests fail immediately with
+    `CircuitOpenError`. After `recovery_time` seconds one probe request
+    is let through (half-open): its success closes the breaker, its
+    failure opens it again.
+
+    Args:
+        key: deployment identifier (for errors and stats).
+        failure_threshold: consecutive failures that open the breaker.
+        recovery_time: seconds the breaker stays open.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, key: str = "default", failure_threshold: int = 5, recovery_time: float = 30.0):
+        if failure_threshold < 1:
+            raise ValueError("failure_threshold must be at least 1.")
+        if recovery_time < 0:
+            raise ValueError("recovery_time must not be negative.")
+        self.key = key
+        self.failure_threshold = failure_threshold
+        self.recovery_time = recovery_time
+
+        self._state = self.CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._probing = False
+        self._lock = threading.Lock()
+
+        self.opened = 0
+        self.rejected = 0
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            return self._current_state(time.monotonic())
+
+    def _current_state(self, now: float) -> str:
+        if self._state == self.OPEN and now - self._opened_at >= self.recovery_time:
+            self._state = self.HALF_OPEN
+            self._probing = False
+        return self._state
+
+    def before_request(self) -> None:
+        """Let a request through, or raise `CircuitOpenError`."""
+        with self._lock:
+            now = time.monotonic()
+            state = self._current_state(now)
+            if state == self.CLOSED:
+                return
+            if state == self.HALF_OPEN and not self._probing:
+                self._probing = True
+                return
+            self.rejected += 1
+            retry_in = max(self._opened_at + self.recovery_time - now, 0.0)
+        raise CircuitOpenError(self.key, retry_in)
+
+    def record_success(self) -> None:
+        with self._lock:
+            self._failures = 0
+            self._probing = False
+            if self._state != self.CLOSED:
+                logger.info(f"Circuit breaker [{self.key}] closed.")
+            self._state = self.CLOSED
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self._failures += 1
+            self._probing = False
+            reopen = self._state == self.HALF_OPEN
+            if reopen or self._failures >= self.failure_threshold:
+                if self._state != self.OPEN:
+                    self.opened += 1
+                    logger.warning(
+                        f"Circuit breaker [{self.key}] opened after "
+                        f"{self._failures} consecutive failure(s)."
+                    )
+                self._state = self.OPEN
+                self._opened_at = time.monotonic()
+
+    def record(self, error: Optional[BaseException]) -> None:
+        """Record the outcome of a request (None for a success)."""
+        if error is None:
+            self.record_success()
+        elif is_unhealthy(error):
+            self.record_failure()
+        elif isinstance(error, Exception):
+            # The deployment answered (e.g. 400 Bad Request).
+            self.record_success()
+        else:
+            # Cancelled: no verdict on the deployment.
+            with self._lock:
+                self._probing = False
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "state": self._current_state(time.monotonic()),
+                "failures": self._failures,
+                "opened": self.opened,
+                "rejected": self.rejected,
+            }
+
+
+_breakers: Dict[str, CircuitBreaker] = {}
+_breakers_lock = threading.Lock()
+
+
+def get_circuit_breaker(
+    key: str,
+    failure_threshold: int = 5,
+    recovery_time: float = 30.0,
+) -> CircuitBreaker:
+    """Process-wide circuit breaker of a model/deployment.
+
+    Args:
+        key: model or deployment identifier.
+        failure_threshold: consecutive failures that open the breaker.
+        recovery_time: seconds the breaker stays open.
+    """
+    with _breakers_lock:
+        breaker = _breakers.get(key)
+        if breaker is None:
+            breaker = CircuitBreaker(
+                key, failure_threshold=failure_threshold, recovery_time=recovery_time
+            )
+            _breakers[key] = breaker
+        elif (breaker.failure_threshold, breaker.recovery_time) != (failure_threshold, recovery_time):
+            logger.warning(
+                f"Circuit breaker [{key}] already exists with "
+                f"failure_threshold={breaker.failure_threshold}, "
+                f"recovery_time={breaker.recovery_time}; ignoring "
+                f"failure_threshold={failure_threshold}, recovery_time={recovery_time}."
+            )
+        return breaker
+
+
+def circuit_breaker_stats() -> Dict[str, Dict[str, Any]]:
+    """State of every process-wide circuit breaker."""
+    with _breakers_lock:
+        breakers = dict(_breakers)
+    return {key: breaker.stats() for key, breaker in breakers.items()}
+
+
+def clear_circuit_breakers() -> None:
+    """Forget every process-wide circuit breaker (e.g. between tests)."""
+    with _breakers_lock:
+        _breakers.clear()
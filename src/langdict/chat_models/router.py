@@ -0,0 +1,319 @@
+"""Load balancing of one logical model across several deployments."""
+
+from __future__ import annotations
+
+import hashlib
+import logging
+import random
+import threading
+import time
+from typing import Any, AsyncIterator, Dict, Iterator, List, Optional
+
+from langdict.metrics import metrics
+
+from .rate_limiter import RateLimiter
+from .retry import is_retryable, retry_after
+from .streams import aclose_stream, close_stream
+
+logger = logging.getLogger(__name__)
+
+
+# Endpoint and credentials of a deployment.
+_DEPLOYMENT_PARAMS = ("api_base", "api_key", "organization")
+_PARAM_KEYS = ("model",) + _DEPLOYMENT_PARAMS
+
+
+class Deployment:
+    """Load and health of one deployment, shared by every router of the process."""
+
+    def __init__(self, key: str):
+        self.key = key
+        self.outstanding = 0
+        self.ewma: Optional[float] = None
+        self.ejected_until = 0.0
+        self.requests = 0
+        self.errors = 0
+        self.ejections = 0
+        self._lock = threading.Lock()
+
+    def ejected(self, now: float) -> bool:
+        return now < self.ejected_until
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "outstanding": self.outstanding,
+                "ewma": self.ewma,
+                "requests": self.requests,
+                "errors": self.errors,
+                "ejections": self.ejections,
+                "ejected": self.ejected(time.monotonic()),
+            }
+
+
+_deployments: Dict[str, Deployment] = {}
+_deployments_lock = threading.Lock()
+
+
+def _get_deployment(key: str) -> Deployment:
+    with _deployments_lock:
+        deployment = _deployments.get(key)
+        if deployment is None:
+            deployment = Deployment(key)
+            _deployments[key] = deployment
+        return deployment
+
+
+class Route:
+    """Deployment picked for one request: its parameters and rate limiter."""
+
+    __slots__ = ("deployment", "params", "limiter", "start", "latency")
+
+    def __init__(
+        self,
+        deployment: Deployment,
+        params: Dict[str, Any],
+        limiter: Optional[RateLimiter],
+    ):
+        self.deployment = deployment
+        self.params = params
+        self.limiter = limiter
+        self.start = time.perf_counter()
+        # time to first chunk of a stream
+        self.latency: Optional[float] = None
+
+
+class Router:
+    """Spread the requests of a model over several deployments.
+
+    Each request goes to the available deployment with the fewest requests
+    in flight ("least_outstanding"), or with the lowest EWMA latency
+    weighted by its requests in flight ("ewma"). A deployment that answers
+    with a rate limit, a 5xx or a connection error is ejected for
+    `ejection_time` seconds (or its `Retry-After`), and the retry goes to
+    another deployment right away.
+
+    Load and health are shared by every router of the process (see
+    `deployment_key`).
+
+    Example::
+
+        "llm": {
+            "model": "gpt-4o-mini",
+            "deployments": [
+                {"api_base": "https://east.example.com/v1", "api_key": "...", "rate_limit": {"rpm": 500}},
+                {"api_base": "https://west.example.com/v1", "api_key": "..."},
+            ],
+            "routing": {"strategy": "ewma", "ejection_time": 30},
+        }
+
+    Args:
+        deployments: request parameters of each deployment (model,
+            api_base, api_key, organization) and their rate limiters.
+        strategy: "least_outstanding" or "ewma".
+        ejection_time: seconds a failing deployment is left out.
+        ewma_alpha: weight of the latest latency in the EWMA.
+    """
+
+    STRATEGIES = ("least_outstanding", "ewma")
+
+    def __init__(
+        self,
+        deployments: List[Dict[str, Any]],
+        strategy: str = "least_outstanding",
+        ejection_time: float = 30.0,
+        ewma_alpha: float = 0.3,
+        limiters: Optional[List[Optional[RateLimiter]]] = None,
+    ):
+        if not deployments:
+            raise ValueError("Router needs at least one deployment.")
+        if strategy not in self.STRATEGIES:
+            raise ValueError(f"Invalid routing strategy: {strategy}")
+        if ejection_time < 0:
+            raise ValueError("ejection_time must not be negative.")
+        if not 0 < ewma_alpha <= 1:
+            raise ValueError("ewma_alpha must be in (0, 1].")
+
+        self.params = [
+            {key: value for key, value in d.items() if key in _PARAM_KEYS}
+            for d in deployments
+        ]
+        self.limiters = limiters or [None] * len(deployments)
+        self.deployments = [
+            _get_deployment(deployment_key(params)) for params in self.params
+        ]
+        self.strategy = strategy
+        self.ejection_time = ejection_time
+        self.ewma_alpha = ewma_alpha
+
+    def _score(self, deployment: Deployment) -> float:
+        if self.strategy == "ewma":
+            # Unmeasured deployments go first, so every one gets measured.
+            return (deployment.ewma or 0.0) * (deployment.outstanding + 1)
+        return deployment.outstanding
+
+    def acquire(self) -> Route:
+        """Pick a deployment and count the request as in flight."""
+        now = time.monotonic()
+        candidates = [
+            i for i, deployment in enumerate(self.deployments)
+            if not deployment.ejected(now)
+        ]
+        if not candidates:
+            # Every deployment is ejected: try the one back the soonest.
+            candidates = [min(
+                range(len(self.deployments)),
+                key=lambda i: self.deployments[i].ejected_until,
+            )]
+        scores = [self._score(self.deployments[i]) for i in candidates]
+        best = min(scores)
+        i = random.choice([i for i, score in zip(candidates, scores) if score == best])
+
+        deployment = self.deployments[i]
+        with deployment._lock:
+            deployment.outstanding += 1
+            deployment.requests += 1
+        return Route(deployment, self.params[i], self.limiters[i])
+
+    def release(self, route: Route, error: Optional[BaseException] = None) -> None:
+        """Record the outcome of a request sent with `acquire`."""
+        deployment = route.deployment
+        elapsed = route.latency
+        if elapsed is None:
+            elapsed = time.perf_counter() - route.start
+        eject_for = None
+        if error is not None and isinstance(error, Exception) and is_retryable(error):
+            eject_for = max(retry_after(error) or 0.0, self.ejection_time)
+
+        with deployment._lock:
+            deployment.outstanding -= 1
+            if error is None:
+                if deployment.ewma is None:
+                    deployment.ewma = elapsed
+                else:
+                    deployment.ewma += self.ewma_alpha * (elapsed - deployment.ewma)
+            elif isinstance(error, Exception):
+                deployment.errors += 1
+            if eject_for is not None:
+                deployment.ejected_until = time.monotonic() + eject_for
+                deployment.ejections += 1
+
+        if eject_for is not None:
+            metrics.inc("ejections")
+            logger.warning(
+                f"Deployment [{deployment.key}] ejected for {eject_for:.1f}s: {error!r}"
+            )
+
+    def release_stream(self, route: Route, stream: Iterator[Any]) -> Iterator[Any]:
+        """Chunks of `stream`; `route` is released when the stream ends.
+
+        The request stays in flight until then, its latency is the time to
+        the first chunk, and an error in the middle of the stream counts
+        (and ejects) like an error of the request. A stream that is closed
+        or dropped, even before its first chunk, releases the route too.
+        """
+        return _SyncRoutedStream(self, route, stream)
+
+    def arelease_stream(self, route: Route, stream: AsyncIterator[Any]) -> AsyncIterator[Any]:
+        """Async version of `release_stream`."""
+        return _AsyncRoutedStream(self, route, stream)
+
+    def available(self) -> bool:
+        """Whether a deployment is not ejected."""
+        now = time.monotonic()
+        return any(not deployment.ejected(now) for deployment in self.deployments)
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        return {deployment.key: deployment.stats() for deployment in self.deployments}
+
+
+class _RoutedStream:
+    """Stream that releases its route once: at its end, on close or on GC."""
+
+    __slots__ = ("_router", "_route", "_stream", "_released", "_lock")
+
+    def __init__(self, router: Router, route: Route, stream: Any):
+        self._router = router
+        self._route = route
+        self._stream = stream
+        self._released = False
+        self._lock = threading.Lock()
+
+    def _release(self, error: Optional[BaseException] = None) -> None:
+        with self._lock:
+            if self._released:
+                return
+            self._released = True
+        self._router.release(self._route, error)
+
+    def _chunk(self, chunk: Any) -> Any:
+        if self._route.latency is None:
+            self._route.latency = time.perf_counter() - self._route.start
+        return chunk
+
+    def _end(self, error: BaseException) -> None:
+        """Release the route for an exception raised by the stream."""
+        ended = isinstance(error, (StopIteration, StopAsyncIteration))
+        self._release(error if isinstance(error, Exception) and not ended else None)
+
+    def __del__(self) -> None:
+        if not self._released:
+            self._release()
+
+
+class _SyncRoutedStream(_RoutedStream):
+    __slots__ = ()
+
+    def __iter__(self) -> "_SyncRoutedStream":
+        return self
+
+    def __next__(self) -> Any:
+        try:
+            return self._chunk(next(self._stream))
+        except BaseException as e:
+            self._end(e)
+            if not isinstance(e, StopIteration):
+                close_stream(self._stream)
+            raise
+
+    def close(self) -> None:
+        try:
+            close_stream(self._stream)
+        finally:
+            self._release()
+
+
+class _AsyncRoutedStream(_RoutedStream):
+    __slots__ = ()
+
+    def __aiter__(self) -> "_AsyncRoutedStream":
+        return self
+
+    async def __anext__(self) -> Any:
+        try:
+            return self._chunk(await self._stream.__anext__())
+        except BaseException as e:
+            self._end(e)
+            if not isinstance(e, StopAsyncIteration):
+                await aclose_stream(self._stream)
+            raise
+
+    async def aclose(self) -> None:
+        try:
+            await aclose_stream(self._stream)
+        finally:
+            self._release()
+
+
+def deployment_key(params: Dict[str, Any]) -> str:
+    """Identifier of a deployment: model, api_base and a fingerprint of the key.
+
+    Keys of the same endpoint usually have their own quotas, so they are
+    separate deployments.
+    """
+    model = params.get("model")
+    key = f"{model}@{params['api_base']}" if params.get("api_base") else str(model)
+    if params.get("api_key"):
+        fingerprint = hashlib.sha256(params["api_key"].encode("utf-8")).hexdigest()[:8]
+        key = f"{key}#{fingerprint}"
+    return key
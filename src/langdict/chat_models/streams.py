@@ -0,0 +1,24 @@
+from typing import Any
+
+
+def close_stream(stream: Any) -> None:
+    """Close a completion stream that is abandoned before its end.
+
+    Closing releases the upstream connection, so the provider stops
+    generating (and billing) the rest of the completion.
+    """
+    close = getattr(stream, "close", None)
+    if close is None:
+        # litellm.CustomStreamWrapper wraps the provider's stream.
+        close = getattr(getattr(stream, "completion_stream", None), "close", None)
+    if callable(close):
+        close()
+
+
+async def aclose_stream(stream: Any) -> None:
+    """Async version of `close_stream`."""
+    aclose = getattr(stream, "aclose", None)
+    if callable(aclose):
+        await aclose()
+    else:
+        close_stream(stream)
@@ -1,14 +1,126 @@
-from typing import Any, Dict, List, Tuple, Union
-
-from langchain_core.callbacks import BaseCallbackHandler
+import asyncio
+import contextvars
+import copy
+import json
+import time
+from concurrent.futures import ThreadPoolExecutor
+from enum import StrEnum
+from typing import TYPE_CHECKING, Any, AsyncIterator, Callable, Dict, Iterator, List, NamedTuple, Optional, Tuple, Union
 
 from langdict.specs import LangSpecification
 from langdict.builders import (
-    PromptTemplateBuilder,
-    LiteLLMBuilder,
-    OutputParserBuilder,
+    ChainBuilder,
     TraceCallbackBuilder,
 )
+from langdict.metrics import CallStats, call_stats_scope, metrics, metrics_scope
+from langdict.parsers import JsonStreamEvent, JsonStreamParser
+from langdict.traces.context import trace_run_config
+from langdict.traces.spans import Span, current_span, recording, span, use_span
+
+if TYPE_CHECKING:
+    from langchain_core.callbacks import BaseCallbackHandler
+
+
+class Engine(StrEnum):
+    RUNNABLE = "runnable"
+    LEAN = "lean"
+
+
+class StreamMode(StrEnum):
+    VALUES = "values"
+    EVENTS = "events"
+
+
+class LangDictResult(NamedTuple):
+    """Output of a call with `return_metadata=True`.
+
+    Token counts are None when the provider does not report usage
+    (e.g. streams without usage chunks). `attempts` is 0 when no request
+    was sent (cache hit, or a coalesced duplicate of another call).
+    """
+
+    output: Any
+    model: Optional[str] = None
+    prompt_tokens: Optional[int] = None
+    completion_tokens: Optional[int] = None
+    total_tokens: Optional[int] = None
+    finish_reason: Optional[str] = None
+    elapsed: float = 0.0
+    attempts: int = 0
+    cache_hit: bool = False
+
+    @classmethod
+    def from_stats(cls, output: Any, stats: CallStats, elapsed: float) -> "LangDictResult":
+        return cls(
+            output=output,
+            model=stats.model,
+            prompt_tokens=stats.prompt_tokens,
+            completion_tokens=stats.completion_tokens,
+            total_tokens=stats.total_tokens,
+            finish_reason=stats.finish_reason,
+            elapsed=elapsed,
+            attempts=stats.attempts,
+            cache_hit=stats.cache_hit,
+        )
+
+
+class ResultStream:
+    """Stream of a call with `return_metadata=True`.
+
+    Iterating yields the same chunks as a plain stream; `result` holds the
+    `LangDictResult` (with the accumulated output) once the stream ends.
+
+    Example::
+
+        stream = chitchat(inputs, stream=True, return_metadata=True)
+        for chunk in stream:
+            print(chunk, end="")
+        stream.result.completion_tokens
+    """
+
+    def __init__(self, outputs: Any, stats: CallStats, start: float):
+        self._outputs = outputs
+        self._stats = stats
+        self._start = start
+        self._output = None
+        self.result: Optional[LangDictResult] = None
+
+    def __iter__(self) -> Iterator[Any]:
+        try:
+            with call_stats_scope(self._stats):
+                for chunk in self._outputs:
+                    self._collect(chunk)
+                    yield chunk
+        finally:
+            self._finish()
+
+    async def __aiter__(self) -> AsyncIterator[Any]:
+        try:
+            with call_stats_scope(self._stats):
+                async for chunk in self._outputs:
+                    self._collect(chunk)
+                    yield chunk
+        finally:
+            self._finish()
+
+    def _collect(self, chunk: Any) -> None:
+        if isinstance(chunk, JsonStreamEvent):
+            if chunk.type != "key":
+                self._output = chunk.value
+        elif isinstance(chunk, str) and isinstance(self._output, str):
+            self._output += chunk
+        else:
+            self._output = chunk
+
+    def _finish(self) -> None:
+        self.result = LangDictResult.from_stats(
+            self._output, self._stats, time.perf_counter() - self._start
+        )
+
+    def wrap(self, fn: Callable[[Any], Any]) -> "ResultStream":
+        """Replace the chunk stream with `fn(chunks)` (e.g. to time it)."""
+        self._outputs = fn(self._outputs)
+        return self
 
 
 class LangDict:
@@ -17,17 +129,44 @@ class LangDict:
 
     Chain Structure:
         [Prompt] -> [LLM] -> [Output Parser]
+
+    LangDicts with identical specifications share one compiled chain
+    (see `ChainBuilder`).
+
+    Engines:
+        runnable: invoke the LangChain `RunnableSequence`.
+        lean: render the compiled prompt to message dicts, call LiteLLM and
+            parse the output directly. Results are identical; calls with a
+            trace backend still go through the runnable chain.
     """
 
-    def __init__(self, spec: LangSpecification):
+    def __init__(self, spec: LangSpecification, engine: str = Engine.RUNNABLE):
         self.spec = spec
+        self.engine = Engine(engine)
+
+        self.compiled = ChainBuilder.build(spec)
+        self.chain = self.compiled.chain
+
+    def override_llm(self, **fields: Any) -> "LangDict":
+        """Give this LangDict its own copy of the LLM with `fields` replaced.
+
+        The compiled chain (and its LLM) stay shared with the other
+        LangDicts of the specification.
+
+        Example::
 
-        prompt = PromptTemplateBuilder.build(spec.prompt)
-        llm = LiteLLMBuilder.build(spec.llm)
-        output_parser = OutputParserBuilder.build(spec.output)
+            chitchat.override_llm(client=fake_client, temperature=0.7)
 
-        chain = prompt | llm | output_parser
-        self.chain = chain
+        Returns:
+            LangDict: self
+        """
+        llm = self.compiled.llm.model_copy(update=fields)
+        self.compiled = self.compiled._replace(
+            llm=llm,
+            chain=self.compiled.prompt | llm | self.compiled.output_parser,
+        )
+        self.chain = self.compiled.chain
+        return self
 
     def __call__(
         self,
@@ -38,6 +177,8 @@ class LangDict:
         batch: bool = False,
         trace_backend: str = None,
         module_name: str = None,
+        stream_mode: str = StreamMode.VALUES,
+        return_metadata: bool = False,
     ):
         """Invoke the chain with inputs.
 
@@ -50,6 +191,11 @@ class LangDict:
                 "conversation": [("user", "Hello, how are you doing?")]
             }, stream=True)
             chitchat([inputs, inputs], batch=True)
+            for event in critic(inputs, stream=True, stream_mode="events"):
+                if event.type == "key" and event.key == "need_retrieval":
+                    ...
+            result = chitchat(inputs, return_metadata=True)
+            result.output, result.total_tokens, result.elapsed
 
         Args:
             inputs: input data for the chain.
@@ -57,52 +203,595 @@ class LangDict:
             batch: enable batch mode.
             trace_backend: trace backend to use. if None, no tracing.
             module_name: name of the module for tracing.
+            stream_mode: 'values' streams the output parser's values.
+                'events' (json output) streams `JsonStreamEvent`s: partial
+                objects, completed top-level keys and the end of the object.
+            return_metadata: return `LangDictResult`s (output, token usage,
+                model, finish_reason, elapsed time, attempts) instead of
+                outputs; one per input in batch mode. Streams return a
+                `ResultStream`.
 
         """
 
-        # TODO: async implementation
+        if return_metadata:
+            return self._call_with_metadata(
+                inputs,
+                stream=stream,
+                batch=batch,
+                trace_backend=trace_backend,
+                module_name=module_name,
+                stream_mode=stream_mode,
+            )
+
+        start = time.perf_counter()
+        with metrics_scope(module_name):
+            outputs = self._call(
+                inputs,
+                stream=stream,
+                batch=batch,
+                trace_backend=trace_backend,
+                module_name=module_name,
+                stream_mode=stream_mode,
+            )
+        if stream:
+            return _timed_stream(outputs, start, module_name, current_span())
+        metrics.observe("total", time.perf_counter() - start, module=module_name)
+        return outputs
+
+    def _call(
+        self,
+        inputs: Union[Dict[str, Any], List[Dict[str, Any]]],
+        stream: bool = False,
+        batch: bool = False,
+        trace_backend: str = None,
+        module_name: str = None,
+        stream_mode: str = StreamMode.VALUES,
+    ):
+        if stream and StreamMode(stream_mode) == StreamMode.EVENTS:
+            return self._stream_events(inputs, trace_backend, module_name)
+
+        if self.spec.output.required_keys:
+            return self._required_keys_call(
+                inputs,
+                stream=stream,
+                batch=batch,
+                trace_backend=trace_backend,
+                module_name=module_name,
+            )
+
+        if self.engine == Engine.LEAN and not trace_backend:
+            return self._lean_call(inputs, stream=stream, batch=batch)
 
         callbacks = self._trace_callbacks(trace_backend, module_name)
+        if metrics.enabled and metrics.runnable_stages and not stream:
+            callbacks.append(self._metrics_handler())
+        if recording():
+            callbacks.append(self._span_handler())
 
         if isinstance(inputs, dict):
             if stream:
                 return self.chain.stream(
                     inputs,
-                    config={"callbacks": callbacks}
+                    config=trace_run_config(callbacks)
                 )
             else:
                 return self.chain.invoke(
                     inputs,
-                    config={"callbacks": callbacks}
+                    config=trace_run_config(callbacks)
                 )
         elif isinstance(inputs, list):
             if batch:
-                return self.chain.batch(
+                unique_inputs, indices = self._dedupe(inputs)
+                outputs = self.chain.batch(
+                    unique_inputs,
+                    config=trace_run_config(callbacks)
+                )
+                return self._fan_out(outputs, indices)
+            else:
+                raise ValueError("List inputs must be batched.")
+        else:
+            raise ValueError("Invalid inputs type.")
+
+    async def acall(
+        self,
+        inputs: Union[
+            Dict[str, Any], List[Tuple[str, Dict[str, Any]]]
+        ],
+        stream: bool = False,
+        batch: bool = False,
+        trace_backend: str = None,
+        module_name: str = None,
+        stream_mode: str = StreamMode.VALUES,
+        return_metadata: bool = False,
+    ):
+        """Asynchronously invoke the chain with inputs.
+
+        The LLM request is sent with `litellm.acompletion`, so many calls
+        can be in flight on a single event loop.
+
+        Example::
+
+            await chitchat.acall({
+                "conversation": [("user", "Hello, how are you doing?")]
+            })
+            async for chunk in await chitchat.acall({
+                "conversation": [("user", "Hello, how are you doing?")]
+            }, stream=True):
+                print(chunk)
+            await chitchat.acall([inputs, inputs], batch=True)
+
+        Args:
+            inputs: input data for the chain.
+            stream: enable streaming mode. returns an async iterator.
+            batch: enable batch mode.
+            trace_backend: trace backend to use. if None, no tracing.
+            module_name: name of the module for tracing.
+            stream_mode: 'values' or 'events' (see `__call__`).
+            return_metadata: return `LangDictResult`s (see `__call__`).
+                Streams return a `ResultStream` to iterate with `async for`.
+
+        """
+
+        if return_metadata:
+            return await self._acall_with_metadata(
+                inputs,
+                stream=stream,
+                batch=batch,
+                trace_backend=trace_backend,
+                module_name=module_name,
+                stream_mode=stream_mode,
+            )
+
+        start = time.perf_counter()
+        with metrics_scope(module_name):
+            outputs = await self._acall(
+                inputs,
+                stream=stream,
+                batch=batch,
+                trace_backend=trace_backend,
+                module_name=module_name,
+                stream_mode=stream_mode,
+            )
+        if stream:
+            return _atimed_stream(outputs, start, module_name, current_span())
+        metrics.observe("total", time.perf_counter() - start, module=module_name)
+        return outputs
+
+    async def _acall(
+        self,
+        inputs: Union[Dict[str, Any], List[Dict[str, Any]]],
+        stream: bool = False,
+        batch: bool = False,
+        trace_backend: str = None,
+        module_name: str = None,
+        stream_mode: str = StreamMode.VALUES,
+    ):
+        if stream and StreamMode(stream_mode) == StreamMode.EVENTS:
+            return self._astream_events(inputs, trace_backend, module_name)
+
+        if self.spec.output.required_keys:
+            return await self._arequired_keys_call(
+                inputs,
+                stream=stream,
+                batch=batch,
+                trace_backend=trace_backend,
+                module_name=module_name,
+            )
+
+        if self.engine == Engine.LEAN and not trace_backend:
+            return await self._alean_call(inputs, stream=stream, batch=batch)
+
+        callbacks = self._trace_callbacks(trace_backend, module_name)
+        if metrics.enabled and metrics.runnable_stages and not stream:
+            callbacks.append(self._metrics_handler())
+        if recording():
+            callbacks.append(self._span_handler())
+
+        if isinstance(inputs, dict):
+            if stream:
+                return self.chain.astream(
+                    inputs,
+                    config=trace_run_config(callbacks)
+                )
+            else:
+                return await self.chain.ainvoke(
                     inputs,
-                    config={"callbacks": callbacks}
+                    config=trace_run_config(callbacks)
+                )
+        elif isinstance(inputs, list):
+            if batch:
+                unique_inputs, indices = self._dedupe(inputs)
+                outputs = await self.chain.abatch(
+                    unique_inputs,
+                    config=trace_run_config(callbacks)
                 )
+                return self._fan_out(outputs, indices)
             else:
                 raise ValueError("List inputs must be batched.")
         else:
             raise ValueError("Invalid inputs type.")
 
+    def _call_with_metadata(
+        self,
+        inputs: Union[Dict[str, Any], List[Dict[str, Any]]],
+        stream: bool = False,
+        batch: bool = False,
+        **kwargs: Any,
+    ):
+        """Run every input in its own `CallStats` scope."""
+        if isinstance(inputs, list) and batch:
+            unique_inputs, indices = self._dedupe(inputs)
+            results = self._run_batch(
+                lambda item: self._call_with_metadata(item, **kwargs),
+                unique_inputs,
+            )
+            return self._fan_out(results, indices)
+
+        stats = CallStats()
+        start = time.perf_counter()
+        with call_stats_scope(stats):
+            outputs = self(inputs, stream=stream, batch=batch, **kwargs)
+        if stream:
+            return ResultStream(outputs, stats, start)
+        return LangDictResult.from_stats(outputs, stats, time.perf_counter() - start)
+
+    async def _acall_with_metadata(
+        self,
+        inputs: Union[Dict[str, Any], List[Dict[str, Any]]],
+        stream: bool = False,
+        batch: bool = False,
+        **kwargs: Any,
+    ):
+        if isinstance(inputs, list) and batch:
+            unique_inputs, indices = self._dedupe(inputs)
+            results = await asyncio.gather(
+                *[self._acall_with_metadata(i, **kwargs) for i in unique_inputs]
+            )
+            return self._fan_out(list(results), indices)
+
+        stats = CallStats()
+        start = time.perf_counter()
+        with call_stats_scope(stats):
+            outputs = await self.acall(inputs, stream=stream, batch=batch, **kwargs)
+        if stream:
+            return ResultStream(outputs, stats, start)
+        return LangDictResult.from_stats(outputs, stats, time.perf_counter() - start)
+
+    def _stream_events(
+        self,
+        inputs: Dict[str, Any],
+        trace_backend: str = None,
+        module_name: str = None,
+    ) -> Iterator[JsonStreamEvent]:
+        self._check_stream_events(inputs)
+
+        if self.engine == Engine.LEAN and not trace_backend:
+            message_dicts = self.compiled.compiled_prompt.render(inputs)
+            chunks = self.compiled.llm.stream_text(message_dicts)
+        else:
+            callbacks = self._trace_callbacks(trace_backend, module_name)
+            chunks = (
+                chunk.content
+                for chunk in (self.compiled.prompt | self.compiled.llm).stream(
+                    inputs,
+                    config=trace_run_config(callbacks)
+                )
+            )
+
+        required_keys = set(self.spec.output.required_keys or [])
+        parser = JsonStreamParser()
+        for chunk in chunks:
+            events = parser.feed(chunk)
+            if required_keys and required_keys.issubset(parser.completed_keys):
+                chunks.close()
+                yield from _required_prefix(events, parser)
+                return
+            yield from events
+        yield from parser.close()
+
+    async def _astream_events(
+        self,
+        inputs: Dict[str, Any],
+        trace_backend: str = None,
+        module_name: str = None,
+    ) -> AsyncIterator[JsonStreamEvent]:
+        self._check_stream_events(inputs)
+
+        if self.engine == Engine.LEAN and not trace_backend:
+            message_dicts = self.compiled.compiled_prompt.render(inputs)
+            chunks = self.compiled.llm.astream_text(message_dicts)
+        else:
+            callbacks = self._trace_callbacks(trace_backend, module_name)
+            chunks = (
+                chunk.content
+                async for chunk in (self.compiled.prompt | self.compiled.llm).astream(
+                    inputs,
+                    config=trace_run_config(callbacks)
+                )
+            )
+
+        required_keys = set(self.spec.output.required_keys or [])
+        parser = JsonStreamParser()
+        async for chunk in chunks:
+            events = parser.feed(chunk)
+            if required_keys and required_keys.issubset(parser.completed_keys):
+                await chunks.aclose()
+                for event in _required_prefix(events, parser):
+                    yield event
+                return
+            for event in events:
+                yield event
+        for event in parser.close():
+            yield event
+
+    def _required_keys_call(
+        self,
+        inputs: Union[Dict[str, Any], List[Dict[str, Any]]],
+        stream: bool = False,
+        batch: bool = False,
+        trace_backend: str = None,
+        module_name: str = None,
+    ):
+        """Stream the json output and stop once `output.required_keys` are parsed."""
+        def _invoke(item: Dict[str, Any]) -> Any:
+            if self._shares_responses(trace_backend):
+                message_dicts = self.compiled.compiled_prompt.render(item)
+                until, required_keys = self._required_keys_until()
+                text = self.compiled.llm.generate_prefix(
+                    message_dicts, until, prefix_key=required_keys
+                )
+                return _required_output(text, self.spec.output.required_keys)
+            for event in self._stream_events(item, trace_backend, module_name):
+                if event.type == "end":
+                    return event.value
+
+        if isinstance(inputs, dict):
+            if stream:
+                events = self._stream_events(inputs, trace_backend, module_name)
+                return _output_values(events)
+            else:
+                return _invoke(inputs)
+        elif isinstance(inputs, list):
+            if batch:
+                unique_inputs, indices = self._dedupe(inputs)
+                outputs = self._run_batch(_invoke, unique_inputs)
+                return self._fan_out(outputs, indices)
+            else:
+                raise ValueError("List inputs must be batched.")
+        else:
+            raise ValueError("Invalid inputs type.")
+
+    async def _arequired_keys_call(
+        self,
+        inputs: Union[Dict[str, Any], List[Dict[str, Any]]],
+        stream: bool = False,
+        batch: bool = False,
+        trace_backend: str = None,
+        module_name: str = None,
+    ):
+        async def _ainvoke(item: Dict[str, Any]) -> Any:
+            if self._shares_responses(trace_backend):
+                message_dicts = self.compiled.compiled_prompt.render(item)
+                until, required_keys = self._required_keys_until()
+                text = await self.compiled.llm.agenerate_prefix(
+                    message_dicts, until, prefix_key=required_keys
+                )
+                return _required_output(text, self.spec.output.required_keys)
+            async for event in self._astream_events(item, trace_backend, module_name):
+                if event.type == "end":
+                    return event.value
+
+        if isinstance(inputs, dict):
+            if stream:
+                events = self._astream_events(inputs, trace_backend, module_name)
+                return _aoutput_values(events)
+            else:
+                return await _ainvoke(inputs)
+        elif isinstance(inputs, list):
+            if batch:
+                unique_inputs, indices = self._dedupe(inputs)
+                outputs = await asyncio.gather(*[_ainvoke(i) for i in unique_inputs])
+                return self._fan_out(list(outputs), indices)
+            else:
+                raise ValueError("List inputs must be batched.")
+        else:
+            raise ValueError("Invalid inputs type.")
+
+    def _shares_responses(self, trace_backend: str = None) -> bool:
+        """Whether required-keys calls go through the response cache / single-flight."""
+        llm = self.compiled.llm
+        return not trace_backend and (llm.response_cache is not None or llm.coalesce)
+
+    def _required_keys_until(self) -> Tuple[Callable[[str], bool], str]:
+        """Stop condition of a required-keys stream, and its cache key part."""
+        required_keys = set(self.spec.output.required_keys)
+        parser = JsonStreamParser()
+
+        def _until(delta: str) -> bool:
+            parser.feed(delta)
+            return required_keys.issubset(parser.completed_keys)
+
+        return _until, ",".join(sorted(required_keys))
+
+    def _check_stream_events(self, inputs: Dict[str, Any]) -> None:
+        if not isinstance(inputs, dict):
+            raise ValueError("Event streams take a single input dict.")
+        if self.spec.output.type != "json":
+            raise ValueError("Event streams require the 'json' output type.")
+
+    def _lean_call(
+        self,
+        inputs: Union[Dict[str, Any], List[Dict[str, Any]]],
+        stream: bool = False,
+        batch: bool = False,
+    ):
+        if isinstance(inputs, dict):
+            if stream:
+                return self._lean_stream(inputs)
+            else:
+                return self._lean_invoke(inputs)
+        elif isinstance(inputs, list):
+            if batch:
+                unique_inputs, indices = self._dedupe(inputs)
+                outputs = self._run_batch(self._lean_invoke, unique_inputs)
+                return self._fan_out(outputs, indices)
+            else:
+                raise ValueError("List inputs must be batched.")
+        else:
+            raise ValueError("Invalid inputs type.")
+
+    async def _alean_call(
+        self,
+        inputs: Union[Dict[str, Any], List[Dict[str, Any]]],
+        stream: bool = False,
+        batch: bool = False,
+    ):
+        if isinstance(inputs, dict):
+            if stream:
+                return self._lean_astream(inputs)
+            else:
+                return await self._lean_ainvoke(inputs)
+        elif isinstance(inputs, list):
+            if batch:
+                unique_inputs, indices = self._dedupe(inputs)
+                outputs = await asyncio.gather(
+                    *[self._lean_ainvoke(i) for i in unique_inputs]
+                )
+                return self._fan_out(list(outputs), indices)
+            else:
+                raise ValueError("List inputs must be batched.")
+        else:
+            raise ValueError("Invalid inputs type.")
+
+    def _lean_invoke(self, inputs: Dict[str, Any]) -> Any:
+        with metrics.time("render"), span("render"):
+            message_dicts = self.compiled.compiled_prompt.render(inputs)
+        text = self.compiled.llm.generate_text(message_dicts)
+        with metrics.time("parse"), span("parse"):
+            return self.compiled.output_parser.parse(text)
+
+    async def _lean_ainvoke(self, inputs: Dict[str, Any]) -> Any:
+        with metrics.time("render"), span("render"):
+            message_dicts = self.compiled.compiled_prompt.render(inputs)
+        text = await self.compiled.llm.agenerate_text(message_dicts)
+        with metrics.time("parse"), span("parse"):
+            return self.compiled.output_parser.parse(text)
+
+    def _run_batch(
+        self,
+        fn: Callable[[Dict[str, Any]], Any],
+        inputs: List[Dict[str, Any]],
+    ) -> List[Any]:
+        if len(inputs) <= 1:
+            return [fn(i) for i in inputs]
+
+        # Same executor as `Runnable.batch`, with the caller's context
+        # (e.g. `use_cassette`) in every worker.
+        with ThreadPoolExecutor() as executor:
+            futures = [
+                executor.submit(contextvars.copy_context().run, fn, i)
+                for i in inputs
+            ]
+            return [f.result() for f in futures]
+
+    def _lean_stream(self, inputs: Dict[str, Any]) -> Iterator[Any]:
+        with metrics.time("render"), span("render"):
+            message_dicts = self.compiled.compiled_prompt.render(inputs)
+        parser = _StreamParser(self.compiled.output_parser)
+        for chunk in self.compiled.llm.stream_text(message_dicts):
+            yield from parser.feed(chunk)
+        yield from parser.feed("")
+
+    async def _lean_astream(self, inputs: Dict[str, Any]) -> AsyncIterator[Any]:
+        with metrics.time("render"), span("render"):
+            message_dicts = self.compiled.compiled_prompt.render(inputs)
+        parser = _StreamParser(self.compiled.output_parser)
+        async for chunk in self.compiled.llm.astream_text(message_dicts):
+            for output in parser.feed(chunk):
+                yield output
+        for output in parser.feed(""):
+            yield output
+
+    def _dedupe(
+        self,
+        inputs: List[Dict[str, Any]],
+    ) -> Tuple[List[Dict[str, Any]], Optional[List[int]]]:
+        """Compute identical batch inputs once (if `llm.coalesce` is set)."""
+        if not self.spec.llm.coalesce:
+            return inputs, None
+
+        unique_inputs = []
+        indices = []
+        seen = {}
+        for item in inputs:
+            try:
+                key = json.dumps(item, sort_keys=True, default=str)
+            except TypeError:
+                return inputs, None
+            if key not in seen:
+                seen[key] = len(unique_inputs)
+                unique_inputs.append(item)
+            indices.append(seen[key])
+        return unique_inputs, indices
+
+    def _fan_out(self, outputs: List[Any], indices: Optional[List[int]]) -> List[Any]:
+        if indices is None:
+            return outputs
+
+        results = []
+        used = set()
+        for i in indices:
+            if i in used:
+                results.append(copy.deepcopy(outputs[i]))
+            else:
+                used.add(i)
+                results.append(outputs[i])
+        return results
+
+    def render(
+        self,
+        inputs: Union[Dict[str, Any], List[Dict[str, Any]]],
+    ) -> Union[List[Dict[str, Any]], List[List[Dict[str, Any]]]]:
+        """Render inputs into the message dicts sent to the LLM.
+
+        Example::
+
+            chitchat.render({"name": "LangDict", "user_input": "Hi"})
+            chitchat.render([inputs, inputs])
+
+        Args:
+            inputs: input data for the prompt, or a list of them.
+        """
+        if isinstance(inputs, list):
+            return self.compiled.compiled_prompt.render_batch(inputs)
+        return self.compiled.compiled_prompt.render(inputs)
+
+    @staticmethod
+    def _metrics_handler() -> "BaseCallbackHandler":
+        from langdict.metrics.callbacks import metrics_handler
+
+        return metrics_handler
+
+    @staticmethod
+    def _span_handler() -> "BaseCallbackHandler":
+        from langdict.traces.callbacks.spans import span_handler
+
+        return span_handler
+
     def _trace_callbacks(
         self,
         trace_backend: str,
         module_name: str
-    ) -> List[BaseCallbackHandler]:
+    ) -> List["BaseCallbackHandler"]:
         callbacks = []
         if trace_backend:
-            builder = TraceCallbackBuilder()
-            callback = builder.build(
-                trace_backend,
-                module_name=module_name,
+            callbacks.append(
+                TraceCallbackBuilder.get(trace_backend, module_name=module_name)
             )
-            callbacks.append(callback)
         return callbacks
 
     @classmethod
-    def from_dict(cls, data: Dict[str, Any]) -> "LangDict":
+    def from_dict(cls, data: Dict[str, Any], engine: str = Engine.RUNNABLE) -> "LangDict":
         """Create LangDict from dictionary data.
 
         Example::
@@ -129,10 +818,115 @@ class LangDict:
         Args:
             data: specification data for the LangDict
                 (must include ('text' or 'messages'), 'llm', 'output' keys)
+            engine: execution engine ('runnable' or 'lean').
         """
 
         lang_spec = LangSpecification.from_dict(data)
-        return LangDict(lang_spec)
+        return LangDict(lang_spec, engine=engine)
 
     def as_dict(self) -> Dict[str, Any]:
         return self.spec.as_dict()
+
+
+class _StreamParser:
+    """Parse streamed text like the output parser's `transform`.
+
+    Cumulative parsers (JSON) yield the partially parsed output of the text
+    so far whenever it changes; others parse every chunk. Streams end with
+    an empty chunk, as the chat model's stream does.
+    """
+
+    def __init__(self, output_parser: Any):
+        from langchain_core.output_parsers.transform import (
+            BaseCumulativeTransformOutputParser,
+        )
+
+        self.output_parser = output_parser
+        self.cumulative = isinstance(output_parser, BaseCumulativeTransformOutputParser)
+        self.text = ""
+        self.prev_parsed = None
+
+    def feed(self, chunk: str) -> List[Any]:
+        if not self.cumulative:
+            return [self.output_parser.parse(chunk)]
+
+        from langchain_core.outputs import Generation
+
+        self.text += chunk
+        parsed = self.output_parser.parse_result([Generation(text=self.text)], partial=True)
+        if parsed is None or parsed == self.prev_parsed:
+            return []
+        self.prev_parsed = parsed
+        return [parsed]
+
+
+def _required_prefix(
+    events: List[JsonStreamEvent],
+    parser: JsonStreamParser,
+) -> Iterator[JsonStreamEvent]:
+    """Events up to the last completed key, then the end of the completed keys."""
+    last_key = max(i for i, e in enumerate(events) if e.type == "key")
+    yield from events[:last_key + 1]
+    yield JsonStreamEvent(
+        "end", {key: parser.value[key] for key in parser.completed_keys}
+    )
+
+
+def _required_output(text: str, required_keys: List[str]) -> Any:
+    """Output of a required-keys call from its (possibly partial) text."""
+    parser = JsonStreamParser()
+    events = parser.feed(text)
+    if set(required_keys).issubset(parser.completed_keys):
+        return {key: parser.value[key] for key in parser.completed_keys}
+    # A complete object ends in `feed`; `close` ends (or rejects) the rest.
+    events += parser.close()
+    return [event.value for event in events if event.type == "end"][-1]
+
+
+def _output_values(events: Iterator[JsonStreamEvent]) -> Iterator[Any]:
+    """Partial objects, then the final output (if it differs from the last one)."""
+    last = None
+    for event in events:
+        if event.type == "partial" or (event.type == "end" and event.value != last):
+            last = event.value
+            yield event.value
+
+
+async def _aoutput_values(events: AsyncIterator[JsonStreamEvent]) -> AsyncIterator[Any]:
+    last = None
+    async for event in events:
+        if event.type == "partial" or (event.type == "end" and event.value != last):
+            last = event.value
+            yield event.value
+
+
+def _timed_stream(
+    outputs: Iterator[Any],
+    start: float,
+    module_name: str,
+    span: Optional[Span] = None,
+) -> Iterator[Any]:
+    """Label metrics of a stream with its module and record its total time.
+
+    The LLM request of a stream is sent while it is consumed, under the
+    span that was current when the stream was created.
+    """
+    try:
+        with metrics_scope(module_name), use_span(span):
+            yield from outputs
+    finally:
+        metrics.observe("total", time.perf_counter() - start, module=module_name)
+
+
+async def _atimed_stream(
+    outputs: AsyncIterator[Any],
+    start: float,
+    module_name: str,
+    span: Optional[Span] = None,
+) -> AsyncIterator[Any]:
+    try:
+        with metrics_scope(module_name), use_span(span):
+            async for output in outputs:
+                yield output
+    finally:
+        metrics.observe("total", time.perf_counter() - start, module=module_name)
@@ -0,0 +1,20 @@
+from langdict.metrics.call import CallStats, call_stats_scope, current_call_stats
+from langdict.metrics.histogram import Histogram
+from langdict.metrics.registry import (
+    MetricsRegistry,
+    current_module,
+    metrics,
+    metrics_scope,
+)
+
+
+__all__ = [
+    CallStats,
+    Histogram,
+    MetricsRegistry,
+    call_stats_scope,
+    current_call_stats,
+    current_module,
+    metrics,
+    metrics_scope,
+]
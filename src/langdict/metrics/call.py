@@ -0,0 +1,81 @@
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Iterator, Mapping, Optional
+
+
+_current_call: ContextVar[Optional["CallStats"]] = ContextVar(
+    "langdict_call_stats", default=None
+)
+
+
+class CallStats:
+    """Usage and request details of one LangDict call, filled in by ChatLiteLLM."""
+
+    __slots__ = (
+        "model",
+        "prompt_tokens",
+        "completion_tokens",
+        "total_tokens",
+        "finish_reason",
+        "attempts",
+        "cache_hit",
+    )
+
+    def __init__(self):
+        self.model: Optional[str] = None
+        self.prompt_tokens: Optional[int] = None
+        self.completion_tokens: Optional[int] = None
+        self.total_tokens: Optional[int] = None
+        self.finish_reason: Optional[str] = None
+        self.attempts = 0
+        self.cache_hit = False
+
+    def record_response(self, response: Any, cache_hit: bool = False) -> None:
+        """Record a completion response (dict or litellm `ModelResponse`)."""
+        if not isinstance(response, Mapping):
+            response = response.model_dump()
+
+        self.cache_hit = self.cache_hit or cache_hit
+        self.model = response.get("model") or self.model
+        choices = response.get("choices") or []
+        if choices:
+            self.finish_reason = choices[0].get("finish_reason")
+        self._record_usage(response.get("usage"))
+
+    def record_chunk(self, chunk: Any) -> None:
+        """Record a streamed chunk (model, finish_reason and usage, if sent)."""
+        if not isinstance(chunk, Mapping):
+            chunk = chunk.model_dump()
+
+        self.model = chunk.get("model") or self.model
+        choices = chunk.get("choices") or []
+        if choices and choices[0].get("finish_reason"):
+            self.finish_reason = choices[0]["finish_reason"]
+        self._record_usage(chunk.get("usage"))
+
+    def _record_usage(self, usage: Any) -> None:
+        if not usage:
+            return
+        if not isinstance(usage, Mapping):
+            usage = usage.model_dump()
+        self.prompt_tokens = usage.get("prompt_tokens")
+        self.completion_tokens = usage.get("completion_tokens")
+        self.total_tokens = usage.get("total_tokens")
+
+
+def current_call_stats() -> Optional[CallStats]:
+    return _current_call.get()
+
+
+@contextmanager
+def call_stats_scope(stats: CallStats) -> Iterator[CallStats]:
+    """Collect the details of the LLM requests made inside the block."""
+    token = _current_call.set(stats)
+    try:
+        yield stats
+    finally:
+        try:
+            _current_call.reset(token)
+        except ValueError:
+            # Generator closed from another context (e.g. garbage collected).
+            pass
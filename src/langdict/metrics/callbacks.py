@@ -0,0 +1,53 @@
+import time
+from typing import Any, Dict, Optional, Tuple
+from uuid import UUID
+
+from langchain_core.callbacks import BaseCallbackHandler
+
+from .registry import current_module, metrics
+
+
+class MetricsCallbackHandler(BaseCallbackHandler):
+    """Record prompt rendering and output parsing time of runnable chains.
+
+    One handler is shared by every chain; the module label is taken from
+    the context of the run (see `metrics_scope`).
+    """
+
+    run_inline = True
+
+    def __init__(self):
+        self._runs: Dict[UUID, Tuple[str, float, str]] = {}
+
+    def on_chain_start(
+        self,
+        serialized: Optional[Dict[str, Any]],
+        inputs: Any,
+        *,
+        run_id: UUID,
+        parent_run_id: Optional[UUID] = None,
+        **kwargs: Any,
+    ) -> None:
+        if parent_run_id is None:
+            return
+
+        name = kwargs.get("name") or (serialized or {}).get("name") or ""
+        if name.endswith("PromptTemplate"):
+            stage = "render"
+        elif name.endswith("OutputParser"):
+            stage = "parse"
+        else:
+            return
+        self._runs[run_id] = (stage, time.perf_counter(), current_module())
+
+    def on_chain_end(self, outputs: Any, *, run_id: UUID, **kwargs: Any) -> None:
+        run = self._runs.pop(run_id, None)
+        if run is not None:
+            stage, start, module = run
+            metrics.observe(stage, time.perf_counter() - start, module=module)
+
+    def on_chain_error(self, error: BaseException, *, run_id: UUID, **kwargs: Any) -> None:
+        self._runs.pop(run_id, None)
+
+
+metrics_handler = MetricsCallbackHandler()
@@ -0,0 +1,80 @@
+import bisect
+import math
+import threading
+from typing import Dict, List, Optional
+
+
+def _log_bounds(low: float, high: float, growth: float) -> List[float]:
+    count = int(math.ceil(math.log(high / low) / math.log(growth)))
+    return [low * growth ** i for i in range(count + 1)]
+
+
+# 10us .. ~10min, buckets 10% apart (quantiles within ~5% of the true value)
+DEFAULT_BOUNDS = _log_bounds(1e-5, 600.0, 1.1)
+
+
+class Histogram:
+    """Fixed-bucket histogram of durations (seconds) with quantile estimates.
+
+    Recording is a bisect and a counter increment, so histograms can stay
+    enabled on the hot path; memory does not grow with the number of
+    observations.
+
+    Example::
+
+        histogram = Histogram()
+        histogram.observe(0.120)
+        histogram.quantile(0.95)
+    """
+
+    def __init__(self, bounds: Optional[List[float]] = None):
+        self.bounds = bounds or DEFAULT_BOUNDS
+        self.counts = [0] * (len(self.bounds) + 1)
+        self.count = 0
+        self.sum = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+        self._lock = threading.Lock()
+
+    def observe(self, value: float) -> None:
+        i = bisect.bisect_left(self.bounds, value)
+        with self._lock:
+            self.counts[i] += 1
+            self.count += 1
+            self.sum += value
+            if value < self.min:
+                self.min = value
+            if value > self.max:
+                self.max = value
+
+    def quantile(self, q: float) -> Optional[float]:
+        """Estimated q-quantile (0 <= q <= 1), None if nothing was recorded."""
+        with self._lock:
+            if self.count == 0:
+                return None
+            rank = q * self.count
+            cumulative = 0
+            for i, count in enumerate(self.counts):
+                if count == 0:
+                    continue
+                if cumulative + count >= rank:
+                    lower = self.bounds[i - 1] if i > 0 else self.min
+                    upper = self.bounds[i] if i < len(self.bounds) else self.max
+                    value = lower + (upper - lower) * (rank - cumulative) / count
+                    return min(max(value, self.min), self.max)
+                cumulative += count
+            return self.max
+
+    def summary(self) -> Dict[str, Optional[float]]:
+        """count, sum, min, max, p50, p95 and p99."""
+        if self.count == 0:
+            return {"count": 0, "sum": 0.0}
+        return {
+            "count": self.count,
+            "sum": self.sum,
+            "min": self.min,
+            "max": self.max,
+            "p50": self.quantile(0.5),
+            "p95": self.quantile(0.95),
+            "p99": self.quantile(0.99),
+        }
@@ -0,0 +1,199 @@
+import json
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Dict, Iterator, Optional, Tuple
+
+from .histogram import Histogram
+
+
+DEFAULT_MODULE = "default"
+
+_QUANTILES = (("0.5", "p50"), ("0.95", "p95"), ("0.99", "p99"))
+
+_current_module: ContextVar[Optional[str]] = ContextVar(
+    "langdict_metrics_module", default=None
+)
+
+
+def current_module() -> str:
+    """Module label of the metrics recorded in the current context."""
+    return _current_module.get() or DEFAULT_MODULE
+
+
+@contextmanager
+def metrics_scope(module: Optional[str]) -> Iterator[None]:
+    """Label the metrics recorded inside the block with a module name."""
+    if not module:
+        yield
+        return
+
+    token = _current_module.set(module)
+    try:
+        yield
+    finally:
+        try:
+            _current_module.reset(token)
+        except ValueError:
+            # Generator closed from another context (e.g. garbage collected).
+            pass
+
+
+class MetricsRegistry:
+    """In-process latency histograms and counters, per module name.
+
+    Stages (seconds):
+        render: prompt rendering.
+        queued: waiting for the client-side rate limiter.
+        ttft: request start to the first streamed chunk.
+        network: request start to the (last chunk of the) response, per attempt.
+        parse: output parsing.
+        total: whole LangDict / Module call.
+
+    Counters:
+        requests, retries, errors, cache_hits, retry_after, circuit_open,
+        failovers, hedged, hedge_wins, hedges_skipped, ejections (and any
+        other counter incremented with `inc`).
+
+    The lean engine records every stage. The runnable engine records
+    render/parse only with `runnable_stages` set, since they are timed
+    with a LangChain callback handler (which costs ~0.2ms per call).
+
+    Example::
+
+        from langdict.metrics import metrics
+
+        metrics.snapshot()["critic"]["stages"]["network"]["p95"]
+        print(metrics.to_prometheus())
+    """
+
+    STAGES = ("render", "queued", "ttft", "network", "parse", "total")
+    COUNTERS = (
+        "requests",
+        "retries",
+        "errors",
+        "cache_hits",
+        "retry_after",
+        "circuit_open",
+        "failovers",
+        "hedged",
+        "hedge_wins",
+        "hedges_skipped",
+        "ejections",
+    )
+
+    def __init__(self, enabled: bool = True, runnable_stages: bool = False):
+        self.enabled = enabled
+        self.runnable_stages = runnable_stages
+        self._histograms: Dict[Tuple[str, str], Histogram] = {}
+        self._counters: Dict[Tuple[str, str], int] = {}
+        self._lock = threading.Lock()
+
+    def enable(self, runnable_stages: bool = False) -> None:
+        self.enabled = True
+        self.runnable_stages = runnable_stages
+
+    def disable(self) -> None:
+        self.enabled = False
+
+    def observe(self, stage: str, seconds: float, module: Optional[str] = None) -> None:
+        """Record the duration of a stage."""
+        if not self.enabled:
+            return
+
+        key = (module or current_module(), stage)
+        histogram = self._histograms.get(key)
+        if histogram is None:
+            with self._lock:
+                histogram = self._histograms.setdefault(key, Histogram())
+        histogram.observe(seconds)
+
+    @contextmanager
+    def time(self, stage: str, module: Optional[str] = None) -> Iterator[None]:
+        """Record the duration of the block."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(stage, time.perf_counter() - start, module=module)
+
+    def inc(self, counter: str, value: int = 1, module: Optional[str] = None) -> None:
+        """Increment a counter."""
+        if not self.enabled:
+            return
+
+        key = (module or current_module(), counter)
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + value
+
+    def histogram(self, stage: str, module: Optional[str] = None) -> Optional[Histogram]:
+        return self._histograms.get((module or DEFAULT_MODULE, stage))
+
+    def counter(self, counter: str, module: Optional[str] = None) -> int:
+        return self._counters.get((module or DEFAULT_MODULE, counter), 0)
+
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        """{module: {"stages": {stage: summary}, "counters": {counter: value}}}"""
+        with self._lock:
+            histograms = dict(self._histograms)
+            counters = dict(self._counters)
+
+        data: Dict[str, Dict[str, Any]] = {}
+        for (module, stage), histogram in sorted(histograms.items()):
+            entry = data.setdefault(module, {"stages": {}, "counters": {}})
+            entry["stages"][stage] = histogram.summary()
+        for (module, counter), value in sorted(counters.items()):
+            entry = data.setdefault(module, {"stages": {}, "counters": {}})
+            entry["counters"][counter] = value
+        return data
+
+    def to_json(self, **kwargs: Any) -> str:
+        return json.dumps(self.snapshot(), **kwargs)
+
+    def to_prometheus(self, prefix: str = "langdict") -> str:
+        """Prometheus text exposition format (stages as summaries)."""
+        snapshot = self.snapshot()
+        lines = [
+            f"# HELP {prefix}_stage_seconds Latency of LangDict stages.",
+            f"# TYPE {prefix}_stage_seconds summary",
+        ]
+        for module, entry in snapshot.items():
+            for stage, summary in entry["stages"].items():
+                labels = f'module="{_escape(module)}",stage="{stage}"'
+                for quantile, key in _QUANTILES:
+                    value = summary.get(key)
+                    if value is not None:
+                        lines.append(
+                            f'{prefix}_stage_seconds{{{labels},quantile="{quantile}"}} {value}'
+                        )
+                lines.append(f"{prefix}_stage_seconds_sum{{{labels}}} {summary['sum']}")
+                lines.append(f"{prefix}_stage_seconds_count{{{labels}}} {summary['count']}")
+
+        others = sorted({
+            counter
+            for entry in snapshot.values()
+            for counter in entry["counters"]
+            if counter not in self.COUNTERS
+        })
+        for counter in self.COUNTERS + tuple(others):
+            name = f"{prefix}_{counter}_total"
+            lines.append(f"# TYPE {name} counter")
+            for module, entry in snapshot.items():
+                if counter in entry["counters"]:
+                    lines.append(
+                        f'{name}{{module="{_escape(module)}"}} {entry["counters"][counter]}'
+                    )
+        return "\n".join(lines) + "\n"
+
+    def reset(self) -> None:
+        with self._lock:
+            self._histograms.clear()
+            self._counters.clear()
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+metrics = MetricsRegistry()
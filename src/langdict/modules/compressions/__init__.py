@@ -1,7 +1,12 @@
 
-from langdict.modules.compressions.llm_lingua2 import TextCompressor
+from typing import TYPE_CHECKING
 
+from langdict._lazy import attach
 
-__all__ = [
-    TextCompressor,
-]
+if TYPE_CHECKING:
+    from langdict.modules.compressions.llm_lingua2 import TextCompressor
+
+
+__getattr__, __dir__, __all__ = attach(__name__, {
+    "TextCompressor": "langdict.modules.compressions.llm_lingua2",
+})
@@ -1,6 +1,9 @@
-from typing import Dict, Any
+import inspect
+from typing import Any, AsyncIterator, Dict, Iterator, Optional
 
 from langdict import LangDict
+from langdict.langdict import ResultStream
+from langdict.traces.spans import Span, start_span, use_span
 
 from .module import Module
 
@@ -18,6 +21,8 @@ class LangDictModule(Module):
         *args,
         stream: bool = False,
         batch: bool = False,
+        stream_mode: str = "values",
+        return_metadata: bool = False,
         **kwargs
     ):
         if (
@@ -26,15 +31,68 @@ class LangDictModule(Module):
         ):
             stream = True
 
-        inputs = self.forward(*args, **kwargs)
+        if inspect.iscoroutinefunction(self.forward):
+            raise TypeError(
+                f"Module [{self._get_name()}] has an async \"forward\" function. Use \"acall\" instead."
+            )
+        name = self._get_name()
+        current = start_span(name, attributes={"langdict.module": name, "langdict.stream": stream})
+        try:
+            with use_span(current):
+                inputs = self.forward(*args, **kwargs)
 
-        return self.lang_dict(
-            inputs,
-            stream=stream,
-            batch=batch,
-            trace_backend=self.trace_backend,
-            module_name=self._get_name(),
-        )
+                outputs = self.lang_dict(
+                    inputs,
+                    stream=stream,
+                    batch=batch,
+                    trace_backend=self.trace_backend,
+                    module_name=name,
+                    stream_mode=stream_mode,
+                    return_metadata=return_metadata,
+                )
+        except BaseException as e:
+            if current is not None:
+                current.end(error=e)
+            raise
+        return _end_span(current, outputs, _stream_in_span if stream else None)
+
+    async def acall(
+        self,
+        *args,
+        stream: bool = False,
+        batch: bool = False,
+        stream_mode: str = "values",
+        return_metadata: bool = False,
+        **kwargs
+    ):
+        if (
+            self.streaming and
+            self.is_last_child
+        ):
+            stream = True
+
+        name = self._get_name()
+        current = start_span(name, attributes={"langdict.module": name, "langdict.stream": stream})
+        try:
+            with use_span(current):
+                inputs = self.forward(*args, **kwargs)
+                if inspect.isawaitable(inputs):
+                    inputs = await inputs
+
+                outputs = await self.lang_dict.acall(
+                    inputs,
+                    stream=stream,
+                    batch=batch,
+                    trace_backend=self.trace_backend,
+                    module_name=name,
+                    stream_mode=stream_mode,
+                    return_metadata=return_metadata,
+                )
+        except BaseException as e:
+            if current is not None:
+                current.end(error=e)
+            raise
+        return _end_span(current, outputs, _astream_in_span if stream else None)
 
     def forward(self, *args, **kwargs) -> Dict[str, Any]:
         if type(args[0]) is dict:
@@ -48,3 +106,37 @@ class LangDictModule(Module):
 
     def as_dict(self) -> Dict[str, Any]:
         return self.lang_dict.as_dict()
+
+
+def _end_span(current: Optional[Span], outputs: Any, stream_in_span: Any) -> Any:
+    """End the module span now, or with its stream (`stream_in_span`)."""
+    if current is None:
+        return outputs
+    if stream_in_span is None:
+        current.end()
+        return outputs
+    if isinstance(outputs, ResultStream):
+        return outputs.wrap(lambda chunks: stream_in_span(chunks, current))
+    return stream_in_span(outputs, current)
+
+
+def _stream_in_span(outputs: Iterator[Any], current: Span) -> Iterator[Any]:
+    """Chunks of a module stream; the module span ends with the stream."""
+    try:
+        yield from outputs
+    except Exception as e:
+        current.end(error=e)
+        raise
+    finally:
+        current.end()
+
+
+async def _astream_in_span(outputs: AsyncIterator[Any], current: Span) -> AsyncIterator[Any]:
+    try:
+        async for output in outputs:
+            yield output
+    except Exception as e:
+        current.end(error=e)
+        raise
+    finally:
+        current.end()
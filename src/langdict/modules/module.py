@@ -1,13 +1,18 @@
+import inspect
 import json
-from typing import Any, Dict, List, Optional, TypeVar
-
-from langchain_core.callbacks import BaseCallbackHandler
-from langchain_core.runnables import RunnableLambda
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, TypeVar
 
 from langdict.builders import TraceCallbackBuilder
+from langdict.metrics import metrics, metrics_scope
+from langdict.traces.context import trace_run_config
+from langdict.traces.spans import span
 
 from .parameter import Parameter
 
+if TYPE_CHECKING:
+    from langchain_core.callbacks import BaseCallbackHandler
+    from langchain_core.runnables import RunnableLambda
+
 
 T = TypeVar("T", bound="Module")
 
@@ -63,27 +68,91 @@ class Module:
             self.stream(stream)
             self._set_last_child()
 
-        chain = RunnableLambda(lambda x: self.forward(x))
+        chain = self._forward_runnable()
         callbacks = self._trace_callbacks(self.trace_backend, self._get_name())
-        return chain.invoke(
-            *args,
-            config={"callbacks": callbacks},
-            **kwargs,
-        )
+        with (
+            metrics_scope(self._get_name()),
+            metrics.time("total"),
+            span(self._get_name(), attributes={"langdict.module": self._get_name()}),
+        ):
+            return chain.invoke(
+                *args,
+                config=trace_run_config(callbacks),
+                **kwargs,
+            )
+
+    async def acall(
+        self,
+        *args,
+        stream: bool = False,
+        **kwargs,
+    ):
+        """Asynchronously call the module.
+
+        `forward` may be defined with `async def`, so that independent
+        children can be awaited concurrently (e.g. with `asyncio.gather`).
+        A synchronous `forward` is run in an executor.
+
+        Example::
+
+            class Critique(Module):
+
+                async def forward(self, inputs: Dict):
+                    relevant, useful = await asyncio.gather(
+                        self.is_relevant.acall(inputs),
+                        self.is_useful.acall(inputs),
+                    )
+                    return relevant, useful
+
+            await Critique().acall(inputs)
+        """
+        if (
+            stream and
+            self.is_last_child is None
+        ):
+            self.stream(stream)
+            self._set_last_child()
+
+        chain = self._forward_runnable()
+        callbacks = self._trace_callbacks(self.trace_backend, self._get_name())
+        with (
+            metrics_scope(self._get_name()),
+            metrics.time("total"),
+            span(self._get_name(), attributes={"langdict.module": self._get_name()}),
+        ):
+            return await chain.ainvoke(
+                *args,
+                config=trace_run_config(callbacks),
+                **kwargs,
+            )
+
+    def _forward_runnable(self) -> "RunnableLambda":
+        """`forward` as a runnable, created once per module."""
+        runnable = self.__dict__.get("_forward_chain")
+        if runnable is not None:
+            return runnable
+
+        from langchain_core.runnables import RunnableLambda
+
+        if inspect.iscoroutinefunction(self.forward):
+            async def _aforward(x):
+                return await self.forward(x)
+            runnable = RunnableLambda(_aforward)
+        else:
+            runnable = RunnableLambda(lambda x: self.forward(x))
+        self._forward_chain = runnable
+        return runnable
 
     def _trace_callbacks(
         self,
         trace_backend: str,
         module_name: str
-    ) -> List[BaseCallbackHandler]:
+    ) -> List["BaseCallbackHandler"]:
         callbacks = []
         if trace_backend:
-            builder = TraceCallbackBuilder()
-            callback = builder.build(
-                trace_backend,
-                module_name=module_name,
+            callbacks.append(
+                TraceCallbackBuilder.get(trace_backend, module_name=module_name)
             )
-            callbacks.append(callback)
         return callbacks
 
     def __getattr__(self, name: str) -> "Module":
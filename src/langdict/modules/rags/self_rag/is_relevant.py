@@ -33,7 +33,8 @@ D: the creation of gravity
         "model": "gpt-4o-mini",
     },
     "output": {
-        "type": "json"
+        "type": "json",
+        "required_keys": ["rating"]
     },
     "metadata": {
         "arxiv": "https://arxiv.org/abs/2310.11511",
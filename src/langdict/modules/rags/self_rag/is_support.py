@@ -42,7 +42,8 @@ Word embedding is the collective name for a set of language modeling and feature
         "model": "gpt-4o-mini",
     },
     "output": {
-        "type": "json"
+        "type": "json",
+        "required_keys": ["rating"]
     },
     "metadata": {
         "arxiv": "https://arxiv.org/abs/2310.11511",
@@ -31,7 +31,8 @@ We call this score perceived utility. The detailed criterion is as follows:
         "model": "gpt-4o-mini",
     },
     "output": {
-        "type": "json"
+        "type": "json",
+        "required_keys": ["utility"]
     },
     "metadata": {
         "arxiv": "https://arxiv.org/abs/2310.11511",
@@ -1,4 +1,4 @@
-from typing import Any, Dict, Optional
+from typing import Optional
 
 from langdict import LangDict, Module, LangDictModule
 
@@ -37,7 +37,8 @@ Instruction: {instruction}
         "model": "gpt-4o-mini",
     },
     "output": {
-        "type": "json"
+        "type": "json",
+        "required_keys": ["need_retrieval"]
     },
     "metadata": {
         "arxiv": "https://arxiv.org/abs/2310.11511",
@@ -72,7 +73,8 @@ Word embedding is the collective name for a set of language modeling and feature
         "model": "gpt-4o-mini",
     },
     "output": {
-        "type": "json"
+        "type": "json",
+        "required_keys": ["rating"]
     },
     "metadata": {
         "arxiv": "https://arxiv.org/abs/2310.11511",
@@ -106,7 +108,7 @@ class NeedRetrieve(Module):
         instruction: str,
         preceding: Optional[str] = None,
         evidence: Optional[str] = None,
-    ) -> Dict[str, Any]:
+    ) -> str:
 
         if (preceding and evidence):
             inputs = {
@@ -121,4 +123,6 @@ class NeedRetrieve(Module):
             }
             result = self.input_only(inputs)
 
-        if
+        if "need_retrieval" in result:
+            return result["need_retrieval"]
+        return result["rating"]
@@ -1,8 +1,12 @@
 
-from langdict.modules.rankings.rank_gpt import RankGPT
+from typing import TYPE_CHECKING
 
+from langdict._lazy import attach
 
-__all__ = [
-    RankGPT,
-]
+if TYPE_CHECKING:
+    from langdict.modules.rankings.rank_gpt import RankGPT
 
+
+__getattr__, __dir__, __all__ = attach(__name__, {
+    "RankGPT": "langdict.modules.rankings.rank_gpt",
+})
@@ -0,0 +1,8 @@
+from langdict.parsers.json_stream import JsonStreamError, JsonStreamEvent, JsonStreamParser
+
+
+__all__ = [
+    JsonStreamError,
+    JsonStreamEvent,
+    JsonStreamParser,
+]
@@ -0,0 +1,274 @@
+import json
+import re
+from typing import Any, Dict, List, NamedTuple, Optional, Union
+
+
+_STRING_SPECIAL = re.compile(r'["\\]')
+_WHITESPACE = " \t\n\r"
+_LITERAL_END = ",}]" + _WHITESPACE
+_ESCAPES = {
+    '"': '"',
+    "\\": "\\",
+    "/": "/",
+    "b": "\b",
+    "f": "\f",
+    "n": "\n",
+    "r": "\r",
+    "t": "\t",
+}
+
+# What the parser expects next inside a container.
+_KEY_OR_END = 0
+_COLON = 1
+_VALUE = 2
+_COMMA_OR_END = 3
+
+
+class JsonStreamEvent(NamedTuple):
+    """Event of `JsonStreamParser`.
+
+    type:
+        partial: the object parsed so far changed (value: copy of the object).
+        key: a top-level key is complete (key, value: its final value).
+        end: the document is complete (value: the object).
+    """
+
+    type: str
+    value: Any
+    key: Optional[str] = None
+
+
+class JsonStreamError(ValueError):
+    """Invalid JSON in a stream."""
+
+
+class _Frame:
+
+    __slots__ = ("container", "key", "expect")
+
+    def __init__(self, container: Union[Dict[str, Any], List[Any]]):
+        self.container = container
+        self.key: Optional[str] = None
+        self.expect = _KEY_OR_END if isinstance(container, dict) else _VALUE
+
+
+class JsonStreamParser:
+    """Incremental parser of a streamed JSON object (or array).
+
+    Every chunk is scanned once. Text before the first `{`/`[` (e.g. a
+    markdown code fence) and after the end of the document is ignored.
+    Partial objects contain strings as far as they are streamed; numbers
+    and literals appear once they are complete.
+
+    Example::
+
+        parser = JsonStreamParser()
+        for chunk in chunks:
+            for event in parser.feed(chunk):
+                if event.type == "key" and event.key == "need_retrieval":
+                    ...
+    """
+
+    def __init__(self):
+        self.value: Any = None
+        self.done = False
+        self.completed_keys: List[str] = []
+
+        self._stack: List[_Frame] = []
+        self._events: List[JsonStreamEvent] = []
+        self._changed = False
+        # string being parsed: chunks, pending escape, slot in its container
+        self._string: Optional[List[str]] = None
+        self._string_is_key = False
+        self._escape: Optional[str] = None
+        self._slot: Optional[_Frame] = None
+        self._slot_key: Any = None
+        # number / true / false / null being parsed
+        self._literal: Optional[List[str]] = None
+
+    def feed(self, text: str) -> List[JsonStreamEvent]:
+        """Parse the next chunk and return the events it completes."""
+        i = 0
+        n = len(text)
+        while i < n and not self.done:
+            if self._string is not None:
+                i = self._scan_string(text, i)
+                continue
+
+            c = text[i]
+            if self._literal is not None:
+                if c not in _LITERAL_END:
+                    self._literal.append(c)
+                    i += 1
+                    continue
+                self._end_literal()
+
+            if not self._stack:
+                if self.value is None and c in "{[":
+                    self._open({} if c == "{" else [])
+                i += 1
+                continue
+
+            if c in _WHITESPACE:
+                i += 1
+                continue
+
+            frame = self._stack[-1]
+            if frame.expect == _KEY_OR_END:
+                if c == '"':
+                    self._start_string(is_key=True)
+                elif c == "}":
+                    self._close()
+                else:
+                    self._error(c)
+            elif frame.expect == _COLON:
+                if c != ":":
+                    self._error(c)
+                frame.expect = _VALUE
+            elif frame.expect == _VALUE:
+                if c == '"':
+                    self._start_string(is_key=False)
+                elif c in "{[":
+                    self._open({} if c == "{" else [])
+                elif c == "]" and isinstance(frame.container, list) and not frame.container:
+                    self._close()
+                else:
+                    self._literal = [c]
+            else:
+                if c == ",":
+                    frame.expect = _KEY_OR_END if isinstance(frame.container, dict) else _VALUE
+                elif c in "}]":
+                    self._close()
+                else:
+                    self._error(c)
+            i += 1
+
+        return self._flush()
+
+    def close(self) -> List[JsonStreamEvent]:
+        """End of stream. Raises `JsonStreamError` if the document is incomplete."""
+        if not self.done:
+            raise JsonStreamError("Incomplete JSON document in stream.")
+        return self._flush()
+
+    def _flush(self) -> List[JsonStreamEvent]:
+        if self._changed and self._string is not None and self._slot is not None:
+            self._slot.container[self._slot_key] = "".join(self._string)
+
+        events = self._events
+        if self._changed and self.value is not None:
+            events.append(JsonStreamEvent("partial", _copy(self.value)))
+            if self.done:
+                events.append(JsonStreamEvent("end", self.value))
+        self._events = []
+        self._changed = False
+        return events
+
+    def _scan_string(self, text: str, i: int) -> int:
+        if self._escape is not None:
+            return self._scan_escape(text, i)
+
+        match = _STRING_SPECIAL.search(text, i)
+        j = len(text) if match is None else match.start()
+        if j > i:
+            self._string.append(text[i:j])
+            self._changed |= not self._string_is_key
+        if match is None:
+            return j
+        if text[j] == "\\":
+            self._escape = ""
+        else:
+            self._end_string()
+        return j + 1
+
+    def _scan_escape(self, text: str, i: int) -> int:
+        self._escape += text[i]
+        escape = self._escape
+        if escape[0] == "u":
+            if len(escape) < 5:
+                return i + 1
+            self._string.append(chr(int(escape[1:], 16)))
+        elif escape in _ESCAPES:
+            self._string.append(_ESCAPES[escape])
+        else:
+            self._error("\\" + escape)
+        self._escape = None
+        self._changed |= not self._string_is_key
+        return i + 1
+
+    def _start_string(self, is_key: bool) -> None:
+        self._string = []
+        self._string_is_key = is_key
+        if not is_key:
+            self._slot, self._slot_key = self._attach("")
+
+    def _end_string(self) -> None:
+        value = "".join(self._string)
+        if any("\ud800" <= c <= "\udfff" for c in value):
+            value = value.encode("utf-16", "surrogatepass").decode("utf-16")
+        self._string = None
+
+        if self._string_is_key:
+            frame = self._stack[-1]
+            frame.key = value
+            frame.expect = _COLON
+            return
+
+        self._slot.container[self._slot_key] = value
+        self._slot = None
+        self._complete(value)
+
+    def _end_literal(self) -> None:
+        literal = "".join(self._literal)
+        self._literal = None
+        try:
+            value = json.loads(literal)
+        except json.JSONDecodeError:
+            raise JsonStreamError(f"Invalid JSON literal: {literal!r}")
+        self._attach(value)
+        self._complete(value)
+
+    def _open(self, container: Union[Dict[str, Any], List[Any]]) -> None:
+        if self._stack:
+            self._attach(container)
+        else:
+            self.value = container
+            self._changed = True
+        self._stack.append(_Frame(container))
+
+    def _close(self) -> None:
+        frame = self._stack.pop()
+        if self._stack:
+            self._complete(frame.container)
+        else:
+            self.done = True
+            self._changed = True
+
+    def _attach(self, value: Any):
+        frame = self._stack[-1]
+        if isinstance(frame.container, dict):
+            key = frame.key
+        else:
+            key = len(frame.container)
+            frame.container.append(None)
+        frame.container[key] = value
+        self._changed = True
+        return frame, key
+
+    def _complete(self, value: Any) -> None:
+        frame = self._stack[-1]
+        frame.expect = _COMMA_OR_END
+        if len(self._stack) == 1 and isinstance(frame.container, dict):
+            self.completed_keys.append(frame.key)
+            self._events.append(JsonStreamEvent("key", value, key=frame.key))
+
+    def _error(self, c: str) -> None:
+        raise JsonStreamError(f"Unexpected {c!r} in JSON stream.")
+
+
+def _copy(value: Any) -> Any:
+    if isinstance(value, dict):
+        return {k: _copy(v) for k, v in value.items()}
+    if isinstance(value, list):
+        return [_copy(v) for v in value]
+    return value
@@ -0,0 +1,16 @@
+from langdict.providers.base import Provider
+from langdict.providers.callable import CallableProvider
+from langdict.providers.fake import FakeProvider
+from langdict.providers.openai_compatible import OpenAICompatibleProvider
+from langdict.providers.registry import create_provider, provider_names, register_provider
+
+
+__all__ = [
+    CallableProvider,
+    FakeProvider,
+    OpenAICompatibleProvider,
+    Provider,
+    create_provider,
+    provider_names,
+    register_provider,
+]
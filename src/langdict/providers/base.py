@@ -0,0 +1,147 @@
+import inspect
+from typing import Any, AsyncIterator, Dict, Iterable, Iterator, List, Optional, Union
+
+
+Output = Union[str, Iterable[str]]
+
+
+class Provider:
+    """In-process LLM backend with the interface of the `litellm` module.
+
+    ChatLiteLLM sends its requests to `completion` / `acompletion`, so
+    retries, caching, rate limits, metrics and streaming behave exactly
+    as with LiteLLM. Subclasses implement `generate` (and `agenerate` if
+    they wait on something) and return the completion text, or an
+    iterable of text chunks.
+
+    Args:
+        chunk_size: characters per streamed chunk, when `generate` returns
+            a single string.
+    """
+
+    def __init__(self, chunk_size: int = 16):
+        if chunk_size <= 0:
+            raise ValueError("chunk_size must be positive.")
+        self.chunk_size = chunk_size
+
+    def generate(self, messages: List[Dict[str, Any]], **params: Any) -> Output:
+        raise NotImplementedError
+
+    async def agenerate(
+        self, messages: List[Dict[str, Any]], **params: Any
+    ) -> Union[Output, AsyncIterator[str]]:
+        return self.generate(messages, **params)
+
+    def completion(
+        self,
+        messages: List[Dict[str, Any]],
+        model: Optional[str] = None,
+        stream: bool = False,
+        **params: Any,
+    ) -> Any:
+        output = self.generate(messages, model=model, **params)
+        if stream:
+            return self._stream(messages, model, self._pieces(output))
+        return self._response(messages, model, self._join(output))
+
+    async def acompletion(
+        self,
+        messages: List[Dict[str, Any]],
+        model: Optional[str] = None,
+        stream: bool = False,
+        **params: Any,
+    ) -> Any:
+        output = await self.agenerate(messages, model=model, **params)
+        if stream:
+            return self._astream(messages, model, output)
+        if hasattr(output, "__aiter__"):
+            output = [piece async for piece in output]
+        return self._response(messages, model, self._join(output))
+
+    def _join(self, output: Output) -> str:
+        return output if isinstance(output, str) else "".join(output)
+
+    def _pieces(self, output: Output) -> Iterable[str]:
+        if isinstance(output, str):
+            return [
+                output[i:i + self.chunk_size]
+                for i in range(0, len(output), self.chunk_size)
+            ]
+        return output
+
+    def _response(
+        self, messages: List[Dict[str, Any]], model: Optional[str], text: str
+    ) -> Dict[str, Any]:
+        return {
+            "model": model,
+            "choices": [{
+                "index": 0,
+                "message": {"role": "assistant", "content": text},
+                "finish_reason": "stop",
+            }],
+            "usage": _usage(messages, text),
+        }
+
+    def _chunk(self, model: Optional[str], piece: str) -> Dict[str, Any]:
+        return {
+            "model": model,
+            "choices": [{"index": 0, "delta": {"content": piece}, "finish_reason": None}],
+        }
+
+    def _last_chunk(
+        self, messages: List[Dict[str, Any]], model: Optional[str], text: str
+    ) -> Dict[str, Any]:
+        return {
+            "model": model,
+            "choices": [{"index": 0, "delta": {"content": ""}, "finish_reason": "stop"}],
+            "usage": _usage(messages, text),
+        }
+
+    def _stream(
+        self,
+        messages: List[Dict[str, Any]],
+        model: Optional[str],
+        pieces: Iterable[str],
+    ) -> Iterator[Dict[str, Any]]:
+        text = []
+        for piece in pieces:
+            text.append(piece)
+            yield self._chunk(model, piece)
+        yield self._last_chunk(messages, model, "".join(text))
+
+    async def _astream(
+        self,
+        messages: List[Dict[str, Any]],
+        model: Optional[str],
+        output: Union[Output, AsyncIterator[str]],
+    ) -> AsyncIterator[Dict[str, Any]]:
+        text = []
+        if hasattr(output, "__aiter__"):
+            async for piece in output:
+                text.append(piece)
+                yield self._chunk(model, piece)
+        else:
+            for piece in self._pieces(output):
+                text.append(piece)
+                yield self._chunk(model, piece)
+        yield self._last_chunk(messages, model, "".join(text))
+
+
+def _usage(messages: List[Dict[str, Any]], text: str) -> Dict[str, int]:
+    """Token usage, estimated at ~4 characters per token."""
+    prompt_chars = sum(len(str(m.get("content") or "")) for m in messages)
+    prompt_tokens = prompt_chars // 4 + 4 * len(messages)
+    completion_tokens = (len(text) + 3) // 4
+    return {
+        "prompt_tokens": prompt_tokens,
+        "completion_tokens": completion_tokens,
+        "total_tokens": prompt_tokens + completion_tokens,
+    }
+
+
+def is_async_callable(fn: Any) -> bool:
+    """Coroutine or async generator function (or object with such `__call__`)."""
+    for f in (fn, getattr(fn, "__call__", None)):
+        if inspect.iscoroutinefunction(f) or inspect.isasyncgenfunction(f):
+            return True
+    return False
@@ -0,0 +1,47 @@
+import inspect
+from typing import Any, Callable, Dict, List
+
+from .base import Output, Provider, is_async_callable
+
+
+class CallableProvider(Provider):
+    """Answer with a Python function.
+
+    The function is called with the rendered message dicts and the request
+    parameters (model, temperature, max_tokens, ...), and returns the
+    completion text or an iterable of text chunks. Async functions (and
+    async generators) are supported by `acall`.
+
+    Example::
+
+        def echo(messages, **params):
+            return messages[-1]["content"]
+
+        LangDict.from_dict({
+            ...,
+            "llm": {"provider": "callable", "provider_options": {"fn": echo}},
+        })
+
+    Args:
+        fn: `fn(messages, **params) -> str | Iterable[str]`.
+        chunk_size: characters per streamed chunk of a string output.
+    """
+
+    def __init__(self, fn: Callable[..., Any], chunk_size: int = 16):
+        if not callable(fn):
+            raise ValueError("'fn' must be callable.")
+        super().__init__(chunk_size=chunk_size)
+        self.fn = fn
+
+    def generate(self, messages: List[Dict[str, Any]], **params: Any) -> Output:
+        if is_async_callable(self.fn):
+            raise TypeError(
+                f"{self.fn!r} is an async function. Use \"acall\" instead."
+            )
+        return self.fn(messages, **params)
+
+    async def agenerate(self, messages: List[Dict[str, Any]], **params: Any) -> Any:
+        output = self.fn(messages, **params)
+        if inspect.isawaitable(output):
+            output = await output
+        return output
@@ -0,0 +1,121 @@
+import asyncio
+import itertools
+import random
+import threading
+import time
+from typing import Any, AsyncIterator, Dict, Iterator, List, Optional, Tuple
+
+from .base import Output, Provider
+
+
+class FakeProvider(Provider):
+    """Deterministic local model with tunable latency and error rate.
+
+    For load tests, chaos tests and benchmarks. Failed requests raise
+    `litellm.APIConnectionError`, so ChatLiteLLM retries them like real
+    connection errors.
+
+    Example::
+
+        "llm": {
+            "model": "fake",
+            "provider": "fake",
+            "provider_options": {
+                "responses": ["[Relevant]", "[Irrelevant]"],
+                "latency": 0.2,
+                "jitter": 0.1,
+                "error_rate": 0.05,
+                "seed": 0,
+            },
+        }
+
+    Args:
+        content: text of every completion (unless `responses` is set).
+        responses: completions returned in turn (cycled).
+        latency: seconds before the response (or the first chunk).
+        jitter: extra latency, uniform in [0, jitter] seconds.
+        error_rate: probability that a request fails.
+        chunk_size: characters per streamed chunk.
+        chunk_latency: seconds between streamed chunks.
+        seed: seed of the latency / error random generator.
+    """
+
+    def __init__(
+        self,
+        content: str = "Hello, LangDict!",
+        responses: Optional[List[str]] = None,
+        latency: float = 0.0,
+        jitter: float = 0.0,
+        error_rate: float = 0.0,
+        chunk_size: int = 16,
+        chunk_latency: float = 0.0,
+        seed: Optional[int] = None,
+    ):
+        if not 0.0 <= error_rate <= 1.0:
+            raise ValueError("error_rate must be between 0 and 1.")
+        if latency < 0 or jitter < 0 or chunk_latency < 0:
+            raise ValueError("latency, jitter and chunk_latency must not be negative.")
+        super().__init__(chunk_size=chunk_size)
+
+        self.content = content
+        self.responses = list(responses) if responses else None
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.chunk_latency = chunk_latency
+
+        self.calls = 0
+        self.errors = 0
+        self._random = random.Random(seed)
+        self._cycle = itertools.cycle(self.responses) if self.responses else None
+        self._lock = threading.Lock()
+
+    def _next(self, model: Optional[str]) -> Tuple[float, str]:
+        """(delay, text) of a request, or raise its error."""
+        with self._lock:
+            self.calls += 1
+            delay = self.latency
+            if self.jitter:
+                delay += self._random.uniform(0, self.jitter)
+            failed = self.error_rate > 0 and self._random.random() < self.error_rate
+            if failed:
+                self.errors += 1
+            text = next(self._cycle) if self._cycle is not None else self.content
+
+        if failed:
+            import litellm
+
+            raise litellm.APIConnectionError(
+                message="FakeProvider: injected error",
+                llm_provider="fake",
+                model=model or "fake",
+            )
+        return delay, text
+
+    def generate(self, messages: List[Dict[str, Any]], **params: Any) -> Output:
+        delay, text = self._next(params.get("model"))
+        if delay:
+            time.sleep(delay)
+        if self.chunk_latency:
+            return self._slow_pieces(text)
+        return text
+
+    async def agenerate(self, messages: List[Dict[str, Any]], **params: Any) -> Any:
+        delay, text = self._next(params.get("model"))
+        if delay:
+            await asyncio.sleep(delay)
+        if self.chunk_latency:
+            return self._aslow_pieces(text)
+        return text
+
+    def _slow_pieces(self, text: str) -> Iterator[str]:
+        for i, piece in enumerate(self._pieces(text)):
+            if i:
+                time.sleep(self.chunk_latency)
+            yield piece
+
+    async def _aslow_pieces(self, text: str) -> AsyncIterator[str]:
+        for i, piece in enumerate(self._pieces(text)):
+            if i:
+                await asyncio.sleep(self.chunk_latency)
+            yield piece
@@ -0,0 +1,58 @@
+from typing import Any, Optional
+
+
+class OpenAICompatibleProvider:
+    """Send requests to an OpenAI-compatible server (e.g. a local stand-in).
+
+    Requests still go through LiteLLM, with the server's `api_base` and
+    the OpenAI protocol, whatever the model name is, over the keep-alive
+    connections of the process-wide client pool.
+
+    Example::
+
+        "llm": {
+            "model": "local-model",
+            "provider": "openai_compatible",
+            "provider_options": {"api_base": "http://localhost:8000/v1"},
+        }
+
+    Args:
+        api_base: base URL of the server.
+        api_key: key sent to the server (most local servers ignore it).
+    """
+
+    def __init__(self, api_base: str, api_key: Optional[str] = "sk-local"):
+        if not api_base:
+            raise ValueError("'api_base' is required.")
+        self.base_url = api_base
+        self.api_key = api_key
+
+    def _params(self, kwargs: Any) -> Any:
+        return {
+            **kwargs,
+            "api_base": self.base_url,
+            "api_key": kwargs.get("api_key") or self.api_key,
+            "custom_llm_provider": "openai",
+        }
+
+    def completion(self, **kwargs: Any) -> Any:
+        import litellm
+
+        from langdict.chat_models.client_pool import get_client_pool
+
+        params = self._params(kwargs)
+        client = get_client_pool().get(params)
+        if client is not None:
+            params["client"] = client
+        return litellm.completion(**params)
+
+    async def acompletion(self, **kwargs: Any) -> Any:
+        import litellm
+
+        from langdict.chat_models.client_pool import get_client_pool
+
+        params = self._params(kwargs)
+        client = get_client_pool().aget(params)
+        if client is not None:
+            params["client"] = client
+        return await litellm.acompletion(**params)
@@ -0,0 +1,56 @@
+import threading
+from typing import Any, Callable, Dict, List, Optional
+
+from .callable import CallableProvider
+from .fake import FakeProvider
+from .openai_compatible import OpenAICompatibleProvider
+
+
+LITELLM = "litellm"
+
+_factories: Dict[str, Callable[..., Any]] = {
+    "callable": CallableProvider,
+    "fake": FakeProvider,
+    "openai_compatible": OpenAICompatibleProvider,
+}
+_lock = threading.Lock()
+
+
+def register_provider(name: str, factory: Callable[..., Any]) -> None:
+    """Register an LLM backend for `llm.provider`.
+
+    The factory is called with `llm.provider_options` as keyword arguments
+    and returns a client with the interface of the `litellm` module
+    (`completion(**kwargs)` / `acompletion(**kwargs)`), e.g. a `Provider`.
+
+    Example::
+
+        register_provider("echo", lambda: CallableProvider(
+            lambda messages, **params: messages[-1]["content"]
+        ))
+
+    Args:
+        name: provider name used in specifications.
+        factory: callable that builds the client.
+    """
+    if name == LITELLM:
+        raise ValueError(f"'{LITELLM}' is the built-in backend and cannot be replaced.")
+    with _lock:
+        _factories[name] = factory
+
+
+def create_provider(name: str, options: Optional[Dict[str, Any]] = None) -> Any:
+    """Client of a registered provider. None for LiteLLM itself."""
+    if name == LITELLM:
+        return None
+
+    factory = _factories.get(name)
+    if factory is None:
+        raise ValueError(
+            f"Unknown LLM provider: {name} (registered: {sorted(provider_names())})"
+        )
+    return factory(**(options or {}))
+
+
+def provider_names() -> List[str]:
+    return [LITELLM, *_factories]
@@ -8,6 +8,7 @@ from .prompt import (
 )
 from .llm import LLMSpecification
 from .output import OutputSpecification
+from .cache import CacheSpecification
 
 
 __all__ = [
@@ -18,4 +19,5 @@ __all__ = [
     ChatPromptSpecification,
     LLMSpecification,
     OutputSpecification,
+    CacheSpecification,
 ]
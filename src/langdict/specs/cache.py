@@ -0,0 +1,62 @@
+from typing import Dict, Optional
+
+from .base import BaseSpecification
+
+
+class CacheSpecification(BaseSpecification):
+    """Response cache of a LangDict.
+
+    Example::
+
+        "cache": {
+            "type": "tiered",       # memory | sqlite | tiered
+            "max_entries": 1024,
+            "max_bytes": 16 * 1024 * 1024,
+            "ttl": 3600,
+            "path": ".langdict_cache.db",
+        }
+
+    Responses are only cached when `temperature` is 0,
+    unless `allow_nondeterministic` is True.
+    """
+
+    CACHE_TYPES = {"memory", "sqlite", "tiered"}
+
+    def __init__(
+        self,
+        type: str = "memory",
+        max_entries: Optional[int] = 1024,
+        max_bytes: Optional[int] = None,
+        ttl: Optional[float] = None,
+        path: Optional[str] = None,
+        allow_nondeterministic: bool = False,
+    ):
+        self.type = type
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.path = path
+        self.allow_nondeterministic = allow_nondeterministic
+
+        super().__init__()
+
+    def validate(self):
+        if self.type not in self.CACHE_TYPES:
+            raise ValueError(f"Invalid cache type: {self.type}")
+        if self.max_entries is not None and self.max_entries <= 0:
+            raise ValueError("max_entries must be positive")
+        if self.max_bytes is not None and self.max_bytes <= 0:
+            raise ValueError("max_bytes must be positive")
+        if self.ttl is not None and self.ttl <= 0:
+            raise ValueError("ttl must be positive")
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> "CacheSpecification":
+        return cls(
+            type=data.get("type", "memory"),
+            max_entries=data.get("max_entries", 1024),
+            max_bytes=data.get("max_bytes", None),
+            ttl=data.get("ttl", None),
+            path=data.get("path", None),
+            allow_nondeterministic=data.get("allow_nondeterministic", False),
+        )
@@ -1,9 +1,10 @@
-from typing import Any, Dict
+from typing import Any, Dict, Optional
 
 from .base import BaseSpecification
 from .prompt import PromptSpecification
 from .llm import LLMSpecification
 from .output import OutputSpecification
+from .cache import CacheSpecification
 
 
 class LangSpecification(BaseSpecification):
@@ -17,11 +18,13 @@ class LangSpecification(BaseSpecification):
         self,
         prompt: PromptSpecification,
         llm: LLMSpecification,
-        output: OutputSpecification
+        output: OutputSpecification,
+        cache: Optional[CacheSpecification] = None,
     ):
         self.prompt = prompt
         self.llm = llm
         self.output = output
+        self.cache = cache
 
         super().__init__()
 
@@ -29,6 +32,8 @@ class LangSpecification(BaseSpecification):
         self.prompt.validate()
         self.llm.validate()
         self.output.validate()
+        if self.cache is not None:
+            self.cache.validate()
 
     @classmethod
     def from_dict(cls, data: Dict[str, Any]) -> "LangSpecification":
@@ -55,10 +60,16 @@ class LangSpecification(BaseSpecification):
         prompt = PromptSpecification.from_dict(prompt_data, prompt_type=prompt_type)
         llm = LLMSpecification.from_dict(data["llm"])
         output = OutputSpecification.from_dict(data["output"])
-        return cls(prompt, llm, output)
+
+        cache = None
+        if data.get("cache") is not None:
+            cache = CacheSpecification.from_dict(data["cache"])
+        return cls(prompt, llm, output, cache=cache)
 
     def as_dict(self) -> Dict[str, Any]:
-        data = self.prompt.as_dict()
+        data = dict(self.prompt.as_dict())
         data["llm"] = self.llm.as_dict()
         data["output"] = self.output.as_dict()
+        if self.cache is not None:
+            data["cache"] = self.cache.as_dict()
         return data
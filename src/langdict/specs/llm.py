@@ -1,8 +1,36 @@
-from typing import Dict, Optional
+from typing import Any, Dict, List, Optional
 
 from .base import BaseSpecification
 
 
+_RETRY_KEYS = {
+    "max_attempts",
+    "initial_delay",
+    "max_delay",
+    "multiplier",
+    "jitter",
+    "attempt_timeout",
+    "respect_retry_after",
+    "max_retry_after",
+}
+_CIRCUIT_BREAKER_KEYS = {"failure_threshold", "recovery_time", "fallback"}
+_FALLBACK_KEYS = {"model", "api_base", "api_key", "organization"}
+_DEPLOYMENT_KEYS = {"model", "api_base", "api_key", "organization", "rate_limit"}
+_ROUTING_KEYS = {"strategy", "ejection_time", "ewma_alpha"}
+_HEDGE_KEYS = {
+    "percentile",
+    "delay",
+    "initial_delay",
+    "min_samples",
+    "min_delay",
+    "max_in_flight",
+    "model",
+    "api_base",
+    "api_key",
+    "organization",
+}
+
+
 class LLMSpecification(BaseSpecification):
 
     def __init__(
@@ -10,28 +38,106 @@ class LLMSpecification(BaseSpecification):
         model: str = "gpt-3.5-turbo",
         model_name: Optional[str] = None,
         api_key: Optional[str] = None,
+        api_base: Optional[str] = None,
+        organization: Optional[str] = None,
+        timeout: Optional[float] = None,
         temperature: Optional[float] = 1,
         top_p: Optional[float] = None,
         top_k: Optional[int] = None,
         streaming: bool = False,
         n: int = 1,
         max_tokens: Optional[int] = None,
+        rate_limit: Optional[Dict[str, Any]] = None,
+        coalesce: bool = False,
+        retry: Optional[Dict[str, Any]] = None,
+        circuit_breaker: Optional[Dict[str, Any]] = None,
+        hedge: Optional[Dict[str, Any]] = None,
+        deployments: Optional[List[Dict[str, Any]]] = None,
+        routing: Optional[Dict[str, Any]] = None,
+        provider: str = "litellm",
+        provider_options: Optional[Dict[str, Any]] = None,
     ):
-        super().__init__()
-
         self.model = model
         self.model_name = model_name
         self.api_key = api_key
+        # connection settings, sent with every request
+        self.api_base = api_base
+        self.organization = organization
+        self.timeout = timeout
         self.temperature = temperature
         self.top_p = top_p
         self.top_k = top_k
         self.streaming = streaming
         self.n = n
         self.max_tokens = max_tokens
+        # {"rpm": requests per minute, "tpm": tokens per minute}
+        self.rate_limit = rate_limit
+        # share one call between identical requests in flight / in a batch
+        self.coalesce = coalesce
+        # see `langdict.chat_models.RetryPolicy`
+        self.retry = retry
+        # {"failure_threshold": 5, "recovery_time": 30,
+        #  "fallback": {"model", "api_base", "api_key", "organization"}}
+        self.circuit_breaker = circuit_breaker
+        # see `langdict.chat_models.Hedger`
+        self.hedge = hedge
+        # [{"model", "api_base", "api_key", "organization", "rate_limit"}, ...]
+        self.deployments = deployments
+        # {"strategy": "least_outstanding" | "ewma", "ejection_time", "ewma_alpha"}
+        self.routing = routing
+        # LLM backend (see `langdict.providers.register_provider`)
+        self.provider = provider
+        self.provider_options = provider_options
+
+        super().__init__()
 
     def validate(self):
         # TODO: 사용가능한 LLM 기준
-        pass
+        if self.rate_limit is not None:
+            unknown_keys = set(self.rate_limit) - {"rpm", "tpm"}
+            if unknown_keys:
+                raise ValueError(f"Invalid rate_limit keys: {sorted(unknown_keys)}")
+            for key, value in self.rate_limit.items():
+                if value is not None and value <= 0:
+                    raise ValueError(f"rate_limit.{key} must be positive")
+        if self.retry is not None:
+            unknown_keys = set(self.retry) - _RETRY_KEYS
+            if unknown_keys:
+                raise ValueError(f"Invalid retry keys: {sorted(unknown_keys)}")
+        if self.circuit_breaker is not None:
+            unknown_keys = set(self.circuit_breaker) - _CIRCUIT_BREAKER_KEYS
+            if unknown_keys:
+                raise ValueError(f"Invalid circuit_breaker keys: {sorted(unknown_keys)}")
+            fallback = self.circuit_breaker.get("fallback")
+            if fallback is not None:
+                if not isinstance(fallback, dict):
+                    raise ValueError(f"Invalid circuit_breaker.fallback: {fallback}")
+                unknown_keys = set(fallback) - _FALLBACK_KEYS
+                if unknown_keys:
+                    raise ValueError(f"Invalid circuit_breaker.fallback keys: {sorted(unknown_keys)}")
+        if self.hedge is not None:
+            unknown_keys = set(self.hedge) - _HEDGE_KEYS
+            if unknown_keys:
+                raise ValueError(f"Invalid hedge keys: {sorted(unknown_keys)}")
+        if self.deployments is not None:
+            if not isinstance(self.deployments, list) or not self.deployments:
+                raise ValueError("deployments must be a non-empty list")
+            for deployment in self.deployments:
+                if not isinstance(deployment, dict):
+                    raise ValueError(f"Invalid deployment: {deployment}")
+                unknown_keys = set(deployment) - _DEPLOYMENT_KEYS
+                if unknown_keys:
+                    raise ValueError(f"Invalid deployment keys: {sorted(unknown_keys)}")
+        if self.routing is not None:
+            unknown_keys = set(self.routing) - _ROUTING_KEYS
+            if unknown_keys:
+                raise ValueError(f"Invalid routing keys: {sorted(unknown_keys)}")
+        if self.timeout is not None and self.timeout <= 0:
+            raise ValueError("timeout must be positive")
+        if not isinstance(self.provider, str) or not self.provider:
+            raise ValueError(f"Invalid provider: {self.provider}")
+        if self.provider_options is not None and not isinstance(self.provider_options, dict):
+            raise ValueError("provider_options must be a dict")
 
     @classmethod
     def from_dict(cls, data: Dict) -> "LLMSpecification":
@@ -40,11 +146,23 @@ class LLMSpecification(BaseSpecification):
             model_name=None,
             # model_name=data.get("model_name", "openai"),
             api_key=data.get("api_key"),
+            api_base=data.get("api_base"),
+            organization=data.get("organization"),
+            timeout=data.get("timeout"),
             temperature=data.get("temperature", 1),
             top_p=data.get("top_p", None),
             top_k=data.get("top_k", None),
             streaming=data.get("streaming", False),
             n=data.get("n", 1),
             max_tokens=data.get("max_tokens", None),
+            rate_limit=data.get("rate_limit", None),
+            coalesce=data.get("coalesce", False),
+            retry=data.get("retry", None),
+            circuit_breaker=data.get("circuit_breaker", None),
+            hedge=data.get("hedge", None),
+            deployments=data.get("deployments", None),
+            routing=data.get("routing", None),
+            provider=data.get("provider", "litellm"),
+            provider_options=data.get("provider_options", None),
         )
 
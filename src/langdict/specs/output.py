@@ -1,4 +1,4 @@
-from typing import Dict
+from typing import Dict, List, Optional
 
 from .base import BaseSpecification
 
@@ -7,17 +7,33 @@ class OutputSpecification(BaseSpecification):
 
     OUTPUT_TYPES = {"string", "json"}
 
-    def __init__(self, type: str = "string"):
+    def __init__(
+        self,
+        type: str = "string",
+        required_keys: Optional[List[str]] = None,
+    ):
         self.type = type
+        # json keys the caller reads: the completion is streamed and closed
+        # as soon as they are parsed (the rest of the object is dropped)
+        self.required_keys = required_keys
 
         super().__init__()
 
     def validate(self):
         if self.type not in self.OUTPUT_TYPES:
             raise ValueError(f"Invalid output type: {self.type}")
+        if self.required_keys is not None:
+            if self.type != "json":
+                raise ValueError("required_keys is only supported for the 'json' output type.")
+            if (
+                not self.required_keys or
+                not all(isinstance(key, str) for key in self.required_keys)
+            ):
+                raise ValueError(f"Invalid required_keys: {self.required_keys}")
 
     @classmethod
     def from_dict(cls, data: Dict) -> "OutputSpecification":
         return cls(
             type=data.get("type", "string"),
+            required_keys=data.get("required_keys", None),
         )
@@ -1,9 +1,31 @@
 
-from langdict.traces.backend import TraceBackend
-from langdict.traces.callbacks.stdout import TraceStdOutCallbackHandler
+from typing import TYPE_CHECKING
 
+from langdict._lazy import attach
 
-__all__ = [
-    TraceBackend,
-    TraceStdOutCallbackHandler,
-]
+if TYPE_CHECKING:
+    from langdict.traces.backend import TraceBackend
+    from langdict.traces.callbacks.buffered import BufferedTraceCallbackHandler
+    from langdict.traces.callbacks.stdout import TraceStdOutCallbackHandler
+    from langdict.traces.context import current_trace_context, trace_context, trace_run_config
+    from langdict.traces.profiler import Profiler, profile
+    from langdict.traces.sink import TraceSink, configure_sink, get_sink
+    from langdict.traces.spans import Span, SpanRecorder, record_spans
+
+
+__getattr__, __dir__, __all__ = attach(__name__, {
+    "TraceBackend": "langdict.traces.backend",
+    "BufferedTraceCallbackHandler": "langdict.traces.callbacks.buffered",
+    "TraceStdOutCallbackHandler": "langdict.traces.callbacks.stdout",
+    "current_trace_context": "langdict.traces.context",
+    "trace_context": "langdict.traces.context",
+    "trace_run_config": "langdict.traces.context",
+    "Profiler": "langdict.traces.profiler",
+    "profile": "langdict.traces.profiler",
+    "TraceSink": "langdict.traces.sink",
+    "configure_sink": "langdict.traces.sink",
+    "get_sink": "langdict.traces.sink",
+    "Span": "langdict.traces.spans",
+    "SpanRecorder": "langdict.traces.spans",
+    "record_spans": "langdict.traces.spans",
+})
@@ -5,3 +5,4 @@ class TraceBackend(StrEnum):
     CONSOLE = "console"
     LANGFUSE = "langfuse"
     LANGSMITH = "langsmith"
+    BUFFERED = "buffered"
@@ -1,7 +1,10 @@
-
+from langdict.traces.callbacks.buffered import BufferedTraceCallbackHandler
+from langdict.traces.callbacks.spans import SpanCallbackHandler
 from langdict.traces.callbacks.stdout import TraceStdOutCallbackHandler
 
 
 __all__ = [
+    BufferedTraceCallbackHandler,
+    SpanCallbackHandler,
     TraceStdOutCallbackHandler,
 ]
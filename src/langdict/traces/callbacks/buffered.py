@@ -0,0 +1,165 @@
+"""Callback Handler that buffers compact span records for a background writer."""
+
+import time
+from typing import Any, Dict, List, Optional
+from uuid import UUID
+
+from langchain_core.callbacks.base import BaseCallbackHandler
+from langchain_core.outputs import LLMResult
+
+from langdict.traces.sink import TraceSink, get_sink
+
+
+class BufferedTraceCallbackHandler(BaseCallbackHandler):
+    """Record chain and LLM runs as spans in a `TraceSink`.
+
+    Unlike `TraceStdOutCallbackHandler`, nothing is formatted or written
+    on the calling thread: a span is a small dict appended to the sink's
+    buffer when its run ends.
+
+    Span record::
+
+        {"trace_id", "span_id", "parent_id", "name", "kind", "module",
+         "start", "duration", "status", "inputs", "outputs", "error",
+         "session_id", "user_id", "tags"}
+    """
+
+    run_inline = True
+
+    def __init__(
+        self,
+        module_name: Optional[str] = None,
+        sink: Optional[TraceSink] = None,
+    ) -> None:
+        """Initialize callback handler.
+
+        Args:
+            module_name: The name of the module. Defaults to None.
+            sink: The sink to write to. Defaults to the shared sink
+                (see `configure_sink`).
+        """
+        self.module_name = module_name
+        self._sink = sink
+        self._runs: Dict[UUID, Dict[str, Any]] = {}
+
+    @property
+    def sink(self) -> TraceSink:
+        return self._sink or get_sink()
+
+    def _start(
+        self,
+        kind: str,
+        name: str,
+        inputs: Any,
+        run_id: UUID,
+        parent_run_id: Optional[UUID],
+        metadata: Optional[Dict[str, Any]],
+    ) -> None:
+        if parent_run_id is None:
+            if not self.sink.sample():
+                return
+            trace_id = str(run_id)
+            metadata = metadata or {}
+            context = {
+                "session_id": metadata.get("session_id"),
+                "user_id": metadata.get("user_id"),
+                "tags": metadata.get("langfuse_tags"),
+            }
+        else:
+            parent = self._runs.get(parent_run_id)
+            if parent is None:
+                # Not sampled.
+                return
+            trace_id = parent["trace_id"]
+            context = {}
+
+        self._runs[run_id] = {
+            "trace_id": trace_id,
+            "span_id": str(run_id),
+            "parent_id": str(parent_run_id) if parent_run_id else None,
+            "name": name,
+            "kind": kind,
+            "module": self.module_name,
+            "start": time.time(),
+            "inputs": inputs,
+            "_perf_start": time.perf_counter(),
+            **context,
+        }
+
+    def _end(
+        self,
+        run_id: UUID,
+        outputs: Any = None,
+        error: Optional[BaseException] = None,
+    ) -> None:
+        record = self._runs.pop(run_id, None)
+        if record is None:
+            return
+
+        record["duration"] = time.perf_counter() - record.pop("_perf_start")
+        if error is None:
+            record["status"] = "ok"
+            record["outputs"] = outputs
+        else:
+            record["status"] = "error"
+            record["error"] = repr(error)
+        self.sink.emit(record)
+
+    def on_chain_start(
+        self,
+        serialized: Optional[Dict[str, Any]],
+        inputs: Any,
+        *,
+        run_id: UUID,
+        parent_run_id: Optional[UUID] = None,
+        metadata: Optional[Dict[str, Any]] = None,
+        **kwargs: Any,
+    ) -> None:
+        name = kwargs.get("name") or (serialized or {}).get("name") or "chain"
+        self._start("chain", name, inputs, run_id, parent_run_id, metadata)
+
+    def on_chain_end(self, outputs: Any, *, run_id: UUID, **kwargs: Any) -> None:
+        self._end(run_id, outputs=outputs)
+
+    def on_chain_error(self, error: BaseException, *, run_id: UUID, **kwargs: Any) -> None:
+        self._end(run_id, error=error)
+
+    def on_chat_model_start(
+        self,
+        serialized: Optional[Dict[str, Any]],
+        messages: List[List[Any]],
+        *,
+        run_id: UUID,
+        parent_run_id: Optional[UUID] = None,
+        metadata: Optional[Dict[str, Any]] = None,
+        **kwargs: Any,
+    ) -> None:
+        name = kwargs.get("name") or (serialized or {}).get("name") or "llm"
+        inputs = [[(m.type, m.content) for m in batch] for batch in messages]
+        self._start("llm", name, inputs, run_id, parent_run_id, metadata)
+
+    def on_llm_start(
+        self,
+        serialized: Optional[Dict[str, Any]],
+        prompts: List[str],
+        *,
+        run_id: UUID,
+        parent_run_id: Optional[UUID] = None,
+        metadata: Optional[Dict[str, Any]] = None,
+        **kwargs: Any,
+    ) -> None:
+        name = kwargs.get("name") or (serialized or {}).get("name") or "llm"
+        self._start("llm", name, prompts, run_id, parent_run_id, metadata)
+
+    def on_llm_end(self, response: LLMResult, *, run_id: UUID, **kwargs: Any) -> None:
+        outputs = {
+            "generations": [
+                [generation.text for generation in generations]
+                for generations in response.generations
+            ],
+            "llm_output": response.llm_output,
+        }
+        self._end(run_id, outputs=outputs)
+
+    def on_llm_error(self, error: BaseException, *, run_id: UUID, **kwargs: Any) -> None:
+        self._end(run_id, error=error)
@@ -0,0 +1,58 @@
+"""Callback Handler that records prompt rendering and output parsing as spans."""
+
+from typing import Any, Dict, Optional
+from uuid import UUID
+
+from langchain_core.callbacks.base import BaseCallbackHandler
+
+from langdict.traces.spans import Span, start_span
+
+
+class SpanCallbackHandler(BaseCallbackHandler):
+    """Record the local stages of runnable chains (see `record_spans`).
+
+    The lean engine records these spans itself; LLM requests are recorded
+    by ChatLiteLLM.
+    """
+
+    run_inline = True
+
+    def __init__(self):
+        self._spans: Dict[UUID, Span] = {}
+
+    def on_chain_start(
+        self,
+        serialized: Optional[Dict[str, Any]],
+        inputs: Any,
+        *,
+        run_id: UUID,
+        parent_run_id: Optional[UUID] = None,
+        **kwargs: Any,
+    ) -> None:
+        if parent_run_id is None:
+            return
+
+        name = kwargs.get("name") or (serialized or {}).get("name") or ""
+        if name.endswith("PromptTemplate"):
+            stage = "render"
+        elif name.endswith("OutputParser"):
+            stage = "parse"
+        else:
+            return
+
+        span = start_span(stage)
+        if span is not None:
+            self._spans[run_id] = span
+
+    def on_chain_end(self, outputs: Any, *, run_id: UUID, **kwargs: Any) -> None:
+        span = self._spans.pop(run_id, None)
+        if span is not None:
+            span.end()
+
+    def on_chain_error(self, error: BaseException, *, run_id: UUID, **kwargs: Any) -> None:
+        span = self._spans.pop(run_id, None)
+        if span is not None:
+            span.end(error=error)
+
+
+span_handler = SpanCallbackHandler()
@@ -68,7 +68,11 @@ class TraceStdOutCallbackHandler(BaseCallbackHandler):
         class_name = ""
         if serialized:
             class_name = serialized.get("name", serialized.get("id", ["<unknown>"])[-1])
-        print(f"\n\n\033[1m>{self.prefix} Entering new {class_name}chain...\033[0m")  # noqa: T201
+        prefix = self.prefix
+        session_id = (kwargs.get("metadata") or {}).get("session_id")
+        if session_id and "session_id=" not in prefix:
+            prefix = f"[session_id={session_id}] {prefix}"
+        print(f"\n\n\033[1m>{prefix} Entering new {class_name}chain...\033[0m")  # noqa: T201
         print_text(f"inputs: {inputs}", color=self.color)  # noqa: T201
 
     def on_chain_end(self, outputs: dict[str, Any], **kwargs: Any) -> None:
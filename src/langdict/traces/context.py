@@ -0,0 +1,69 @@
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Dict, Iterator, List, Optional
+
+
+_trace_context: ContextVar[Optional[Dict[str, Any]]] = ContextVar(
+    "langdict_trace_context", default=None
+)
+
+
+@contextmanager
+def trace_context(
+    session_id: Optional[str] = None,
+    user_id: Optional[str] = None,
+    tags: Optional[List[str]] = None,
+) -> Iterator[Dict[str, Any]]:
+    """Attach per-request context to the traces of every call inside the block.
+
+    Trace handlers are shared between calls; the context is passed to them
+    as run metadata and tags. Nested blocks inherit unset values and
+    extend the tags.
+
+    Example::
+
+        with trace_context(session_id="session-1", user_id="user-1", tags=["beta"]):
+            rag(inputs)
+
+    Args:
+        session_id: session of the request.
+        user_id: user of the request.
+        tags: tags of the request.
+    """
+    outer = _trace_context.get() or {}
+    context = {
+        "session_id": session_id or outer.get("session_id"),
+        "user_id": user_id or outer.get("user_id"),
+        "tags": [*outer.get("tags", []), *(tags or [])],
+    }
+    token = _trace_context.set(context)
+    try:
+        yield context
+    finally:
+        _trace_context.reset(token)
+
+
+def current_trace_context() -> Optional[Dict[str, Any]]:
+    return _trace_context.get()
+
+
+def trace_run_config(callbacks: List[Any]) -> Dict[str, Any]:
+    """Runnable config with trace callbacks and the current trace context."""
+    config: Dict[str, Any] = {"callbacks": callbacks}
+
+    context = _trace_context.get()
+    if context is None or not callbacks:
+        return config
+
+    metadata = {}
+    if context["session_id"]:
+        metadata["session_id"] = context["session_id"]
+        metadata["langfuse_session_id"] = context["session_id"]
+    if context["user_id"]:
+        metadata["user_id"] = context["user_id"]
+        metadata["langfuse_user_id"] = context["user_id"]
+    if context["tags"]:
+        metadata["langfuse_tags"] = context["tags"]
+        config["tags"] = list(context["tags"])
+    config["metadata"] = metadata
+    return config
@@ -0,0 +1,203 @@
+"""Flame graphs of Module calls (speedscope / collapsed stacks)."""
+
+import json
+from collections import defaultdict
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Optional
+
+from .spans import Span, SpanRecorder, record_spans
+
+
+class _Node:
+
+    __slots__ = ("name", "start", "end", "children")
+
+    def __init__(self, name: str, start: int, end: int):
+        self.name = name
+        self.start = start
+        self.end = end
+        self.children: List["_Node"] = []
+
+
+class _Lane:
+
+    __slots__ = ("events", "last_at", "depth")
+
+    def __init__(self):
+        self.events: List[Dict[str, Any]] = []
+        self.last_at = 0
+        self.depth = 0
+
+
+class Profiler:
+    """Call tree of the Modules called inside `profile()`.
+
+    Frames are modules, `render` / `parse` (local CPU) and
+    `network (<model>)` (waiting for the LLM). Time of a module that is not
+    covered by a child frame is spent in its own `forward`.
+
+    Example::
+
+        from langdict.traces import profile
+
+        with profile() as profiler:
+            self_rag(inputs)
+
+        profiler.save("self_rag.speedscope.json")  # https://www.speedscope.app
+        profiler.save("self_rag.collapsed")         # flamegraph.pl / inferno
+    """
+
+    def __init__(self, recorder: SpanRecorder):
+        self.recorder = recorder
+
+    def _tree(self) -> List[_Node]:
+        spans = sorted(self.recorder.spans, key=lambda s: s.start_ns)
+        nodes: Dict[str, _Node] = {}
+        for span in spans:
+            nodes[span.span_id] = _Node(_frame_name(span), span.start_ns, span.end_ns)
+
+        roots = []
+        for span in spans:
+            node = nodes[span.span_id]
+            parent = nodes.get(span.parent_id) if span.parent_id else None
+            if parent is None:
+                roots.append(node)
+            else:
+                parent.children.append(node)
+        return roots
+
+    def to_collapsed(self) -> str:
+        """Collapsed stacks ("a;b;c <microseconds>" per line) of self time."""
+        weights: Dict[str, int] = defaultdict(int)
+
+        def _walk(node: _Node, prefix: str) -> None:
+            stack = f"{prefix};{node.name}" if prefix else node.name
+            covered = _covered(node)
+            weights[stack] += max(node.end - node.start - covered, 0) // 1000
+            for child in node.children:
+                _walk(child, stack)
+
+        for root in self._tree():
+            _walk(root, "")
+        return "".join(f"{stack} {weight}\n" for stack, weight in weights.items() if weight > 0)
+
+    def to_speedscope(self, name: str = "langdict") -> Dict[str, Any]:
+        """Evented speedscope profile.
+
+        Children that overlap an earlier sibling (parallel calls) are drawn
+        in extra lanes ("parallel N"), under copies of their ancestors.
+        """
+        frames: List[Dict[str, str]] = []
+        frame_index: Dict[str, int] = {}
+        lanes = [_Lane()]
+
+        def _frame(frame_name: str) -> int:
+            if frame_name not in frame_index:
+                frame_index[frame_name] = len(frames)
+                frames.append({"name": frame_name})
+            return frame_index[frame_name]
+
+        def _event(lane: _Lane, type: str, node_name: str, at: int) -> None:
+            lane.events.append({"type": type, "frame": _frame(node_name), "at": at})
+            lane.last_at = at
+            lane.depth += 1 if type == "O" else -1
+
+        def _free_lane(start: int) -> _Lane:
+            for lane in lanes[1:]:
+                if lane.depth == 0 and lane.last_at <= start:
+                    return lane
+            lane = _Lane()
+            lanes.append(lane)
+            return lane
+
+        def _place(node: _Node, lane: _Lane, ancestors: List[_Node]) -> None:
+            _event(lane, "O", node.name, node.start)
+            cursor = node.start
+            for child in sorted(node.children, key=lambda n: n.start):
+                if child.start >= cursor:
+                    _place(child, lane, ancestors + [node])
+                    cursor = lane.last_at
+                else:
+                    other = _free_lane(child.start)
+                    path = ancestors + [node]
+                    for ancestor in path:
+                        _event(other, "O", ancestor.name, child.start)
+                    _place(child, other, path)
+                    for ancestor in reversed(path):
+                        _event(other, "C", ancestor.name, other.last_at)
+            _event(lane, "C", node.name, max(node.end, cursor))
+
+        roots = sorted(self._tree(), key=lambda n: n.start)
+        for root in roots:
+            lane = lanes[0] if lanes[0].last_at <= root.start else _free_lane(root.start)
+            _place(root, lane, [])
+
+        start = min((root.start for root in roots), default=0)
+        profiles = []
+        for i, lane in enumerate(lanes):
+            if not lane.events:
+                continue
+            profiles.append({
+                "type": "evented",
+                "name": name if i == 0 else f"{name} (parallel {i})",
+                "unit": "nanoseconds",
+                "startValue": start,
+                "endValue": max(event["at"] for event in lane.events),
+                "events": lane.events,
+            })
+
+        return {
+            "$schema": "https://www.speedscope.app/file-format-schema.json",
+            "shared": {"frames": frames},
+            "profiles": profiles,
+            "name": name,
+            "exporter": "langdict",
+        }
+
+    def save(self, path: str, format: Optional[str] = None) -> None:
+        """Write the profile.
+
+        Args:
+            path: output file.
+            format: 'speedscope' or 'collapsed'. if None, 'collapsed' for
+                paths ending with '.collapsed' / '.folded' / '.txt',
+                'speedscope' otherwise.
+        """
+        if format is None:
+            collapsed = path.endswith((".collapsed", ".folded", ".txt"))
+            format = "collapsed" if collapsed else "speedscope"
+
+        with open(path, "w", encoding="utf-8") as f:
+            if format == "collapsed":
+                f.write(self.to_collapsed())
+            elif format == "speedscope":
+                json.dump(self.to_speedscope(), f)
+            else:
+                raise ValueError(f"Invalid profile format: {format}")
+
+
+@contextmanager
+def profile() -> Iterator[Profiler]:
+    """Profile the Module calls made inside the block (see `Profiler`)."""
+    with record_spans() as recorder:
+        yield Profiler(recorder)
+
+
+def _frame_name(span: Span) -> str:
+    if span.kind == "client":
+        model = span.attributes.get("gen_ai.request.model")
+        return f"network ({model})" if model else "network"
+    return span.name
+
+
+def _covered(node: _Node) -> int:
+    """Time of the node covered by its children (overlaps counted once)."""
+    covered = 0
+    cursor = node.start
+    for child in sorted(node.children, key=lambda n: n.start):
+        start = max(child.start, cursor)
+        end = min(child.end, node.end)
+        if end > start:
+            covered += end - start
+            cursor = end
+    return covered
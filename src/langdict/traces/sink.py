@@ -0,0 +1,173 @@
+import atexit
+import json
+import random
+import sys
+import threading
+from collections import deque
+from typing import Any, Deque, Dict, List, Optional, TextIO
+
+
+class TraceSink:
+    """Bounded buffer of span records, written as JSONL by a background thread.
+
+    Handlers only append records to the buffer; serialization, payload
+    truncation and I/O happen on the drain thread. Records that arrive
+    while the buffer is full are dropped and counted in `dropped`.
+
+    Example::
+
+        from langdict.traces import configure_sink
+
+        configure_sink(path="traces.jsonl", sample_rate=0.1, max_payload_chars=500)
+        rag.trace(backend="buffered")
+
+    Args:
+        path: JSONL file to append to. if None, write to stdout.
+        capacity: maximum number of buffered records.
+        max_payload_chars: inputs / outputs longer than this (as JSON) are
+            truncated. if None, payloads are written in full.
+        sample_rate: probability that a trace is recorded. The decision
+            is made once per trace, at its root run (head sampling).
+        flush_interval: seconds between drains of the buffer.
+    """
+
+    PAYLOAD_FIELDS = ("inputs", "outputs")
+
+    def __init__(
+        self,
+        path: Optional[str] = None,
+        capacity: int = 10000,
+        max_payload_chars: Optional[int] = 2000,
+        sample_rate: float = 1.0,
+        flush_interval: float = 0.5,
+    ):
+        if capacity <= 0:
+            raise ValueError("capacity must be positive.")
+        if not 0.0 <= sample_rate <= 1.0:
+            raise ValueError("sample_rate must be between 0 and 1.")
+
+        self.path = path
+        self.capacity = capacity
+        self.max_payload_chars = max_payload_chars
+        self.sample_rate = sample_rate
+        self.flush_interval = flush_interval
+        self.dropped = 0
+        self.written = 0
+
+        self._buffer: Deque[Dict[str, Any]] = deque()
+        self._lock = threading.Lock()
+        self._write_lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._closed = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._file: Optional[TextIO] = None
+
+    def sample(self) -> bool:
+        """Whether a new trace is recorded."""
+        return self.sample_rate >= 1.0 or random.random() < self.sample_rate
+
+    def emit(self, record: Dict[str, Any]) -> bool:
+        """Buffer a record. Returns False if it was dropped."""
+        with self._lock:
+            if len(self._buffer) >= self.capacity:
+                self.dropped += 1
+                return False
+            self._buffer.append(record)
+            size = len(self._buffer)
+
+        if self._thread is None:
+            self._start()
+        if size * 2 >= self.capacity:
+            self._wakeup.set()
+        return True
+
+    def flush(self) -> None:
+        """Write all buffered records now."""
+        with self._lock:
+            records = list(self._buffer)
+            self._buffer.clear()
+        if records:
+            self._write(records)
+
+    def close(self) -> None:
+        """Stop the drain thread and write the remaining records."""
+        self._closed.set()
+        self._wakeup.set()
+        if self._thread is not None and self._thread is not threading.current_thread():
+            self._thread.join()
+        self.flush()
+        with self._write_lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+    def _start(self) -> None:
+        with self._lock:
+            if self._thread is not None:
+                return
+            self._thread = threading.Thread(
+                target=self._run, name="langdict-trace-sink", daemon=True
+            )
+            self._thread.start()
+        atexit.register(self.close)
+
+    def _run(self) -> None:
+        while not self._closed.is_set():
+            self._wakeup.wait(self.flush_interval)
+            self._wakeup.clear()
+            try:
+                self.flush()
+            except Exception as e:  # noqa: BLE001
+                # Tracing must never take the application down.
+                print(f"langdict: failed to write traces: {e}", file=sys.stderr)  # noqa: T201
+
+    def _write(self, records: List[Dict[str, Any]]) -> None:
+        lines = "".join(self._dumps(record) + "\n" for record in records)
+        with self._write_lock:
+            if self.path is None:
+                sys.stdout.write(lines)
+                sys.stdout.flush()
+            else:
+                if self._file is None:
+                    self._file = open(self.path, "a", encoding="utf-8")
+                self._file.write(lines)
+                self._file.flush()
+            self.written += len(records)
+
+    def _dumps(self, record: Dict[str, Any]) -> str:
+        for field in self.PAYLOAD_FIELDS:
+            if field in record:
+                record[field] = self._truncate(record[field])
+        return json.dumps(record, default=str, ensure_ascii=False)
+
+    def _truncate(self, payload: Any) -> Any:
+        if self.max_payload_chars is None:
+            return payload
+        text = json.dumps(payload, default=str, ensure_ascii=False)
+        if len(text) <= self.max_payload_chars:
+            return payload
+        return text[:self.max_payload_chars] + f"...[{len(text)} chars]"
+
+
+_sink: Optional[TraceSink] = None
+_sink_lock = threading.Lock()
+
+
+def get_sink() -> TraceSink:
+    """Sink of the 'buffered' trace backend (stdout, unless configured)."""
+    global _sink
+    if _sink is None:
+        with _sink_lock:
+            if _sink is None:
+                _sink = TraceSink()
+    return _sink
+
+
+def configure_sink(**kwargs: Any) -> TraceSink:
+    """Replace the sink of the 'buffered' trace backend (see `TraceSink`)."""
+    global _sink
+    with _sink_lock:
+        previous, _sink = _sink, TraceSink(**kwargs)
+    if previous is not None:
+        previous.close()
+    return _sink
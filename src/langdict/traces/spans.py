@@ -0,0 +1,262 @@
+"""Nested spans of Module / LLM calls, exportable as OTLP JSON."""
+
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Dict, Iterator, List, Optional
+
+
+_recorder: ContextVar[Optional["SpanRecorder"]] = ContextVar(
+    "langdict_span_recorder", default=None
+)
+_current_span: ContextVar[Optional["Span"]] = ContextVar(
+    "langdict_current_span", default=None
+)
+
+# OTLP SpanKind
+_KINDS = {"internal": 1, "server": 2, "client": 3}
+
+
+class Span:
+    """A timed operation (Module call, LLM request) in a trace."""
+
+    __slots__ = (
+        "name",
+        "kind",
+        "trace_id",
+        "span_id",
+        "parent_id",
+        "start_ns",
+        "end_ns",
+        "attributes",
+        "error",
+        "_recorder",
+    )
+
+    def __init__(
+        self,
+        name: str,
+        kind: str,
+        recorder: "SpanRecorder",
+        parent: Optional["Span"] = None,
+        attributes: Optional[Dict[str, Any]] = None,
+    ):
+        self.name = name
+        self.kind = kind
+        self.trace_id = parent.trace_id if parent is not None else os.urandom(16).hex()
+        self.span_id = os.urandom(8).hex()
+        self.parent_id = parent.span_id if parent is not None else None
+        self.start_ns = time.time_ns()
+        self.end_ns: Optional[int] = None
+        self.attributes: Dict[str, Any] = dict(attributes or {})
+        self.error: Optional[str] = None
+        self._recorder = recorder
+
+    @property
+    def duration(self) -> Optional[float]:
+        """Seconds, once the span has ended."""
+        if self.end_ns is None:
+            return None
+        return (self.end_ns - self.start_ns) / 1e9
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        if value is not None:
+            self.attributes[key] = value
+
+    def end(self, error: Optional[BaseException] = None) -> None:
+        if self.end_ns is not None:
+            return
+        self.end_ns = time.time_ns()
+        if error is not None:
+            self.error = repr(error)
+        self._recorder.add(self)
+
+    def to_otlp(self) -> Dict[str, Any]:
+        span = {
+            "traceId": self.trace_id,
+            "spanId": self.span_id,
+            "name": self.name,
+            "kind": _KINDS.get(self.kind, 1),
+            "startTimeUnixNano": str(self.start_ns),
+            "endTimeUnixNano": str(self.end_ns),
+            "attributes": [
+                {"key": key, "value": _otlp_value(value)}
+                for key, value in self.attributes.items()
+            ],
+            "status": {"code": 2, "message": self.error} if self.error else {"code": 1},
+        }
+        if self.parent_id:
+            span["parentSpanId"] = self.parent_id
+        return span
+
+
+class SpanRecorder:
+    """Finished spans of the calls made inside `record_spans()`.
+
+    Example::
+
+        from langdict.traces import record_spans
+
+        with record_spans() as recorder:
+            self_rag(inputs)
+
+        recorder.export("self_rag.otlp.json")
+        for span in recorder.critical_path():
+            print(span.name, span.duration)
+    """
+
+    def __init__(self, service_name: str = "langdict"):
+        self.service_name = service_name
+        self.spans: List[Span] = []
+        self._lock = threading.Lock()
+
+    def add(self, span: Span) -> None:
+        with self._lock:
+            self.spans.append(span)
+
+    def children(self, span: Optional[Span]) -> List[Span]:
+        parent_id = span.span_id if span is not None else None
+        return [s for s in self.spans if s.parent_id == parent_id]
+
+    def critical_path(self) -> List[Span]:
+        """Spans the end of the trace waited on, in the order they ran.
+
+        At every level the path ends with the child that finished last and
+        walks back through the children it waited on (each one ends before
+        the next starts), keeping the longest such chain. Children that run
+        in parallel with the chain do not delay their parent.
+        """
+        path: List[Span] = []
+
+        def _walk(spans: List[Span]) -> None:
+            for span in _longest_chain(spans):
+                path.append(span)
+                _walk(self.children(span))
+
+        _walk(self.children(None))
+        return path
+
+    def to_otlp(self) -> Dict[str, Any]:
+        """OTLP/JSON `ExportTraceServiceRequest` of the recorded spans."""
+        with self._lock:
+            spans = sorted(self.spans, key=lambda s: s.start_ns)
+        return {
+            "resourceSpans": [{
+                "resource": {
+                    "attributes": [
+                        {"key": "service.name", "value": {"stringValue": self.service_name}}
+                    ]
+                },
+                "scopeSpans": [{
+                    "scope": {"name": "langdict"},
+                    "spans": [span.to_otlp() for span in spans],
+                }],
+            }]
+        }
+
+    def export(self, path: str) -> None:
+        """Write the spans to an OTLP JSON file (e.g. for `otel-cli` or Jaeger)."""
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(self.to_otlp(), f)
+
+
+@contextmanager
+def record_spans(service_name: str = "langdict") -> Iterator[SpanRecorder]:
+    """Record spans of the Module and LLM calls made inside the block."""
+    recorder = SpanRecorder(service_name=service_name)
+    token = _recorder.set(recorder)
+    span_token = _current_span.set(None)
+    try:
+        yield recorder
+    finally:
+        _current_span.reset(span_token)
+        _recorder.reset(token)
+
+
+def current_span() -> Optional[Span]:
+    return _current_span.get()
+
+
+def recording() -> bool:
+    """Whether spans are recorded in the current context."""
+    return _recorder.get() is not None
+
+
+def start_span(
+    name: str,
+    kind: str = "internal",
+    attributes: Optional[Dict[str, Any]] = None,
+) -> Optional[Span]:
+    """Start a child of the current span. None if spans are not recorded."""
+    recorder = _recorder.get()
+    if recorder is None:
+        return None
+    return Span(name, kind, recorder, parent=_current_span.get(), attributes=attributes)
+
+
+@contextmanager
+def use_span(span: Optional[Span]) -> Iterator[Optional[Span]]:
+    """Make `span` the parent of the spans started inside the block."""
+    if span is None:
+        yield None
+        return
+
+    token = _current_span.set(span)
+    try:
+        yield span
+    finally:
+        try:
+            _current_span.reset(token)
+        except ValueError:
+            # Generator closed from another context (e.g. garbage collected).
+            pass
+
+
+@contextmanager
+def span(
+    name: str,
+    kind: str = "internal",
+    attributes: Optional[Dict[str, Any]] = None,
+) -> Iterator[Optional[Span]]:
+    """Record the block as a span (if spans are recorded)."""
+    current = start_span(name, kind=kind, attributes=attributes)
+    if current is None:
+        yield None
+        return
+
+    with use_span(current):
+        try:
+            yield current
+        except BaseException as e:
+            current.end(error=e)
+            raise
+        current.end()
+
+
+def _longest_chain(spans: List[Span]) -> List[Span]:
+    """Longest sequence of spans, each ending before the next starts,
+    that ends with the span finishing last."""
+    if not spans:
+        return []
+    spans = sorted(spans, key=lambda s: s.end_ns)
+    chains: Dict[str, Any] = {}
+    for i, span in enumerate(spans):
+        waited = [chains[p.span_id] for p in spans[:i] if p.end_ns <= span.start_ns]
+        total, chain = max(waited, key=lambda c: c[0], default=(0, []))
+        chains[span.span_id] = (total + span.end_ns - span.start_ns, chain + [span])
+    return chains[spans[-1].span_id][1]
+
+
+def _otlp_value(value: Any) -> Dict[str, Any]:
+    if isinstance(value, bool):
+        return {"boolValue": value}
+    if isinstance(value, int):
+        return {"intValue": str(value)}
+    if isinstance(value, float):
+        return {"doubleValue": value}
+    if isinstance(value, (list, tuple)):
+        return {"arrayValue": {"values": [_otlp_value(v) for v in value]}}
+    return {"stringValue": str(value)}
@@ -0,0 +1,86 @@
+
+import asyncio
+import time
+
+import pytest
+
+from langdict.builders import ChainBuilder
+
+
+class FakeLiteLLMClient:
+    """Stand-in for the `litellm` module used by ChatLiteLLM."""
+
+    def __init__(self, content: str = "Hello, LangDict!", latency: float = 0.0):
+        self.content = content
+        self.latency = latency
+        self.calls = []
+        self.chunks_sent = 0
+
+    def _response(self, kwargs):
+        return {
+            "model": kwargs["model"],
+            "choices": [{
+                "message": {"role": "assistant", "content": self.content},
+                "finish_reason": "stop",
+            }],
+            "usage": {"prompt_tokens": 10, "completion_tokens": 5, "total_tokens": 15},
+        }
+
+    def _chunks(self):
+        for i in range(0, len(self.content), 4):
+            self.chunks_sent += 1
+            last = i + 4 >= len(self.content)
+            yield {"choices": [{
+                "delta": {"content": self.content[i:i + 4]},
+                "finish_reason": "stop" if last else None,
+            }]}
+
+    def completion(self, **kwargs):
+        self.calls.append(kwargs)
+        if self.latency:
+            time.sleep(self.latency)
+        if kwargs.get("stream"):
+            return self._chunks()
+        return self._response(kwargs)
+
+    async def acompletion(self, **kwargs):
+        self.calls.append(kwargs)
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        if kwargs.get("stream"):
+            return self._achunks()
+        return self._response(kwargs)
+
+    async def _achunks(self):
+        for chunk in self._chunks():
+            yield chunk
+
+
+@pytest.fixture(autouse=True)
+def clear_chain_registry():
+    # Tests patch the (shared) LLM of their chains.
+    ChainBuilder.clear()
+    yield
+    ChainBuilder.clear()
+
+
+@pytest.fixture
+def fake_client():
+    return FakeLiteLLMClient()
+
+
+@pytest.fixture
+def chitchat_spec():
+    return {
+        "messages": [
+            ("system", "You are a helpful AI bot. Your name is {name}."),
+            ("human", "{user_input}"),
+        ],
+        "llm": {
+            "model": "gpt-4o-mini",
+            "temperature": 0,
+        },
+        "output": {
+            "type": "string"
+        }
+    }
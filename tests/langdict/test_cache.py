@@ -0,0 +1,71 @@
+
+import time
+
+from langdict import LangDict
+from langdict.caches import InMemoryCache, SQLiteCache, TieredCache, make_cache_key
+
+
+def test_cache_key_ignores_transport_params():
+    messages = [{"role": "user", "content": "Hi"}]
+    params = {"model": "gpt-4o-mini", "temperature": 0, "n": 1}
+
+    assert make_cache_key(messages, params) == make_cache_key(
+        messages, {**params, "stream": False, "api_base": "http://localhost"}
+    )
+    assert make_cache_key(messages, params) != make_cache_key(
+        messages, {**params, "max_tokens": 10}
+    )
+
+
+def test_in_memory_cache_lru_and_ttl():
+    cache = InMemoryCache(max_entries=2)
+    cache.set("a", {"v": 1})
+    cache.set("b", {"v": 2})
+    assert cache.lookup("a") == {"v": 1}
+    cache.set("c", {"v": 3})
+
+    assert cache.lookup("b") is None
+    assert cache.lookup("c") == {"v": 3}
+    assert cache.stats()["evictions"] == 1
+    assert cache.stats()["hits"] == 2
+
+    cache = InMemoryCache(max_bytes=20)
+    cache.set("a", {"v": "x" * 5})
+    cache.set("b", {"v": "y" * 5})
+    assert len(cache) == 1
+
+    cache = InMemoryCache(ttl=0.01)
+    cache.set("a", {"v": 1})
+    time.sleep(0.02)
+    assert cache.lookup("a") is None
+
+
+def test_tiered_cache_promotes_disk_hits(tmp_path):
+    path = str(tmp_path / "cache.db")
+    SQLiteCache(path=path).set("key", {"v": 1})
+
+    memory = InMemoryCache()
+    cache = TieredCache([memory, SQLiteCache(path=path)])
+    assert cache.lookup("key") == {"v": 1}
+    assert memory.get("key") == {"v": 1}
+    assert cache.stats()["tiers"][1]["hits"] == 1
+
+
+def test_langdict_cache(chitchat_spec, fake_client):
+    chitchat_spec["cache"] = {"type": "memory", "max_entries": 16}
+    chitchat = LangDict.from_dict(chitchat_spec).override_llm(client=fake_client)
+    llm = chitchat.chain.steps[1]
+
+    inputs = {"name": "LangDict", "user_input": "What is your name?"}
+    assert chitchat(inputs) == fake_client.content
+    assert chitchat(inputs) == fake_client.content
+    assert len(fake_client.calls) == 1
+    assert llm.response_cache.stats()["hits"] == 1
+    assert chitchat.as_dict()["cache"]["max_entries"] == 16
+
+    chitchat_spec["llm"]["temperature"] = 0.7
+    chitchat = LangDict.from_dict(chitchat_spec)
+    chitchat.override_llm(client=fake_client)
+    chitchat(inputs)
+    chitchat(inputs)
+    assert len(fake_client.calls) == 3
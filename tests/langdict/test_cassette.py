@@ -0,0 +1,31 @@
+
+import pytest
+
+from langdict import LangDict
+from langdict.chat_models import CassetteMissError, use_cassette
+
+
+class OfflineClient:
+
+    def completion(self, **kwargs):
+        raise AssertionError("network access during replay")
+
+
+def test_cassette_record_and_replay(tmp_path, chitchat_spec, fake_client):
+    path = str(tmp_path / "chitchat.jsonl.gz")
+    chitchat = LangDict.from_dict(chitchat_spec)
+    inputs = {"name": "LangDict", "user_input": "What is your name?"}
+
+    chitchat.override_llm(client=fake_client)
+    with use_cassette(path, mode="record") as cassette:
+        invoked = chitchat(inputs)
+        streamed = list(chitchat(inputs, stream=True))
+    assert len(cassette) == 2
+
+    chitchat.override_llm(client=OfflineClient())
+    with use_cassette(path, reproduce_latency=True):
+        assert chitchat(inputs) == invoked
+        assert list(chitchat(inputs, stream=True)) == streamed
+
+        with pytest.raises(CassetteMissError):
+            chitchat({"name": "LangDict", "user_input": "Not recorded"})
@@ -0,0 +1,144 @@
+import asyncio
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from langdict import LangDict, LangDictModule
+from langdict.chat_models import ClientPool
+
+
+INPUTS = {"name": "LangDict", "user_input": "What is your name?"}
+
+
+class OpenAIHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, *args):
+        pass
+
+    def _reply(self, body=b""):
+        self.server.connections.add(self.client_address)
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_HEAD(self):
+        self.server.heads += 1
+        self._reply()
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers["Content-Length"]))
+        self._reply(json.dumps({
+            "id": "chatcmpl-1",
+            "object": "chat.completion",
+            "created": 0,
+            "model": "gpt-4o-mini",
+            "choices": [{
+                "index": 0,
+                "message": {"role": "assistant", "content": "I am LangDict."},
+                "finish_reason": "stop",
+            }],
+            "usage": {"prompt_tokens": 10, "completion_tokens": 4, "total_tokens": 14},
+        }).encode())
+
+
+@pytest.fixture
+def server():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), OpenAIHandler)
+    server.connections = set()
+    server.heads = 0
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def _params(model="gpt-4o-mini", **kwargs):
+    return {"model": model, "api_key": "sk-test", **kwargs}
+
+
+def test_clients_are_keyed_by_deployment(monkeypatch):
+    monkeypatch.delenv("OPENAI_API_KEY", raising=False)
+    pool = ClientPool(max_connections=8, max_keepalive_connections=4)
+
+    client = pool.get(_params())
+    assert pool.get(_params(model="gpt-4o")) is client
+    assert pool.get(_params(api_base="http://localhost:8000/v1")) is not client
+    assert pool.get(_params(api_key="sk-other")) is not client
+    assert pool.get(_params(model="claude-3-5-sonnet-20240620")) is None
+    assert pool.get({"model": "gpt-4o-mini"}) is None
+    assert pool.stats()["clients"] == 3
+
+    assert client.max_retries == 0
+    assert client._client._transport._pool._max_connections == 8
+    pool.close()
+    assert pool.stats()["clients"] == 0
+
+
+def test_async_clients_are_closed_with_their_loop():
+    pool = ClientPool()
+
+    async def _run():
+        client = pool.aget(_params())
+        assert pool.aget(_params()) is client
+        assert pool.stats()["async_clients"] == 1
+        return client
+
+    clients = [asyncio.run(_run()) for _ in range(2)]
+    assert clients[0] is not clients[1]
+    assert all(client.is_closed() for client in clients)
+    assert pool.stats()["async_clients"] == 0
+
+    async def _close():
+        client = pool.aget(_params())
+        pool.close()
+        await asyncio.sleep(0)
+        assert client.is_closed()
+        assert pool.aget(_params()) is not client
+
+    asyncio.run(_close())
+    assert pool.stats()["created"] == 4
+
+
+def test_lang_dicts_share_llm_and_connections(chitchat_spec, server):
+    chitchat_spec["llm"].update({
+        "api_base": f"http://127.0.0.1:{server.server_port}/v1",
+        "api_key": "sk-test",
+    })
+    pool = ClientPool(http2=False)
+    first = LangDict.from_dict(chitchat_spec)
+    chitchat_spec["messages"][0] = ("system", "You are {name}.")
+    second = LangDictModule(LangDict.from_dict(chitchat_spec))
+    assert first.compiled.llm is second.lang_dict.compiled.llm
+
+    first.override_llm(client_pool=pool)
+    second.lang_dict.override_llm(client_pool=pool)
+    assert pool.warmup(first, second) == 1
+    assert server.heads == 1
+
+    for _ in range(3):
+        assert first(INPUTS) == "I am LangDict."
+        assert second(INPUTS) == "I am LangDict."
+    assert len(server.connections) == 1
+    assert pool.stats()["created"] == 1
+    pool.close()
+
+
+def test_warmup_ignores_unreachable_deployments(chitchat_spec):
+    chitchat_spec["llm"].update({"api_base": "http://127.0.0.1:9/v1", "api_key": "sk-test"})
+    lang_dict = LangDict.from_dict(chitchat_spec)
+
+    assert ClientPool().warmup(lang_dict, timeout=0.5) == 0
+
+
+def test_pool_is_not_used_with_providers(chitchat_spec, fake_client):
+    chitchat = LangDict.from_dict(chitchat_spec)
+    chitchat.override_llm(client=fake_client)
+
+    assert chitchat(INPUTS) == fake_client.content
+    assert "client" not in fake_client.calls[0]
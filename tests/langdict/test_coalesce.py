@@ -0,0 +1,82 @@
+
+import asyncio
+import copy
+from concurrent.futures import ThreadPoolExecutor
+
+from langdict import LangDict
+from langdict.chat_models import SingleFlight
+
+
+def test_coalesce_concurrent_requests(chitchat_spec, fake_client):
+    fake_client.latency = 0.2
+    chitchat_spec["llm"]["coalesce"] = True
+    chitchat = LangDict.from_dict(chitchat_spec)
+    chitchat.override_llm(client=fake_client)
+
+    chitchat({"name": "LangDict", "user_input": "Warm up"})
+
+    inputs = {"name": "LangDict", "user_input": "What is your name?"}
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        results = list(executor.map(lambda _: chitchat(inputs), range(8)))
+
+    assert results == [fake_client.content] * 8
+    assert len(fake_client.calls) == 2
+
+
+def test_coalesce_batch_duplicates(chitchat_spec, fake_client):
+    chitchat_spec["llm"]["coalesce"] = True
+    chitchat = LangDict.from_dict(chitchat_spec)
+    chitchat.override_llm(client=fake_client)
+
+    inputs = [
+        {"name": "LangDict", "user_input": "A"},
+        {"name": "LangDict", "user_input": "B"},
+        {"name": "LangDict", "user_input": "A"},
+    ]
+    assert chitchat(inputs, batch=True) == [fake_client.content] * 3
+    assert len(fake_client.calls) == 2
+
+
+def test_coalesce_keeps_deployments_apart(chitchat_spec, fake_client):
+    fake_client.latency = 0.2
+    chitchat_spec["llm"]["coalesce"] = True
+    lang_dicts = []
+    for api_base in ["http://coalesce-a/v1", "http://coalesce-b/v1"]:
+        spec = copy.deepcopy(chitchat_spec)
+        spec["llm"]["api_base"] = api_base
+        lang_dict = LangDict.from_dict(spec)
+        lang_dict.override_llm(client=fake_client)
+        lang_dicts.append(lang_dict)
+
+    inputs = {"name": "LangDict", "user_input": "What is your name?"}
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        results = list(executor.map(lambda lang_dict: lang_dict(inputs), lang_dicts))
+
+    assert results == [fake_client.content] * 2
+    assert sorted(call["api_base"] for call in fake_client.calls) == [
+        "http://coalesce-a/v1", "http://coalesce-b/v1"
+    ]
+
+
+def test_cancelled_leader_hands_over_to_a_follower():
+    group = SingleFlight()
+    calls = []
+
+    async def fn():
+        calls.append(1)
+        await asyncio.sleep(0.05)
+        return "response"
+
+    async def _run():
+        leader = asyncio.ensure_future(group.ado("key", fn))
+        await asyncio.sleep(0)
+        followers = [asyncio.ensure_future(group.ado("key", fn)) for _ in range(3)]
+        await asyncio.sleep(0.01)
+        leader.cancel()
+        return leader, await asyncio.gather(*followers)
+
+    leader, results = asyncio.run(_run())
+    assert leader.cancelled()
+    assert results == ["response"] * 3
+    assert len(calls) == 2
+    assert group.stats() == {"calls": 4, "coalesced": 2, "in_flight": 0}
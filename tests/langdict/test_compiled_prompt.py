@@ -0,0 +1,61 @@
+
+import pytest
+
+from langdict import LangDict
+from langdict.chat_models.litellm import _convert_message_to_dict
+
+
+def _langchain_render(lang_dict, inputs):
+    prompt_value = lang_dict.compiled.prompt.invoke(inputs)
+    return [_convert_message_to_dict(m) for m in prompt_value.to_messages()]
+
+
+@pytest.mark.parametrize("spec, inputs", [
+    (
+        {
+            "messages": [
+                ("system", "You are a helpful AI bot. Your name is {name}."),
+                ("human", "Hello, how are you doing?"),
+                ("ai", "I'm doing well, thanks! {{escaped}}"),
+                ("human", "{user_input} ({count})"),
+            ],
+        },
+        {"name": "LangDict", "user_input": "What is your name?", "count": 3},
+    ),
+    (
+        {"text": "Answer in JSON like {{\"answer\": ...}}: {question}"},
+        {"question": "Why is the sky blue?"},
+    ),
+    (
+        {
+            "messages": [
+                ("system", "Static system prompt."),
+                ("placeholder", "{conversation}"),
+            ],
+        },
+        {
+            "conversation": [
+                ("human", "Hi"),
+                ("ai", "Hello!"),
+                {"role": "user", "content": "How are you?"},
+                "Plain string",
+            ],
+        },
+    ),
+    (
+        {"messages": [("system", "Static."), ("placeholder", "{conversation}")]},
+        {},
+    ),
+])
+def test_compiled_prompt_matches_langchain(spec, inputs):
+    lang_dict = LangDict.from_dict({**spec, "llm": {}, "output": {}})
+
+    assert lang_dict.render(inputs) == _langchain_render(lang_dict, inputs)
+    assert lang_dict.render([inputs, inputs]) == [_langchain_render(lang_dict, inputs)] * 2
+
+
+def test_compiled_prompt_missing_variable(chitchat_spec):
+    lang_dict = LangDict.from_dict(chitchat_spec)
+
+    with pytest.raises(KeyError):
+        lang_dict.render({"name": "LangDict"})
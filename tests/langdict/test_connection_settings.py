@@ -0,0 +1,45 @@
+import json
+from concurrent.futures import ThreadPoolExecutor
+
+from langdict import LangDict
+
+
+INPUTS = {"name": "LangDict", "user_input": "What is your name?"}
+
+
+def test_connection_settings_are_per_call(chitchat_spec, fake_client):
+    class FrozenClient:
+        """Fails if connection settings are set on the (shared) client."""
+
+        def __setattr__(self, name, value):
+            raise AssertionError(f"client.{name} was set")
+
+        def completion(self, **kwargs):
+            return fake_client.completion(**kwargs)
+
+    client = FrozenClient()
+    deployments = []
+    for i in range(2):
+        spec = json.loads(json.dumps(chitchat_spec))
+        spec["llm"].update({
+            "api_base": f"https://deployment-{i}.example.com",
+            "api_key": f"key-{i}",
+            "organization": f"org-{i}",
+            "timeout": 5,
+        })
+        lang_dict = LangDict.from_dict(spec)
+        lang_dict.override_llm(client=client)
+        deployments.append(lang_dict)
+
+    def _run(lang_dict):
+        return lang_dict([INPUTS] * 4, batch=True)
+
+    with ThreadPoolExecutor() as executor:
+        list(executor.map(_run, deployments * 4))
+
+    assert len(fake_client.calls) == 32
+    for call in fake_client.calls:
+        i = call["api_base"].split(".")[0].rsplit("-", 1)[1]
+        assert call["api_key"] == f"key-{i}"
+        assert call["organization"] == f"org-{i}"
+        assert call["timeout"] == 5
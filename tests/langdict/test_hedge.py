@@ -0,0 +1,160 @@
+import asyncio
+import time
+
+import pytest
+
+from langdict import LangDict
+from langdict.chat_models import Hedger
+from langdict.metrics import metrics
+
+
+INPUTS = {"name": "LangDict", "user_input": "What is your name?"}
+
+
+class SlowFirstClient:
+    """The first request is slow; the following ones are fast."""
+
+    def __init__(self, fake_client, slow=0.5):
+        self.fake_client = fake_client
+        self.slow = slow
+        self.models = []
+        self.calls = []
+        self.cancelled = 0
+
+    def completion(self, **kwargs):
+        self.models.append(kwargs["model"])
+        self.calls.append(kwargs)
+        if len(self.models) == 1:
+            time.sleep(self.slow)
+        return self.fake_client.completion(**kwargs)
+
+    async def acompletion(self, **kwargs):
+        self.models.append(kwargs["model"])
+        if len(self.models) == 1:
+            try:
+                await asyncio.sleep(self.slow)
+            except asyncio.CancelledError:
+                self.cancelled += 1
+                raise
+        return await self.fake_client.acompletion(**kwargs)
+
+
+@pytest.fixture
+def fresh_metrics():
+    metrics.reset()
+    yield metrics
+    metrics.reset()
+
+
+def _lang_dict(spec, client, **hedge):
+    spec["llm"]["hedge"] = {"delay": 0.05, **hedge}
+    lang_dict = LangDict.from_dict(spec)
+    lang_dict.override_llm(client=client)
+    return lang_dict
+
+
+@pytest.mark.parametrize("stream", [False, True])
+def test_hedge_wins_over_slow_request(chitchat_spec, fake_client, fresh_metrics, stream):
+    client = SlowFirstClient(fake_client)
+    chitchat = _lang_dict(chitchat_spec, client, model="gpt-4o")
+
+    start = time.perf_counter()
+    if stream:
+        output = "".join(chitchat(INPUTS, stream=True))
+    else:
+        output = chitchat(INPUTS)
+
+    assert output == fake_client.content
+    assert time.perf_counter() - start < 0.4
+    assert client.models == ["gpt-4o-mini", "gpt-4o"]
+    hedger = chitchat.chain.steps[1].hedger
+    assert hedger.stats()["hedged"] == hedger.stats()["hedge_wins"] == 1
+    assert fresh_metrics.counter("hedged") == fresh_metrics.counter("hedge_wins") == 1
+
+
+def test_hedge_to_another_deployment_uses_its_credentials(chitchat_spec, fake_client):
+    chitchat_spec["llm"].update({
+        "api_base": "http://primary/v1", "api_key": "sk-primary", "organization": "org-primary",
+    })
+    client = SlowFirstClient(fake_client)
+    chitchat = _lang_dict(chitchat_spec, client, api_base="http://secondary/v1", api_key="sk-secondary")
+
+    assert chitchat(INPUTS) == fake_client.content
+    primary, hedge = client.calls
+    assert (primary["api_key"], primary["organization"]) == ("sk-primary", "org-primary")
+    assert hedge["api_base"] == "http://secondary/v1"
+    assert hedge["api_key"] == "sk-secondary"
+    assert "organization" not in hedge
+
+
+def test_async_hedge_cancels_the_loser(chitchat_spec, fake_client):
+    client = SlowFirstClient(fake_client)
+    chitchat = _lang_dict(chitchat_spec, client)
+
+    start = time.perf_counter()
+    assert asyncio.run(chitchat.acall(INPUTS)) == fake_client.content
+    assert time.perf_counter() - start < 0.4
+    assert client.cancelled == 1
+
+
+def test_fast_requests_are_not_hedged(chitchat_spec, fake_client):
+    chitchat = _lang_dict(chitchat_spec, fake_client, delay=1.0)
+
+    assert chitchat([INPUTS] * 4, batch=True) == [fake_client.content] * 4
+    assert len(fake_client.calls) == 4
+    assert chitchat.chain.steps[1].hedger.stats()["hedged"] == 0
+
+
+def test_hedge_timer_starts_when_the_request_is_sent():
+    hedger = Hedger(delay=0.05)
+    calls = []
+
+    def fn(on_send, **kwargs):
+        calls.append(kwargs)
+        time.sleep(0.2)  # queued in the rate limiter
+        on_send()
+        return "response"
+
+    async def afn(on_send, **kwargs):
+        calls.append(kwargs)
+        await asyncio.sleep(0.2)
+        on_send()
+        return "response"
+
+    assert hedger.call(fn, {"model": "gpt-4o-mini"}) == "response"
+    assert asyncio.run(hedger.acall(afn, {"model": "gpt-4o-mini"})) == "response"
+    assert len(calls) == 2
+    assert hedger.stats()["hedged"] == 0
+    assert hedger.latency.max < 0.1
+
+
+def test_hedges_in_flight_are_capped(fresh_metrics):
+    hedger = Hedger(delay=0.05, max_in_flight=1, model="hedge")
+
+    async def afn(on_send, **kwargs):
+        on_send()
+        await asyncio.sleep(0.1 if kwargs["model"] == "hedge" else 0.3)
+        return kwargs["model"]
+
+    async def _run():
+        return await asyncio.gather(*[
+            hedger.acall(afn, {"model": "gpt-4o-mini"}) for _ in range(2)
+        ])
+
+    assert sorted(asyncio.run(_run())) == ["gpt-4o-mini", "hedge"]
+    stats = hedger.stats()
+    assert stats["hedged"] == stats["skipped"] == 1
+    assert stats["in_flight"] == 0
+    assert fresh_metrics.counter("hedges_skipped") == 1
+
+
+def test_hedge_delay_follows_percentile():
+    hedger = Hedger(percentile=90, initial_delay=2.0, min_samples=10, min_delay=0.01)
+    assert hedger.delay() == 2.0
+
+    for latency in [0.1] * 9 + [1.0]:
+        hedger.latency.observe(latency)
+    assert 0.09 <= hedger.delay() <= 0.12
+
+    with pytest.raises(ValueError):
+        Hedger(percentile=100)
@@ -0,0 +1,58 @@
+
+import os
+import subprocess
+import sys
+
+import langdict
+
+
+# Budget of `import langdict` in milliseconds (override with LANGDICT_IMPORT_BUDGET_MS).
+IMPORT_BUDGET_MS = float(os.environ.get("LANGDICT_IMPORT_BUDGET_MS", 50))
+
+
+def _run(code: str, *args: str) -> subprocess.CompletedProcess:
+    src = os.path.dirname(os.path.dirname(os.path.abspath(langdict.__file__)))
+    env = {**os.environ, "PYTHONPATH": src}
+    return subprocess.run(
+        [sys.executable, *args, "-c", code],
+        capture_output=True,
+        text=True,
+        env=env,
+        check=True,
+    )
+
+
+def _cumulative_import_time_us(stderr: str, module: str) -> int:
+    """Parse `python -X importtime` output: "import time: self | cumulative | name"."""
+    for line in stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        if name.strip() == module and cumulative.strip().isdigit():
+            return int(cumulative)
+    raise AssertionError(f"{module} not found in importtime output")
+
+
+def test_import_time_budget():
+    result = _run("import langdict", "-X", "importtime")
+    elapsed_ms = _cumulative_import_time_us(result.stderr, "langdict") / 1000
+
+    assert elapsed_ms < IMPORT_BUDGET_MS, (
+        f"`import langdict` took {elapsed_ms:.1f}ms (budget: {IMPORT_BUDGET_MS}ms)"
+    )
+
+
+def test_import_is_lazy():
+    result = _run(
+        "import sys\n"
+        "import langdict\n"
+        "heavy = ['langchain_core', 'litellm', 'langdict.langdict', 'langdict.modules.rags']\n"
+        "print(','.join(m for m in heavy if m in sys.modules))\n"
+        "from langdict import LangDict\n"
+        "LangDict.from_dict({'messages': [('human', '{x}')], 'llm': {}, 'output': {}})\n"
+        "print('litellm' in sys.modules)\n"
+    )
+    loaded, litellm_loaded = result.stdout.splitlines()
+
+    assert loaded == ""
+    assert litellm_loaded == "False"
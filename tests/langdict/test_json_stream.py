@@ -0,0 +1,149 @@
+
+import asyncio
+import json
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from langdict import LangDict
+from langdict.parsers import JsonStreamError, JsonStreamParser
+
+
+DOCUMENT = {
+    "need_retrieval": "Yes",
+    "score": -1.5e3,
+    "valid": True,
+    "source": None,
+    "explanation": "a \"quoted\" \\ line\nnew é 😀 end",
+    "nested": {"a": [1, 2, {"b": []}], "c": {}},
+}
+
+
+@pytest.mark.parametrize("ensure_ascii", [True, False])
+@pytest.mark.parametrize("chunk_size", [1, 3, 7, 1000])
+def test_json_stream_parser(ensure_ascii, chunk_size):
+    text = "```json\n" + json.dumps(DOCUMENT, indent=2, ensure_ascii=ensure_ascii) + "\n```"
+
+    parser = JsonStreamParser()
+    events = []
+    for i in range(0, len(text), chunk_size):
+        events.extend(parser.feed(text[i:i + chunk_size]))
+    events.extend(parser.close())
+
+    assert events[-1].type == "end"
+    assert events[-1].value == DOCUMENT
+    assert [(e.key, e.value) for e in events if e.type == "key"] == list(DOCUMENT.items())
+
+    partials = [e.value for e in events if e.type == "partial"]
+    assert partials[-1] == DOCUMENT
+    if chunk_size == 1:
+        assert {"need_retrieval": "Y"} in partials
+
+
+def test_json_stream_parser_errors():
+    parser = JsonStreamParser()
+    parser.feed('{"a": 1')
+    with pytest.raises(JsonStreamError):
+        parser.close()
+
+    with pytest.raises(JsonStreamError):
+        JsonStreamParser().feed('{"a" 1}')
+
+
+@pytest.mark.parametrize("engine", ["runnable", "lean"])
+def test_langdict_stream_events(chitchat_spec, fake_client, engine):
+    fake_client.content = json.dumps({"need_retrieval": "Yes", "explanation": "x" * 40})
+    chitchat_spec["output"]["type"] = "json"
+    critic = LangDict.from_dict(chitchat_spec, engine=engine)
+    critic.override_llm(client=fake_client)
+    inputs = {"name": "LangDict", "user_input": "What is your name?"}
+
+    events = list(critic(inputs, stream=True, stream_mode="events"))
+    first_key = next(i for i, e in enumerate(events) if e.type == "key")
+    assert events[first_key].key == "need_retrieval"
+    assert first_key < len(events) // 2
+    assert events[-1].value == critic(inputs)
+
+    async def _collect():
+        return [e async for e in await critic.acall(inputs, stream=True, stream_mode="events")]
+
+    assert asyncio.run(_collect()) == events
+
+
+def test_stream_events_requires_json(chitchat_spec):
+    chitchat = LangDict.from_dict(chitchat_spec)
+
+    with pytest.raises(ValueError):
+        list(chitchat({"name": "LangDict", "user_input": "Hi"}, stream=True, stream_mode="events"))
+
+
+@pytest.mark.parametrize("engine", ["runnable", "lean"])
+def test_required_keys_stop_the_stream(chitchat_spec, fake_client, engine):
+    fake_client.content = json.dumps({"rating": "[Relevant]", "explanation": "x" * 400})
+    chitchat_spec["output"] = {"type": "json", "required_keys": ["rating"]}
+    critic = LangDict.from_dict(chitchat_spec, engine=engine)
+    critic.override_llm(client=fake_client)
+    inputs = {"name": "LangDict", "user_input": "Is it relevant?"}
+
+    assert critic(inputs) == {"rating": "[Relevant]"}
+    assert fake_client.calls[-1]["stream"] is True
+    assert fake_client.chunks_sent < 10
+
+    assert list(critic(inputs, stream=True))[-1] == {"rating": "[Relevant]"}
+    assert critic([inputs, inputs], batch=True) == [{"rating": "[Relevant]"}] * 2
+    assert asyncio.run(critic.acall(inputs)) == {"rating": "[Relevant]"}
+    assert fake_client.chunks_sent < 50
+
+
+def test_required_keys_share_cached_and_coalesced_responses(chitchat_spec, fake_client):
+    fake_client.content = json.dumps({"rating": "[Relevant]", "explanation": "x" * 400})
+    fake_client.latency = 0.1
+    chitchat_spec["llm"]["coalesce"] = True
+    chitchat_spec["cache"] = {"type": "memory"}
+    chitchat_spec["output"] = {"type": "json", "required_keys": ["rating"]}
+    critic = LangDict.from_dict(chitchat_spec)
+    critic.override_llm(client=fake_client)
+    inputs = {"name": "LangDict", "user_input": "Is it relevant?"}
+
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        results = list(executor.map(lambda _: critic(inputs), range(4)))
+    assert results == [{"rating": "[Relevant]"}] * 4
+    assert len(fake_client.calls) == 1
+    assert fake_client.chunks_sent < 10
+
+    assert critic(inputs) == {"rating": "[Relevant]"}
+    assert asyncio.run(critic.acall(inputs)) == {"rating": "[Relevant]"}
+    assert len(fake_client.calls) == 1
+    cache = critic.chain.steps[1].response_cache
+    assert cache.hits == 2
+
+    # a prefix is never served as the full response
+    chitchat_spec["output"] = {"type": "json"}
+    full = LangDict.from_dict(chitchat_spec)
+    full.override_llm(client=fake_client)
+    assert full(inputs)["explanation"] == "x" * 400
+
+
+@pytest.mark.parametrize("cache", [False, True])
+def test_required_keys_missing_from_shared_response(chitchat_spec, fake_client, cache):
+    fake_client.content = json.dumps({"other": 2})
+    if cache:
+        chitchat_spec["cache"] = {"type": "memory"}
+    else:
+        chitchat_spec["llm"]["coalesce"] = True
+    chitchat_spec["output"] = {"type": "json", "required_keys": ["need"]}
+    critic = LangDict.from_dict(chitchat_spec)
+    critic.override_llm(client=fake_client)
+    if cache:
+        critic.chain.steps[1].response_cache.clear()
+    inputs = {"name": "LangDict", "user_input": "Is it relevant?"}
+
+    assert critic(inputs) == {"other": 2}
+    assert asyncio.run(critic.acall(inputs)) == {"other": 2}
+
+
+def test_required_keys_validation():
+    with pytest.raises(ValueError):
+        LangDict.from_dict({
+            "text": "{x}", "llm": {}, "output": {"type": "string", "required_keys": ["a"]}
+        })
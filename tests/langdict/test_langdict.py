@@ -1,5 +1,11 @@
 
+import pytest
+
 from langdict import LangDict
+from langdict.builders import ChainBuilder, LiteLLMBuilder
+
+
+INPUTS = {"name": "LangDict", "user_input": "What is your name?"}
 
 
 def test_langdict_dict():
@@ -25,3 +31,50 @@ def test_langdict_dict():
     for key in ["llm", "output"]:
         for k, v in chitchat_spec[key].items():
             assert chitchat.as_dict()[key][k] == v
+
+
+def test_langdict_shared_chain():
+    spec = {
+        "messages": [
+            ("system", "You are a helpful AI bot. Your name is {name}."),
+            ("human", "{user_input}"),
+        ],
+        "llm": {
+            "model": "gpt-4o-mini",
+        },
+        "output": {
+            "type": "string"
+        }
+    }
+
+    first = LangDict.from_dict(spec)
+    second = LangDict.from_dict(spec)
+    assert first.chain is second.chain
+
+    spec["llm"]["max_tokens"] = 100
+    third = LangDict.from_dict(spec)
+    assert third.chain is not first.chain
+
+    stats = ChainBuilder.stats()
+    assert stats["hits"] >= 1
+    assert stats["build_time"] > 0
+
+
+def test_shared_llm_is_frozen(chitchat_spec, fake_client, monkeypatch):
+    first = LangDict.from_dict(chitchat_spec)
+    second = LangDict.from_dict(chitchat_spec)
+    llm = first.compiled.llm
+
+    with pytest.raises(AttributeError):
+        llm.client = fake_client
+
+    first.override_llm(client=fake_client)
+    assert first(INPUTS) == fake_client.content
+    assert first.chain.steps[1].client is fake_client
+    assert second.compiled.llm is llm and llm.client is None
+    assert second.chain is not first.chain
+
+    monkeypatch.setattr(LiteLLMBuilder, "max_size", 1)
+    chitchat_spec["llm"]["max_tokens"] = 100
+    LangDict.from_dict(chitchat_spec)
+    assert len(LiteLLMBuilder._llms) == 1
@@ -0,0 +1,51 @@
+
+import asyncio
+
+from langdict import LangDict
+
+
+def _langdict(spec, client):
+    langdict = LangDict.from_dict(spec)
+    langdict.override_llm(client=client)
+    return langdict
+
+
+def test_langdict_acall(chitchat_spec, fake_client):
+    chitchat = _langdict(chitchat_spec, fake_client)
+    inputs = {"name": "LangDict", "user_input": "What is your name?"}
+
+    result = asyncio.run(chitchat.acall(inputs))
+    assert result == fake_client.content
+    assert fake_client.calls[0]["messages"][-1] == {
+        "role": "user", "content": "What is your name?"
+    }
+
+
+def test_langdict_acall_stream(chitchat_spec, fake_client):
+    chitchat = _langdict(chitchat_spec, fake_client)
+    inputs = {"name": "LangDict", "user_input": "What is your name?"}
+
+    async def _collect():
+        return [chunk async for chunk in await chitchat.acall(inputs, stream=True)]
+
+    chunks = asyncio.run(_collect())
+    assert len(chunks) > 1
+    assert "".join(chunks) == fake_client.content
+
+
+def test_langdict_acall_batch_is_concurrent(chitchat_spec, fake_client):
+    fake_client.latency = 0.2
+    chitchat = _langdict(chitchat_spec, fake_client)
+    inputs = [
+        {"name": "LangDict", "user_input": f"Question {i}"}
+        for i in range(20)
+    ]
+
+    loop = asyncio.new_event_loop()
+    start = loop.time()
+    results = loop.run_until_complete(chitchat.acall(inputs, batch=True))
+    elapsed = loop.time() - start
+    loop.close()
+
+    assert results == [fake_client.content] * 20
+    assert elapsed < 0.2 * 5
@@ -0,0 +1,50 @@
+
+import asyncio
+
+import pytest
+
+from langdict import LangDict
+
+
+def _langdict(spec, client, engine):
+    langdict = LangDict.from_dict(spec, engine=engine)
+    langdict.override_llm(client=client)
+    return langdict
+
+
+@pytest.mark.parametrize("output_type, content", [
+    ("string", "Hello, LangDict!"),
+    ("json", '```json\n{"answer": "LangDict", "score": 5}\n```'),
+])
+def test_lean_engine_matches_runnable(chitchat_spec, fake_client, output_type, content):
+    fake_client.content = content
+    chitchat_spec["output"]["type"] = output_type
+    runnable = _langdict(chitchat_spec, fake_client, "runnable")
+    lean = _langdict(chitchat_spec, fake_client, "lean")
+    inputs = {"name": "LangDict", "user_input": "What is your name?"}
+
+    assert lean(inputs) == runnable(inputs)
+    assert fake_client.calls[0] == fake_client.calls[1]
+    assert list(lean(inputs, stream=True)) == list(runnable(inputs, stream=True))
+    assert lean([inputs] * 3, batch=True) == runnable([inputs] * 3, batch=True)
+
+    async def _astream(langdict):
+        return [chunk async for chunk in await langdict.acall(inputs, stream=True)]
+
+    assert asyncio.run(lean.acall(inputs)) == runnable(inputs)
+    assert asyncio.run(_astream(lean)) == asyncio.run(_astream(runnable))
+    assert asyncio.run(lean.acall([inputs] * 3, batch=True)) == [runnable(inputs)] * 3
+
+
+def test_lean_engine_falls_back_with_callbacks(chitchat_spec, fake_client, monkeypatch):
+    lean = _langdict(chitchat_spec, fake_client, "lean")
+    monkeypatch.setattr(lean, "_trace_callbacks", lambda *args: [])
+    monkeypatch.setattr(lean, "_lean_call", None)
+
+    inputs = {"name": "LangDict", "user_input": "What is your name?"}
+    assert lean(inputs, trace_backend="console") == fake_client.content
+
+
+def test_invalid_engine(chitchat_spec):
+    with pytest.raises(ValueError):
+        LangDict.from_dict(chitchat_spec, engine="fast")
@@ -0,0 +1,66 @@
+
+import asyncio
+
+import pytest
+
+from langdict import LangDict, LangDictModule, LangDictResult
+
+
+INPUTS = {"name": "LangDict", "user_input": "What is your name?"}
+
+
+@pytest.mark.parametrize("engine", ["runnable", "lean"])
+def test_return_metadata(chitchat_spec, fake_client, engine):
+    chitchat = LangDict.from_dict(chitchat_spec, engine=engine)
+    chitchat.override_llm(client=fake_client)
+
+    result = chitchat(INPUTS, return_metadata=True)
+    assert isinstance(result, LangDictResult)
+    assert result.output == "Hello, LangDict!"
+    assert result.model == "gpt-4o-mini"
+    assert (result.prompt_tokens, result.completion_tokens, result.total_tokens) == (10, 5, 15)
+    assert result.finish_reason == "stop"
+    assert result.attempts == 1
+    assert result.elapsed > 0
+    assert not result.cache_hit
+
+    results = chitchat([INPUTS, INPUTS], batch=True, return_metadata=True)
+    assert [r.output for r in results] == ["Hello, LangDict!"] * 2
+    assert [r.total_tokens for r in results] == [15, 15]
+
+    stream = chitchat(INPUTS, stream=True, return_metadata=True)
+    assert "".join(stream) == "Hello, LangDict!"
+    assert stream.result.output == "Hello, LangDict!"
+    assert stream.result.finish_reason == "stop"
+    assert stream.result.attempts == 1
+
+
+def test_return_metadata_async(chitchat_spec, fake_client):
+    chitchat = LangDictModule(LangDict.from_dict(chitchat_spec, engine="lean"))
+    chitchat.lang_dict.override_llm(client=fake_client)
+
+    async def _run():
+        result = await chitchat.acall(INPUTS, return_metadata=True)
+        results = await chitchat.lang_dict.acall(
+            [INPUTS, {**INPUTS, "user_input": "Hi"}], batch=True, return_metadata=True
+        )
+        stream = await chitchat.acall(INPUTS, stream=True, return_metadata=True)
+        chunks = [chunk async for chunk in stream]
+        return result, results, chunks, stream.result
+
+    result, results, chunks, stream_result = asyncio.run(_run())
+    assert result.total_tokens == 15
+    assert [r.attempts for r in results] == [1, 1]
+    assert "".join(chunks) == stream_result.output == "Hello, LangDict!"
+
+
+def test_return_metadata_cache_hit(chitchat_spec, fake_client):
+    chitchat_spec["cache"] = {"type": "memory"}
+    chitchat = LangDict.from_dict(chitchat_spec)
+    chitchat.override_llm(client=fake_client)
+
+    chitchat(INPUTS)
+    result = chitchat(INPUTS, return_metadata=True)
+    assert result.cache_hit
+    assert result.attempts == 0
+    assert result.output == "Hello, LangDict!"
@@ -0,0 +1,87 @@
+
+import json
+import random
+
+import pytest
+
+from langdict import LangDict, LangDictModule
+from langdict.metrics import Histogram, MetricsRegistry, metrics
+
+
+@pytest.fixture
+def fresh_metrics():
+    metrics.reset()
+    yield metrics
+    metrics.enable()
+    metrics.reset()
+
+
+def test_histogram_quantiles():
+    histogram = Histogram()
+    values = [random.uniform(0.01, 1.0) for _ in range(10000)]
+    for value in values:
+        histogram.observe(value)
+
+    values.sort()
+    for q in (0.5, 0.95, 0.99):
+        exact = values[int(q * len(values)) - 1]
+        assert histogram.quantile(q) == pytest.approx(exact, rel=0.1)
+    assert histogram.summary()["count"] == 10000
+    assert Histogram().quantile(0.5) is None
+
+
+def test_registry_exports():
+    registry = MetricsRegistry()
+    registry.observe("network", 0.25, module="critic")
+    registry.inc("requests", module="critic")
+
+    assert json.loads(registry.to_json())["critic"]["stages"]["network"]["p50"] == 0.25
+    prometheus = registry.to_prometheus()
+    assert 'langdict_stage_seconds{module="critic",stage="network",quantile="0.95"} 0.25' in prometheus
+    assert 'langdict_requests_total{module="critic"} 1' in prometheus
+
+    counters = ("retry_after", "circuit_open", "failovers", "hedged", "hedge_wins",
+                "hedges_skipped", "ejections", "custom")
+    for counter in counters:
+        registry.inc(counter, module="critic")
+    prometheus = registry.to_prometheus()
+    for counter in counters:
+        assert f'langdict_{counter}_total{{module="critic"}} 1' in prometheus
+
+    registry.disable()
+    registry.observe("network", 0.25, module="critic")
+    assert registry.histogram("network", module="critic").count == 1
+
+
+@pytest.mark.parametrize("engine", ["runnable", "lean"])
+def test_langdict_records_stages(chitchat_spec, fake_client, fresh_metrics, engine):
+    fresh_metrics.enable(runnable_stages=True)
+    critic = LangDictModule(LangDict.from_dict(chitchat_spec, engine=engine))
+    critic.lang_dict.override_llm(client=fake_client)
+    critic.NAME = "critic"
+    inputs = {"name": "LangDict", "user_input": "What is your name?"}
+
+    critic(inputs)
+    critic.lang_dict([inputs, inputs], batch=True, module_name="critic")
+    list(critic(inputs, stream=True))
+
+    stages = fresh_metrics.snapshot()["critic"]["stages"]
+    assert stages["render"]["count"] >= 3
+    assert stages["parse"]["count"] == 3
+    assert stages["network"]["count"] == 4
+    assert stages["ttft"]["count"] == 1
+    assert stages["total"]["count"] == 3
+    assert fresh_metrics.counter("requests", module="critic") == 4
+
+
+def test_errors_are_counted(chitchat_spec, fresh_metrics):
+    class BrokenClient:
+        def completion(self, **kwargs):
+            raise RuntimeError("boom")
+
+    chitchat = LangDict.from_dict(chitchat_spec, engine="lean")
+    chitchat.override_llm(client=BrokenClient())
+
+    with pytest.raises(RuntimeError):
+        chitchat({"name": "LangDict", "user_input": "Hi"}, module_name="chitchat")
+    assert fresh_metrics.counter("errors", module="chitchat") == 1
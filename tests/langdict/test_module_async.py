@@ -0,0 +1,55 @@
+
+import asyncio
+import time
+
+import pytest
+
+from langdict import LangDict, LangDictModule, Module
+
+
+class Critique(Module):
+
+    def __init__(self, spec, client):
+        super().__init__()
+        self.is_relevant = LangDictModule(LangDict.from_dict(spec))
+        self.is_useful = LangDictModule(LangDict.from_dict(spec))
+        for child in self.children():
+            child.lang_dict.override_llm(client=client)
+
+    async def forward(self, inputs):
+        return await asyncio.gather(
+            self.is_relevant.acall(inputs),
+            self.is_useful.acall(inputs),
+        )
+
+
+def test_module_acall_gathers_children(chitchat_spec, fake_client):
+    fake_client.latency = 0.3
+    critique = Critique(chitchat_spec, fake_client)
+    inputs = {"name": "LangDict", "user_input": "What is your name?"}
+
+    start = time.perf_counter()
+    results = asyncio.run(critique.acall(inputs))
+    elapsed = time.perf_counter() - start
+
+    assert results == [fake_client.content, fake_client.content]
+    assert elapsed < 0.3 * 2
+
+
+def test_module_acall_sync_forward(chitchat_spec, fake_client):
+    module = LangDictModule.from_dict(chitchat_spec)
+    module.lang_dict.override_llm(client=fake_client)
+
+    result = asyncio.run(module.acall({"name": "LangDict", "user_input": "Hi"}))
+    assert result == fake_client.content
+
+
+def test_module_call_rejects_async_forward(chitchat_spec, fake_client):
+    class AsyncInputs(LangDictModule):
+
+        async def forward(self, inputs):
+            return inputs
+
+    module = AsyncInputs(LangDict.from_dict(chitchat_spec))
+    with pytest.raises(TypeError):
+        module({"name": "LangDict", "user_input": "Hi"})
@@ -0,0 +1,89 @@
+
+import json
+from concurrent.futures import ThreadPoolExecutor
+from contextvars import copy_context
+from typing import Dict
+
+from langdict import LangDict, LangDictModule, Module
+from langdict.traces import profile
+
+
+INPUTS = {"name": "LangDict", "user_input": "What is your name?"}
+
+
+class Critique(Module):
+
+    def __init__(self, spec, client, engine):
+        super().__init__()
+        self.is_relevant = LangDictModule(LangDict.from_dict(spec, engine=engine))
+        self.is_useful = LangDictModule(LangDict.from_dict(spec, engine=engine))
+        self.is_relevant.lang_dict.override_llm(client=client)
+        self.is_useful.lang_dict.override_llm(client=client)
+
+    def forward(self, inputs: Dict):
+        with ThreadPoolExecutor() as executor:
+            futures = [
+                executor.submit(copy_context().run, module, inputs)
+                for module in (self.is_relevant, self.is_useful)
+            ]
+            return [f.result() for f in futures]
+
+
+def _check_nesting(profile_data):
+    for lane in profile_data["profiles"]:
+        stack, last_at = [], 0
+        for event in lane["events"]:
+            assert event["at"] >= last_at
+            last_at = event["at"]
+            if event["type"] == "O":
+                stack.append(event["frame"])
+            else:
+                assert stack.pop() == event["frame"]
+        assert not stack
+
+
+def test_profile_exports(chitchat_spec, fake_client, tmp_path):
+    fake_client.latency = 0.05
+    critique = Critique(chitchat_spec, fake_client, engine="runnable")
+
+    with profile() as profiler:
+        critique(INPUTS)
+
+    collapsed = profiler.to_collapsed()
+    assert "Critique;is_relevant;network (gpt-4o-mini) " in collapsed
+    assert "Critique;is_useful;render " in collapsed
+    network = [
+        int(line.rsplit(" ", 1)[1]) for line in collapsed.splitlines() if "network" in line
+    ]
+    assert len(network) == 2 and min(network) >= 40000
+
+    # the critic that finished first ran in parallel: the call did not wait on it
+    path = [span.name for span in profiler.recorder.critical_path()]
+    assert path[0] == "Critique"
+    assert ("is_relevant" in path) != ("is_useful" in path)
+
+    data = profiler.to_speedscope()
+    assert len(data["profiles"]) == 2  # the two critics ran in parallel
+    _check_nesting(data)
+    names = {frame["name"] for frame in data["shared"]["frames"]}
+    assert {"Critique", "is_relevant", "is_useful", "render", "parse"} <= names
+
+    profiler.save(str(tmp_path / "critique.speedscope.json"))
+    profiler.save(str(tmp_path / "critique.collapsed"))
+    assert json.loads((tmp_path / "critique.speedscope.json").read_text())["exporter"] == "langdict"
+    assert (tmp_path / "critique.collapsed").read_text() == collapsed
+
+
+def test_profile_lean_engine(chitchat_spec, fake_client):
+    critic = LangDictModule(LangDict.from_dict(chitchat_spec, engine="lean"))
+    critic.lang_dict.override_llm(client=fake_client)
+
+    with profile() as profiler:
+        critic(INPUTS)
+        list(critic(INPUTS, stream=True))
+
+    _check_nesting(profiler.to_speedscope())
+    names = {span.name for span in profiler.recorder.spans}
+    assert {"render", "parse", "litellm.completion"} <= names
+    for root in profiler._tree():
+        assert all(root.start <= child.start and child.end <= root.end for child in root.children)
@@ -0,0 +1,115 @@
+
+import asyncio
+import copy
+import json
+
+import pytest
+
+from langdict import LangDict
+from langdict.providers import CallableProvider, FakeProvider, register_provider
+
+
+INPUTS = {"name": "LangDict", "user_input": "What is your name?"}
+
+
+def _spec(chitchat_spec, provider, **options):
+    chitchat_spec["llm"].update({"provider": provider, "provider_options": options})
+    return chitchat_spec
+
+
+@pytest.mark.parametrize("engine", ["runnable", "lean"])
+def test_fake_provider(chitchat_spec, engine):
+    spec = _spec(chitchat_spec, "fake", responses=["first answer", "second answer"], chunk_size=4)
+    chitchat = LangDict.from_dict(spec, engine=engine)
+
+    assert chitchat(INPUTS) == "first answer"
+    assert chitchat([INPUTS, INPUTS], batch=True) == ["second answer", "first answer"]
+    assert "".join(chitchat(INPUTS, stream=True)) == "second answer"
+    assert asyncio.run(chitchat.acall(INPUTS)) == "first answer"
+
+    result = chitchat(INPUTS, stream=True, return_metadata=True)
+    assert "".join(result) == "second answer"
+    assert result.result.total_tokens > 0
+    assert chitchat.compiled.llm.client.calls == 6
+
+
+def test_callable_provider(chitchat_spec):
+    def echo(messages, **params):
+        return json.dumps({"model": params["model"], "echo": messages[-1]["content"]})
+
+    async def aecho(messages, **params):
+        return echo(messages, **params)
+
+    chitchat_spec["output"]["type"] = "json"
+    chitchat = LangDict.from_dict(_spec(chitchat_spec, "callable", fn=echo))
+    expected = {"model": "gpt-4o-mini", "echo": "What is your name?"}
+    assert chitchat(INPUTS) == expected
+    assert list(chitchat(INPUTS, stream=True))[-1] == expected
+
+    chitchat = LangDict.from_dict(_spec(chitchat_spec, "callable", fn=aecho), engine="lean")
+    assert asyncio.run(chitchat.acall(INPUTS)) == expected
+    with pytest.raises(TypeError):
+        chitchat(INPUTS)
+
+
+def test_register_provider(chitchat_spec):
+    register_provider("shout", lambda: CallableProvider(
+        lambda messages, **params: messages[-1]["content"].upper()
+    ))
+    chitchat = LangDict.from_dict(_spec(chitchat_spec, "shout"))
+    assert chitchat(INPUTS) == "WHAT IS YOUR NAME?"
+
+    with pytest.raises(ValueError):
+        LangDict.from_dict(_spec(chitchat_spec, "unknown"))
+
+
+def test_providers_do_not_share_cached_responses(chitchat_spec, fake_client):
+    chitchat_spec["cache"] = {"type": "memory"}
+    fake = LangDict.from_dict(_spec(copy.deepcopy(chitchat_spec), "fake", responses=["fake answer"]))
+    fake.chain.steps[1].response_cache.clear()
+    assert fake(INPUTS) == "fake answer"
+
+    chitchat = LangDict.from_dict(chitchat_spec)
+    chitchat.override_llm(client=fake_client)
+    assert chitchat.chain.steps[1].response_cache is fake.chain.steps[1].response_cache
+    assert chitchat(INPUTS) == fake_client.content
+    assert len(fake_client.calls) == 1
+
+    upper = LangDict.from_dict(_spec(copy.deepcopy(chitchat_spec), "callable", fn=_upper))
+    assert upper(INPUTS) == "WHAT IS YOUR NAME?"
+
+
+def _upper(messages, **params):
+    return messages[-1]["content"].upper()
+
+
+def _answer(content):
+    return lambda messages, **params: content
+
+
+def test_callable_providers_of_one_factory_do_not_share_responses(chitchat_spec):
+    chitchat_spec["cache"] = {"type": "memory"}
+    chitchat_spec["llm"]["coalesce"] = True
+    first = LangDict.from_dict(_spec(copy.deepcopy(chitchat_spec), "callable", fn=_answer("A")))
+    first.chain.steps[1].response_cache.clear()
+    second = LangDict.from_dict(_spec(copy.deepcopy(chitchat_spec), "callable", fn=_answer("B")))
+
+    assert first(INPUTS) == "A"
+    assert second(INPUTS) == "B"
+
+
+def test_fake_provider_errors():
+    import litellm
+
+    provider = FakeProvider(error_rate=0.5, seed=0)
+    outcomes = []
+    for _ in range(100):
+        try:
+            provider.completion(messages=[{"role": "user", "content": "hi"}], model="fake")
+            outcomes.append(True)
+        except litellm.APIConnectionError:
+            outcomes.append(False)
+
+    assert provider.errors == outcomes.count(False)
+    assert 30 < provider.errors < 70
+
@@ -0,0 +1,48 @@
+
+import time
+
+import pytest
+
+from langdict import LangDict
+from langdict.chat_models import RateLimiter, estimate_tokens
+
+
+def test_rate_limiter_rpm():
+    limiter = RateLimiter(rpm=600)  # one request per 0.1s after the burst
+
+    start = time.perf_counter()
+    for _ in range(602):
+        limiter.acquire()
+    elapsed = time.perf_counter() - start
+
+    assert 0.15 <= elapsed < 1.0
+    assert limiter.stats()["throttled"] == 2
+
+
+def test_rate_limiter_tpm_reconcile():
+    limiter = RateLimiter(tpm=60000)  # 1000 tokens per second
+
+    assert limiter.acquire(60000) == 0
+    # the request used fewer tokens than estimated
+    limiter.reconcile(60000, 50000)
+    assert limiter.acquire(10000) == 0
+    assert limiter.acquire(100) == pytest.approx(0.1, abs=0.05)
+
+
+def test_estimate_tokens():
+    messages = [{"role": "user", "content": "x" * 400}]
+    assert estimate_tokens(messages) == 104
+    assert estimate_tokens(messages, max_tokens=100, n=2) == 304
+
+
+def test_langdict_rate_limit_is_shared(chitchat_spec, fake_client):
+    chitchat_spec["llm"]["model"] = "gpt-4o-mini-rate-limit-test"
+    chitchat_spec["llm"]["rate_limit"] = {"rpm": 1000, "tpm": 100000}
+    first = LangDict.from_dict(chitchat_spec)
+    second = LangDict.from_dict(chitchat_spec)
+    limiter = first.chain.steps[1].request_limiter
+    assert limiter is second.chain.steps[1].request_limiter
+
+    first.override_llm(client=fake_client)
+    first({"name": "LangDict", "user_input": "Hi"})
+    assert limiter.stats()["acquired"] == 1
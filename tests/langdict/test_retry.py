@@ -0,0 +1,178 @@
+import asyncio
+import time
+
+import httpx
+import litellm
+import pytest
+
+from langdict import LangDict
+from langdict.chat_models import (
+    CircuitBreaker,
+    CircuitOpenError,
+    RetryPolicy,
+    clear_circuit_breakers,
+)
+from langdict.chat_models.retry import retry_after
+from langdict.metrics import metrics
+
+
+INPUTS = {"name": "LangDict", "user_input": "What is your name?"}
+
+
+def _connection_error():
+    return litellm.APIConnectionError(message="reset", llm_provider="openai", model="gpt-4o-mini")
+
+
+def _rate_limit_error(retry_after_header):
+    response = httpx.Response(
+        429,
+        headers={"retry-after": retry_after_header},
+        request=httpx.Request("POST", "https://api.openai.com/v1/chat/completions"),
+    )
+    return litellm.RateLimitError("slow down", "openai", "gpt-4o-mini", response=response)
+
+
+class FlakyClient:
+
+    def __init__(self, fake_client, errors):
+        self.fake_client = fake_client
+        self.errors = list(errors)
+        self.models = []
+        self.api_bases = []
+
+    def completion(self, **kwargs):
+        self.models.append(kwargs["model"])
+        self.api_bases.append(kwargs.get("api_base"))
+        if self.errors:
+            raise self.errors.pop(0)
+        return self.fake_client.completion(**kwargs)
+
+    async def acompletion(self, **kwargs):
+        self.models.append(kwargs["model"])
+        self.api_bases.append(kwargs.get("api_base"))
+        if self.errors:
+            error = self.errors.pop(0)
+            if isinstance(error, float):
+                await asyncio.sleep(error)
+            else:
+                raise error
+        return await self.fake_client.acompletion(**kwargs)
+
+
+@pytest.fixture
+def fresh_metrics():
+    metrics.reset()
+    yield metrics
+    metrics.reset()
+
+
+@pytest.fixture(autouse=True)
+def fresh_circuit_breakers():
+    clear_circuit_breakers()
+    yield
+    clear_circuit_breakers()
+
+
+def _lang_dict(spec, client, **llm):
+    spec["llm"].update(llm)
+    lang_dict = LangDict.from_dict(spec)
+    lang_dict.override_llm(client=client)
+    return lang_dict
+
+
+def test_retry_policy_delays():
+    policy = RetryPolicy(max_attempts=4, initial_delay=1.0, max_delay=3.0, jitter=False)
+    assert [policy.backoff(attempt) for attempt in (1, 2, 3, 4)] == [1.0, 2.0, 3.0, 3.0]
+    assert 0 <= RetryPolicy(initial_delay=1.0).backoff(1) <= 1.0
+
+    assert policy.next_delay(1, _connection_error()) == (1.0, False)
+    assert policy.next_delay(4, _connection_error()) is None
+    assert policy.next_delay(1, ValueError("bad output")) is None
+    assert policy.next_delay(1, _rate_limit_error("7")) == (7.0, True)
+    assert policy.next_delay(1, _rate_limit_error("3600")) is None
+    assert retry_after(_rate_limit_error("Wed, 21 Oct 2015 07:28:00 GMT")) == 0.0
+
+    with pytest.raises(ValueError):
+        RetryPolicy(max_attempts=0)
+
+
+def test_transient_errors_are_retried(chitchat_spec, fake_client, fresh_metrics):
+    client = FlakyClient(fake_client, [_connection_error(), _rate_limit_error("0.05")])
+    chitchat = _lang_dict(chitchat_spec, client, retry={"initial_delay": 0})
+
+    start = time.perf_counter()
+    result = chitchat(INPUTS, return_metadata=True)
+
+    assert result.output == fake_client.content
+    assert result.attempts == 3
+    assert time.perf_counter() - start >= 0.05
+    assert fresh_metrics.counter("retries") == 2
+    assert fresh_metrics.counter("retry_after") == 1
+
+
+def test_attempt_timeout(chitchat_spec, fake_client):
+    client = FlakyClient(fake_client, [5.0])
+    chitchat = _lang_dict(
+        chitchat_spec, client, retry={"initial_delay": 0, "attempt_timeout": 0.1}
+    )
+
+    start = time.perf_counter()
+    assert asyncio.run(chitchat.acall(INPUTS)) == fake_client.content
+    assert time.perf_counter() - start < 1.0
+    assert len(client.models) == 2
+
+
+def test_circuit_breaker_fails_fast_and_fails_over(chitchat_spec, fake_client, fresh_metrics):
+    client = FlakyClient(fake_client, [_connection_error()] * 2)
+    chitchat = _lang_dict(
+        chitchat_spec,
+        client,
+        api_base="http://unhealthy:8000/v1",
+        api_key="sk-unhealthy",
+        retry={"max_attempts": 1},
+        circuit_breaker={"failure_threshold": 2, "recovery_time": 60},
+    )
+    breaker = chitchat.chain.steps[1].circuit_breaker
+
+    for _ in range(2):
+        with pytest.raises(litellm.APIConnectionError):
+            chitchat(INPUTS)
+    assert breaker.state == CircuitBreaker.OPEN
+
+    with pytest.raises(CircuitOpenError):
+        chitchat(INPUTS)
+    assert len(client.models) == 2
+    assert fresh_metrics.counter("circuit_open") == 1
+
+    # Same (open) breaker, with a fallback deployment.
+    chitchat = _lang_dict(
+        chitchat_spec,
+        client,
+        circuit_breaker={
+            "failure_threshold": 2,
+            "recovery_time": 60,
+            "fallback": {"model": "gpt-4o", "api_base": "http://healthy:8000/v1"},
+        },
+    )
+    assert chitchat.chain.steps[1].circuit_breaker is breaker
+    assert chitchat(INPUTS) == fake_client.content
+    assert client.models[-1] == "gpt-4o"
+    assert client.api_bases[-1] == "http://healthy:8000/v1"
+    assert fake_client.calls[-1].get("api_key") is None
+    assert fresh_metrics.counter("failovers") == 1
+
+
+def test_circuit_breaker_half_open():
+    breaker = CircuitBreaker("test", failure_threshold=1, recovery_time=0.05)
+    breaker.record_failure()
+    with pytest.raises(CircuitOpenError):
+        breaker.before_request()
+
+    time.sleep(0.05)
+    breaker.before_request()
+    with pytest.raises(CircuitOpenError):
+        # one probe at a time
+        breaker.before_request()
+    breaker.record(ValueError("400 Bad Request"))
+    assert breaker.state == CircuitBreaker.CLOSED
+    assert breaker.stats() == {"state": "closed", "failures": 0, "opened": 1, "rejected": 2}
@@ -0,0 +1,190 @@
+import asyncio
+import time
+from collections import Counter
+
+import litellm
+import pytest
+
+from langdict import LangDict
+from langdict.chat_models import Router, deployment_key
+from langdict.metrics import metrics
+
+
+INPUTS = {"name": "LangDict", "user_input": "What is your name?"}
+
+
+class DeploymentClient:
+    """Answers like `fake_client`, except on the `failing` deployments."""
+
+    def __init__(self, fake_client, failing=()):
+        self.fake_client = fake_client
+        self.failing = set(failing)
+        self.api_bases = []
+
+    def _check(self, kwargs):
+        self.api_bases.append(kwargs["api_base"])
+        if kwargs["api_base"] in self.failing:
+            raise litellm.ServiceUnavailableError(
+                message="overloaded", llm_provider="openai", model=kwargs["model"]
+            )
+
+    def completion(self, **kwargs):
+        self._check(kwargs)
+        return self.fake_client.completion(**kwargs)
+
+    async def acompletion(self, **kwargs):
+        self._check(kwargs)
+        return await self.fake_client.acompletion(**kwargs)
+
+
+@pytest.fixture
+def fresh_metrics():
+    metrics.reset()
+    yield metrics
+    metrics.reset()
+
+
+def _lang_dict(spec, client, api_bases, **llm):
+    spec["llm"].update({
+        "deployments": [{"api_base": api_base, "api_key": "sk-test"} for api_base in api_bases],
+        **llm,
+    })
+    lang_dict = LangDict.from_dict(spec)
+    lang_dict.override_llm(client=client)
+    return lang_dict
+
+
+def test_least_outstanding_spreads_requests(chitchat_spec, fake_client):
+    fake_client.latency = 0.1
+    client = DeploymentClient(fake_client)
+    api_bases = ["http://spread-a/v1", "http://spread-b/v1"]
+    chitchat = _lang_dict(chitchat_spec, client, api_bases)
+
+    async def _run():
+        return await asyncio.gather(*[chitchat.acall(INPUTS) for _ in range(4)])
+
+    start = time.perf_counter()
+    assert asyncio.run(_run()) == [fake_client.content] * 4
+    assert time.perf_counter() - start < 0.3
+    assert Counter(client.api_bases) == {api_base: 2 for api_base in api_bases}
+    assert all(s["outstanding"] == 0 for s in chitchat.chain.steps[1].router.stats().values())
+
+
+def test_failing_deployment_is_ejected(chitchat_spec, fake_client, fresh_metrics):
+    client = DeploymentClient(fake_client, failing=["http://eject-a/v1"])
+    chitchat = _lang_dict(
+        chitchat_spec,
+        client,
+        ["http://eject-a/v1", "http://eject-b/v1"],
+        routing={"ejection_time": 60},
+    )
+
+    start = time.perf_counter()
+    for _ in range(4):
+        assert chitchat(INPUTS) == fake_client.content
+    assert time.perf_counter() - start < 0.5
+
+    assert client.api_bases.count("http://eject-a/v1") <= 1
+    assert client.api_bases.count("http://eject-b/v1") == 4
+    stats = chitchat.chain.steps[1].router.stats()
+    key = deployment_key({"model": "gpt-4o-mini", "api_base": "http://eject-b/v1", "api_key": "sk-test"})
+    assert stats[key]["requests"] == 4 and not stats[key]["ejected"]
+    assert fresh_metrics.counter("ejections") == client.api_bases.count("http://eject-a/v1")
+
+
+class BrokenStreamClient(DeploymentClient):
+    """Streams of the `failing` deployments break after the first chunk."""
+
+    def completion(self, **kwargs):
+        self.api_bases.append(kwargs["api_base"])
+        chunks = self.fake_client.completion(**kwargs)
+        if kwargs["api_base"] not in self.failing:
+            return chunks
+        return self._broken(chunks, kwargs["model"])
+
+    def _broken(self, chunks, model):
+        yield next(chunks)
+        raise litellm.APIConnectionError(message="reset", llm_provider="openai", model=model)
+
+
+def test_streams_hold_their_deployment_until_they_end(chitchat_spec, fake_client):
+    client = BrokenStreamClient(fake_client)
+    chitchat = _lang_dict(
+        chitchat_spec, client, ["http://stream-a/v1"], routing={"ejection_time": 60}
+    )
+    router = chitchat.chain.steps[1].router
+    key = deployment_key({"model": "gpt-4o-mini", "api_base": "http://stream-a/v1", "api_key": "sk-test"})
+
+    stream = chitchat(INPUTS, stream=True)
+    assert next(stream) == fake_client.content[:4]
+    assert router.stats()[key]["outstanding"] == 1
+    assert "".join(stream) == fake_client.content[4:]
+    assert router.stats()[key]["outstanding"] == 0
+    assert router.stats()[key]["ewma"] is not None
+
+    client.failing.add("http://stream-a/v1")
+    with pytest.raises(litellm.APIConnectionError):
+        "".join(chitchat(INPUTS, stream=True))
+    stats = router.stats()[key]
+    assert stats["outstanding"] == 0
+    assert stats["errors"] == 1 and stats["ejected"]
+
+
+def test_dropped_streams_release_their_deployment():
+    router = Router([{"model": "m", "api_base": "http://drop-a/v1"}])
+    deployment = router.deployments[0]
+
+    stream = router.release_stream(router.acquire(), iter(["chunk"]))
+    assert deployment.outstanding == 1
+    del stream
+    assert deployment.outstanding == 0
+
+    router.release_stream(router.acquire(), iter(["chunk"])).close()
+    assert deployment.outstanding == 0
+
+    async def _chunks():
+        yield "chunk"
+
+    async def _run():
+        stream = router.arelease_stream(router.acquire(), _chunks())
+        assert deployment.outstanding == 1
+        await stream.aclose()
+
+    asyncio.run(_run())
+    assert deployment.outstanding == 0
+    assert deployment.errors == 0
+
+
+def test_ewma_prefers_the_faster_deployment():
+    router = Router(
+        [{"model": "m", "api_base": "http://ewma-slow/v1"}, {"model": "m", "api_base": "http://ewma-fast/v1"}],
+        strategy="ewma",
+    )
+    slow, fast = router.deployments
+    slow.ewma, fast.ewma = 1.0, 0.1
+
+    picks = Counter()
+    for _ in range(10):
+        route = router.acquire()
+        picks[route.params["api_base"]] += 1
+        route.start -= 0.1
+        router.release(route)
+    assert picks["http://ewma-fast/v1"] == 10
+
+    with pytest.raises(ValueError):
+        Router([{"model": "m"}], strategy="random")
+
+
+def test_deployments_have_their_own_rate_limits(chitchat_spec, fake_client):
+    chitchat = _lang_dict(
+        chitchat_spec,
+        fake_client,
+        ["http://limit-a/v1", "http://limit-b/v1"],
+        rate_limit={"rpm": 600},
+    )
+    llm = chitchat.chain.steps[1]
+
+    assert llm.request_limiter is None
+    first, second = llm.router.limiters
+    assert first is not second and first.rpm == second.rpm == 600
+
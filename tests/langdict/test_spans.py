@@ -0,0 +1,90 @@
+
+import asyncio
+import json
+from typing import Dict
+
+from langdict import LangDict, LangDictModule, Module
+from langdict.traces import record_spans, spans
+
+
+INPUTS = {"name": "LangDict", "user_input": "What is your name?"}
+
+
+class Pipeline(Module):
+
+    def __init__(self, spec, client):
+        super().__init__()
+        self.rewrite = LangDictModule(LangDict.from_dict(spec))
+        self.answer = LangDictModule(LangDict.from_dict(spec, engine="lean"))
+        self.rewrite.lang_dict.override_llm(client=client)
+        self.answer.lang_dict.override_llm(client=client)
+
+    def forward(self, inputs: Dict):
+        rewritten = self.rewrite(inputs)
+        return self.answer({**inputs, "user_input": rewritten})
+
+
+def test_module_spans_nest(chitchat_spec, fake_client, tmp_path):
+    pipeline = Pipeline(chitchat_spec, fake_client)
+
+    with record_spans() as recorder:
+        pipeline(INPUTS)
+
+    by_name = {span.name: span for span in recorder.spans}
+    root = by_name["Pipeline"]
+    assert root.parent_id is None
+    assert by_name["rewrite"].parent_id == root.span_id
+    assert by_name["answer"].parent_id == root.span_id
+    assert {span.trace_id for span in recorder.spans} == {root.trace_id}
+
+    llm_spans = [span for span in recorder.spans if span.kind == "client"]
+    assert {span.parent_id for span in llm_spans} == {
+        by_name["rewrite"].span_id, by_name["answer"].span_id
+    }
+    assert llm_spans[0].attributes["gen_ai.usage.input_tokens"] == 10
+    assert [span.name for span in recorder.critical_path()] == [
+        "Pipeline",
+        "rewrite", "render", "litellm.completion", "parse",
+        "answer", "render", "litellm.completion", "parse",
+    ]
+    assert {span.name for span in recorder.children(by_name["rewrite"])} == {
+        "render", "litellm.completion", "parse"
+    }
+
+    path = tmp_path / "spans.json"
+    recorder.export(str(path))
+    exported = json.loads(path.read_text())["resourceSpans"][0]["scopeSpans"][0]["spans"]
+    assert len(exported) == 9
+    assert all(int(s["endTimeUnixNano"]) >= int(s["startTimeUnixNano"]) for s in exported)
+
+
+def test_stream_and_async_spans(chitchat_spec, fake_client):
+    chitchat = LangDictModule(LangDict.from_dict(chitchat_spec, engine="lean"))
+    chitchat.lang_dict.override_llm(client=fake_client)
+
+    with record_spans() as recorder:
+        stream = chitchat(INPUTS, stream=True)
+        assert recorder.spans == []
+        list(stream)
+        asyncio.run(chitchat.acall(INPUTS))
+
+    modules = [span for span in recorder.spans if "langdict.module" in span.attributes]
+    modules = [span for span in modules if span.kind == "internal"]
+    llm_spans = [span for span in recorder.spans if span.kind == "client"]
+    assert len(modules) == len(llm_spans) == 2
+    assert {span.parent_id for span in llm_spans} == {span.span_id for span in modules}
+    # the module span of the stream ends with the stream
+    assert modules[0].end_ns >= llm_spans[0].end_ns
+
+
+def test_no_spans_without_recorder(chitchat_spec, fake_client, monkeypatch):
+    created = []
+    monkeypatch.setattr(spans, "Span", lambda *args, **kwargs: created.append(args))
+    chitchat = LangDictModule(LangDict.from_dict(chitchat_spec))
+    chitchat.lang_dict.override_llm(client=fake_client)
+
+    assert chitchat(INPUTS) == fake_client.content
+    assert "".join(chitchat(INPUTS, stream=True)) == fake_client.content
+    assert asyncio.run(chitchat.acall(INPUTS)) == fake_client.content
+    assert not spans.recording()
+    assert created == []
@@ -0,0 +1,50 @@
+
+from langchain_core.callbacks import BaseCallbackHandler
+
+from langdict import LangDict, LangDictModule
+from langdict.builders import TraceCallbackBuilder
+from langdict.traces import trace_context
+
+
+class RecordingHandler(BaseCallbackHandler):
+
+    def __init__(self):
+        self.runs = []
+
+    def on_chain_start(self, serialized, inputs, **kwargs):
+        if kwargs.get("parent_run_id") is None:
+            self.runs.append((kwargs.get("metadata"), kwargs.get("tags")))
+
+
+def test_trace_handlers_are_shared():
+    TraceCallbackBuilder.clear()
+    handler = TraceCallbackBuilder.get("console", module_name="chitchat")
+
+    assert TraceCallbackBuilder.get("console", module_name="chitchat") is handler
+    assert TraceCallbackBuilder.get("console", module_name="other") is not handler
+    TraceCallbackBuilder.clear()
+
+
+def test_module_reuses_runnable_and_handler(chitchat_spec, fake_client, monkeypatch):
+    handler = RecordingHandler()
+    monkeypatch.setitem(TraceCallbackBuilder._handlers, ("console", "chitchat"), handler)
+
+    module = LangDictModule(LangDict.from_dict(chitchat_spec))
+    module.lang_dict.override_llm(client=fake_client)
+    module.NAME = "chitchat"
+    module.trace("console")
+    assert module._forward_runnable() is module._forward_runnable()
+
+    inputs = {"name": "LangDict", "user_input": "What is your name?"}
+    module(inputs)
+    with trace_context(session_id="session-1", user_id="user-1", tags=["beta"]):
+        with trace_context(tags=["critic"]):
+            module(inputs)
+
+    assert len(handler.runs) == 2
+    assert "langfuse_session_id" not in handler.runs[0][0]
+    metadata, tags = handler.runs[1]
+    assert metadata["langfuse_session_id"] == "session-1"
+    assert metadata["langfuse_user_id"] == "user-1"
+    assert metadata["langfuse_tags"] == ["beta", "critic"]
+    assert tags == ["beta", "critic"]
@@ -0,0 +1,57 @@
+
+import json
+
+from langdict import LangDict, LangDictModule
+from langdict.builders import TraceCallbackBuilder
+from langdict.traces import BufferedTraceCallbackHandler, TraceSink, configure_sink, trace_context
+
+
+INPUTS = {"name": "LangDict", "user_input": "What is your name?"}
+
+
+def _module(chitchat_spec, fake_client):
+    module = LangDictModule(LangDict.from_dict(chitchat_spec))
+    module.lang_dict.override_llm(client=fake_client)
+    module.NAME = "chitchat"
+    return module
+
+
+def test_buffered_backend_writes_spans(chitchat_spec, fake_client, tmp_path):
+    path = tmp_path / "traces.jsonl"
+    sink = configure_sink(path=str(path), max_payload_chars=40)
+    TraceCallbackBuilder.clear()
+
+    module = _module(chitchat_spec, fake_client).trace("buffered")
+    with trace_context(session_id="session-1"):
+        module(INPUTS)
+    sink.close()
+    configure_sink()
+    TraceCallbackBuilder.clear()
+
+    spans = [json.loads(line) for line in path.read_text().splitlines()]
+    assert len({span["trace_id"] for span in spans}) == 1
+    root = next(span for span in spans if span["parent_id"] is None)
+    assert root["module"] == "chitchat"
+    assert root["session_id"] == "session-1"
+    assert root["status"] == "ok"
+    assert root["outputs"] == "Hello, LangDict!"
+
+    llm = next(span for span in spans if span["kind"] == "llm")
+    assert isinstance(llm["inputs"], str) and llm["inputs"].endswith("chars]")
+
+
+def test_sink_sampling_and_drops(chitchat_spec, fake_client, tmp_path):
+    handler = BufferedTraceCallbackHandler(
+        module_name="chitchat",
+        sink=TraceSink(path=str(tmp_path / "none.jsonl"), sample_rate=0.0),
+    )
+    module = _module(chitchat_spec, fake_client)
+    module.lang_dict.chain.invoke(INPUTS, config={"callbacks": [handler]})
+    assert handler.sink.written == 0 and not handler._runs
+
+    full = TraceSink(path=str(tmp_path / "full.jsonl"), capacity=2, flush_interval=60)
+    handler = BufferedTraceCallbackHandler(module_name="chitchat", sink=full)
+    module.lang_dict.chain.invoke(INPUTS, config={"callbacks": [handler]})
+    assert full.dropped > 0
+    full.close()
+    assert full.written == 2